@@ -23,6 +23,8 @@ from c0s_lewd_utilities import names
 from c0s_lewd_utilities import property_groups
 from c0s_lewd_utilities import operators
 from c0s_lewd_utilities import panels
+from c0s_lewd_utilities.addon_utils.mesh import topology_fingerprint
+from c0s_lewd_utilities.addon_utils.animation import memory_estimate
 
 bl_info = {
     # "name": names.addon_name,   # Apparently trying to use a variable from another module here will give you an error. For whatever reason.
@@ -45,10 +47,14 @@ def register():
     property_groups.register()
     operators.register()
     panels.register()
+    topology_fingerprint.register()
+    memory_estimate.register()
 
 
 def unregister():
     # reversed order of the register function
+    memory_estimate.unregister()
+    topology_fingerprint.unregister()
     panels.unregister()
     operators.unregister()
     property_groups.unregister()
@@ -21,6 +21,8 @@
 list_of_operators=set()
 list_of_panels=set()
 
-from .animation_general.animation_to_mesh_and_shapekeys.op_and_panel import OBJECT_OT_animate_with_shapekeys, OBJECT_PT_animate_with_shapekeys
+from .animation_general.animation_to_mesh_and_shapekeys.op_and_panel import OBJECT_OT_animate_with_shapekeys, OBJECT_OT_compare_baked_playback, OBJECT_OT_estimate_conversion_memory, OBJECT_PT_animate_with_shapekeys
 list_of_operators.add(OBJECT_OT_animate_with_shapekeys)
+list_of_operators.add(OBJECT_OT_compare_baked_playback)
+list_of_operators.add(OBJECT_OT_estimate_conversion_memory)
 list_of_panels.add(OBJECT_PT_animate_with_shapekeys)
\ No newline at end of file
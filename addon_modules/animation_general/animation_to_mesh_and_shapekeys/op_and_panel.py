@@ -19,8 +19,30 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import numpy as np
+import os
 
 from c0s_lewd_utilities.addon_utils.animation import animation_to_shapekeys
+from c0s_lewd_utilities.addon_utils.animation.frame_sinks import StatisticsSink, ShapekeySink, IncrementalShapekeySink, RegionOfInterestSink, NpyFileSink
+from c0s_lewd_utilities.addon_utils.animation.frame_stream import iterate_evaluated_frames
+from c0s_lewd_utilities.addon_utils.animation import region_of_interest
+from c0s_lewd_utilities.addon_utils.animation import animated_ranges
+from c0s_lewd_utilities.addon_utils.animation.frame_walker import FrameWalker
+from c0s_lewd_utilities.addon_utils.animation.shapekey_compression import PcaShapekeySink, AdaptiveShapekeySink
+from c0s_lewd_utilities.addon_utils.animation.point_cache_sinks import Pc2FileSink, MddFileSink
+from c0s_lewd_utilities.addon_utils.animation.texture_sinks import VertexAnimationTextureSink
+from c0s_lewd_utilities.addon_utils.animation.geometry_nodes_playback import FrameTableSink
+from c0s_lewd_utilities.addon_utils.animation import geometry_nodes_playback
+from c0s_lewd_utilities.addon_utils.animation import playback_benchmark
+from c0s_lewd_utilities.addon_utils.animation import parallel_bake
+from c0s_lewd_utilities.addon_utils.animation.bake_checkpoint import BakeCheckpoint, get_default_cache_dir
+from c0s_lewd_utilities.addon_utils.animation import memory_estimate
+from c0s_lewd_utilities.addon_utils.animation.pipelined_sinks import PipelinedSink, pipeline_thread_safe_sinks
+from c0s_lewd_utilities.addon_utils.animation import physics_cache
+from c0s_lewd_utilities.addon_utils.animation import bake_fingerprint
+from c0s_lewd_utilities.addon_utils.animation.isolated_scene import IsolatedEvaluationScene
+from c0s_lewd_utilities.addon_utils.animation import isolated_scene
+from c0s_lewd_utilities.addon_utils.mesh.modifier_stack import ModifierStackSplitter, get_trailing_subdivision_modifier
 from c0s_lewd_utilities.addon_utils.context_related.area_type_changer import AreaTypeChanger
 from c0s_lewd_utilities.addon_utils.general.propertygroup_handler import get_props_from_string
 from c0s_lewd_utilities.addon_utils.general.operator_handler import PollMethods as OpPollMethods
@@ -31,6 +53,13 @@ from c0s_lewd_utilities.names import is_print_enabled
 
 _data_path = "c0_lewd_utilities.animation.shapekey_convert"
 
+# outputs that only write files and don't need a new object
+_file_output_modes = {"POINT_CACHE", "NPY_FILE"}
+
+# {object name: frames per second of its last conversion}, shown in the panel.
+# Not stored on the object, writing to it would tag it for a depsgraph update.
+_last_frames_per_second = dict()
+
 
 class OBJECT_OT_animate_with_shapekeys(bpy.types.Operator):
     bl_idname = "object.animate_with_shapekeys"
@@ -41,11 +70,16 @@ class OBJECT_OT_animate_with_shapekeys(bpy.types.Operator):
     def execute(self, context):
         obj = context.active_object
         props = get_props_from_string(object=obj, datapath=_data_path)
-        frame_first = props.frame_start
-        frame_last = props.frame_end
+        if self._split_modifier_stack(obj=obj, props=props) == False:
+            return {'CANCELLED'}
+        try:
+            return self._execute_conversion(context=context, obj=obj, props=props)
+        finally:
+            self._restore_modifier_stack()
+
+    def _execute_conversion(self, context, obj, props):
         only_current_frame = props.only_current_frame
         apply_transforms = props.apply_transforms
-        obj_target = props.target_obj
 
         area_orig = AreaTypeChanger.change_area_to_good_type(context)
         # some functions below have problems working if context.area.type is "PROPERTIES", and this will be the case with this operator.
@@ -60,28 +94,610 @@ class OBJECT_OT_animate_with_shapekeys(bpy.types.Operator):
                 keep_vertex_groups=True,
                 keep_materials=True)
             obj_new = create_real_mesh.create_new_obj_for_mesh(context=context, name=obj.name + "_shape_applied", mesh=mesh_new)
+            objs_new = [obj_new]
+
+        elif props.output_mode == "SHAPEKEYS" and props.extract_without_datablocks == False:
+            obj_new = self._convert_to_shapekeys_with_datablocks(context=context, obj=obj, props=props)
+            if obj_new == None:
+                AreaTypeChanger.reset_area(area_orig)
+                return {'CANCELLED'}
+            objs_new = [obj_new]
 
         else:
-            sk_converter = animation_to_shapekeys.AnimationToShapekeyConverter(
-                main_context=context,
-                obj_orig=obj,
-                apply_transforms=apply_transforms,
-                keep_vertex_groups=True,
-                keep_materials=True)
-            obj_new = sk_converter.set_obj_new(obj_new=obj_target, frame=frame_first)
-            if obj_target != None:
-                # means we use an already existing object and should check if it's actually valid
-                if sk_converter.is_given_obj_new_valid() == False:
-                    AreaTypeChanger.reset_area(area_orig)
-                    self.report({'ERROR'}, "target object does not have the same topology of your main object (if every modifier had been applied).")
-                    print(self.as_keywords())
-                    return {'CANCELLED'}
+            if self._prepare_conversion(context=context, obj=obj, props=props) == False:
+                AreaTypeChanger.reset_area(area_orig)
+                return {'CANCELLED'}
+            try:
+                self._feeder.process_all()
+            except BaseException:
+                self._abort_conversion(props=props)
+                raise
+            if self._finish_conversion(context=context, props=props) == False:
+                AreaTypeChanger.reset_area(area_orig)
+                return {'CANCELLED'}
+            objs_new = self._get_objs_new()
 
-            sk_converter.go_over_multiple_frames_at_once(frame_start=frame_first, frame_end=frame_last, print_frames=is_print_enabled(context=context))
+        self._add_live_modifiers(objs_new=objs_new)
+        if len(objs_new) != 0:
+            select_objects.select_objects(context=context, object_list=objs_new, deselect_others=True)
 
-        select_objects.select_objects(context=context, object_list=[obj_new], deselect_others=True)
+        AreaTypeChanger.reset_area(area_orig)
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        obj = context.active_object
+        props = get_props_from_string(object=obj, datapath=_data_path)
+        if props.bake_in_chunks == False or props.only_current_frame == True or (props.output_mode == "SHAPEKEYS" and props.extract_without_datablocks == False):
+            return self.execute(context)
+        if props.worker_count > 1:
+            # the results of the workers can only be read once all of them are done, there's nothing to do in between
+            self.report({'WARNING'}, "Convert In Chunks can't be used with multiple worker processes, Blender is busy until all workers are done and the conversion can't be cancelled.")
+            return self.execute(context)
 
+        if self._split_modifier_stack(obj=obj, props=props) == False:
+            return {'CANCELLED'}
+        area_orig = AreaTypeChanger.change_area_to_good_type(context)
+        try:
+            is_prepared = self._prepare_conversion(context=context, obj=obj, props=props)
+        except BaseException:
+            self._restore_modifier_stack()
+            raise
         AreaTypeChanger.reset_area(area_orig)
+        if is_prepared == False:
+            self._restore_modifier_stack()
+            return {'CANCELLED'}
+
+        self._obj = obj
+        window_manager = context.window_manager
+        # the timer only makes sure we get called again, the actual chunk size comes from chunk_budget_ms
+        self._timer = window_manager.event_timer_add(time_step=0.01, window=context.window)
+        window_manager.progress_begin(0, len(self._feeder.frames))
+        window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self._feeder.cancel()
+            return self._end_modal(context=context)
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        props = get_props_from_string(object=self._obj, datapath=_data_path)
+        try:
+            is_finished = self._feeder.process_chunk(time_budget=props.chunk_budget_ms / 1000)
+        except BaseException:
+            context.window_manager.event_timer_remove(self._timer)
+            context.window_manager.progress_end()
+            self._abort_conversion(props=props)
+            self._restore_modifier_stack()
+            raise
+        # the throughput is only stored once at the end, writing to the object here would tag it for an update after every chunk
+        context.window_manager.progress_update(self._feeder.frames_done)
+        if is_finished == True:
+            return self._end_modal(context=context)
+        return {'RUNNING_MODAL'}
+
+    def _end_modal(self, context):
+        window_manager = context.window_manager
+        window_manager.event_timer_remove(self._timer)
+        window_manager.progress_end()
+        props = get_props_from_string(object=self._obj, datapath=_data_path)
+        self._restore_modifier_stack()
+        if self._finish_conversion(context=context, props=props) == False:
+            return {'CANCELLED'}
+        objs_new = self._get_objs_new()
+        self._add_live_modifiers(objs_new=objs_new)
+        if len(objs_new) != 0:
+            select_objects.select_objects(context=context, object_list=objs_new, deselect_others=True)
+        # also when cancelled, so the partial result becomes an undo step
+        return {'FINISHED'}
+
+    def _split_modifier_stack(self, obj, props) -> bool:
+        """Disables the modifiers from bake_up_to_modifier on (see modifier_stack.py), if set. Returns False if the modifier doesn't exist."""
+        self._modifier_splitter = None
+        if props.bake_up_to_modifier == "" or props.only_current_frame == True:
+            return True
+        splitter = ModifierStackSplitter(obj=obj, modifier_name=props.bake_up_to_modifier)
+        if len(splitter.modifiers) == 0:
+            self.report({'ERROR'}, "The object doesn't have an enabled modifier called \"" + props.bake_up_to_modifier + "\".")
+            return False
+        splitter.disable()
+        self._modifier_splitter = splitter
+        return True
+
+    def _restore_modifier_stack(self) -> None:
+        if self._modifier_splitter != None:
+            self._modifier_splitter.restore()
+
+    def _add_live_modifiers(self, objs_new) -> None:
+        if self._modifier_splitter == None:
+            return
+        for obj_new in objs_new:
+            self._modifier_splitter.add_to(obj_new=obj_new)
+        names = ", ".join(modifier.name for modifier in self._modifier_splitter.modifiers)
+        self.report({'INFO'}, "Baked up to \"" + self._modifier_splitter.modifiers[0].name + "\", re-added as live modifiers: " + names)
+        if any(modifier.type == 'MULTIRES' for modifier in self._modifier_splitter.modifiers):
+            self.report({'WARNING'}, "Multires modifiers were re-added as Subdivision Surface modifiers, sculpted details aren't kept.")
+
+    def _create_converter(self, context, obj, props) -> animation_to_shapekeys.AnimationToShapekeyConverter:
+        return animation_to_shapekeys.AnimationToShapekeyConverter(
+            main_context=context,
+            obj_orig=obj,
+            apply_transforms=props.apply_transforms,
+            keep_vertex_groups=True,
+            keep_materials=True,
+            extract_without_datablocks=props.extract_without_datablocks)
+
+    def _create_shapekey_sink(self, obj_new, props):
+        """Returns the sink for the chosen compression, or None for the normal ShapekeySink."""
+        if props.shapekey_compression == "PCA":
+            max_components = props.pca_max_components
+            if max_components == 0:
+                max_components = None
+            return PcaShapekeySink(obj=obj_new, max_error=props.compression_max_error, max_components=max_components)
+        elif props.shapekey_compression == "ADAPTIVE":
+            return AdaptiveShapekeySink(obj=obj_new, max_error=props.compression_max_error)
+        return None
+
+    def _get_objects_to_convert(self, context, obj, props) -> list:
+        """The active object, plus the other selected mesh objects if convert_selected_objects is enabled."""
+        objs = [obj]
+        if props.convert_selected_objects == True:
+            objs += [obj_selected for obj_selected in context.selected_objects if obj_selected != obj and OpPollMethods.is_object_with_mesh(obj=obj_selected)]
+        return objs
+
+    def _get_point_cache_filepath(self, obj, props, is_multiple) -> str:
+        extension = "." + props.point_cache_format.lower()
+        filepath = props.point_cache_filepath
+        if filepath == "":
+            return "//" + bpy.path.clean_name(obj.name) + extension
+        if is_multiple == True:
+            # one file per object, in the folder of the chosen file
+            return os.path.join(os.path.dirname(bpy.path.abspath(filepath)), bpy.path.clean_name(obj.name) + extension)
+        return filepath
+
+    def _get_npy_filepath(self, obj) -> str:
+        cache_dir = get_default_cache_dir()
+        os.makedirs(cache_dir, exist_ok=True)
+        return os.path.join(cache_dir, bpy.path.clean_name(obj.name) + "_frames.npy")
+
+    def _create_output_sink(self, context, obj, obj_new, props, is_multiple):
+        """The sink for the chosen output mode, except for shapekeys."""
+        if self._output_mode == "NPY_FILE":
+            return NpyFileSink(filepath=self._get_npy_filepath(obj=obj))
+        elif self._output_mode == "POINT_CACHE":
+            filepath = self._get_point_cache_filepath(obj=obj, props=props, is_multiple=is_multiple)
+            if props.point_cache_format == "PC2":
+                return Pc2FileSink(filepath=filepath, swap_yz=props.point_cache_swap_yz)
+            render = context.scene.render
+            return MddFileSink(filepath=filepath, fps=render.fps / render.fps_base, swap_yz=props.point_cache_swap_yz)
+        elif self._output_mode == "VAT":
+            return VertexAnimationTextureSink(obj=obj_new, normalize=props.vat_normalize)
+        return FrameTableSink(context=context, obj=obj_new)
+
+    def _estimate_memory(self, context, objs, frames, props) -> int:
+        """Estimated peak memory of the conversion in bytes, see memory_estimate.py."""
+        depsgraph = context.evaluated_depsgraph_get()
+        # so the panel shows the current numbers afterwards
+        memory_estimate.update_vertex_counts(depsgraph=depsgraph, objs=objs)
+        vertex_count = sum(memory_estimate.get_cached_vertex_count(obj=obj_orig) for obj_orig in objs)
+        return memory_estimate.estimate_peak_memory(vertex_count=vertex_count, frame_count=len(frames), output_mode=self._output_mode, shapekey_compression=props.shapekey_compression)
+
+    def _pipeline_sinks(self, sinks, props) -> list:
+        """Moves the thread-safe sinks to background threads (see pipelined_sinks.py), if enabled."""
+        if props.pipeline_queue_size == 0:
+            return list(sinks)
+        sinks = pipeline_thread_safe_sinks(sinks=sinks, queue_size=props.pipeline_queue_size)
+        self._pipelined_sinks += [sink for sink in sinks if isinstance(sink, PipelinedSink)]
+        return sinks
+
+    def _can_read_physics_cache(self, context, obj, frames, props) -> bool:
+        """Checks if the frames can be read directly from a simulation cache (see physics_cache.py) and reports why not, if the object has one."""
+        if props.read_physics_cache == False:
+            return False
+        if physics_cache.get_physics_modifier(obj) == None:
+            if any(modifier.type == 'MESH_SEQUENCE_CACHE' and modifier.show_viewport == True for modifier in obj.modifiers):
+                self.report({'INFO'}, "Mesh Sequence Cache modifiers can only be read directly as part of a cloth or softbody cache, the frames get evaluated normally.")
+            return False
+        vertex_count = memory_estimate.get_evaluated_vertex_count(depsgraph=context.evaluated_depsgraph_get(), obj=obj)
+        problem = physics_cache.get_direct_read_problem(context=context, obj=obj, frames=frames, apply_transforms=props.apply_transforms, vertex_count=vertex_count)
+        if problem != None:
+            self.report({'INFO'}, "The frames get evaluated normally, " + problem + ".")
+            return False
+        self.report({'INFO'}, "Reading the frames directly from the simulation cache.")
+        return True
+
+    def _get_dedup_tolerance(self, props):
+        if props.shapekey_compression == "NONE" and props.deduplicate_static_frames == True:
+            return props.dedup_tolerance
+        if props.shapekey_compression == "NONE" and props.skip_static_frames == True:
+            # static frames get the exact positions of the frame before them, this lets them share its shapekey
+            return 0.0
+        return None
+
+    def _get_frames_to_evaluate(self, objs, frames, props):
+        """The frames that need to be evaluated according to the analysis of the animation (see animated_ranges.py), or None for all of them."""
+        if props.skip_static_frames == False or len(frames) == 0:
+            return None
+        reason = animated_ranges.get_time_dependency(objs=objs)
+        if reason != None:
+            self.report({'INFO'}, "Every frame gets evaluated, " + reason + ".")
+            return None
+        frames_changing = animated_ranges.get_changing_frames(objs=objs, frames=frames)
+        frames_to_evaluate = animated_ranges.get_frames_to_evaluate(frames=frames, frames_changing=frames_changing)
+        intervals = [str(first) if first == last else str(first) + "-" + str(last) for first, last in animated_ranges.get_intervals(frames_changing)]
+        if len(intervals) > 10:
+            intervals = intervals[:10] + ["..."]
+        self.report({'INFO'}, "Animated ranges: " + (", ".join(intervals) if len(intervals) != 0 else "none")
+                    + ". Evaluating " + str(len(frames_to_evaluate)) + " of " + str(len(frames)) + " frames.")
+        return frames_to_evaluate
+
+    def _get_region_settings(self, props) -> list:
+        """Settings of the region of interest, for the checkpoint and the fingerprints."""
+        if props.region_of_interest == "VERTEX_GROUP":
+            return [props.region_of_interest, props.roi_vertex_group]
+        elif props.region_of_interest == "MOTION":
+            return [props.region_of_interest, props.roi_motion_threshold, props.roi_sample_count]
+        return [props.region_of_interest]
+
+    def _get_region_vertex_indices(self, context, obj, obj_new, frames, basis_positions, use_physics_cache, props) -> np.ndarray:
+        """The vertices of the region of interest (see region_of_interest.py).
+        The sample frames are read the same way as the frames of the conversion afterwards: from the simulation cache,
+        or with the walker of the conversion (in the isolated scene, if there is one). Call it after _create_isolated_scene()."""
+        if props.region_of_interest == "VERTEX_GROUP":
+            return region_of_interest.get_vertex_group_indices(obj=obj_new, vertex_group_name=props.roi_vertex_group)
+        sample_frames = region_of_interest.get_sample_frames(frames=frames, sample_count=props.roi_sample_count)
+        if use_physics_cache == True:
+            frame_iterator = physics_cache.iterate_cached_frames(context=context, obj=obj, frames=sample_frames, apply_transforms=props.apply_transforms)
+        else:
+            frame_iterator = iterate_evaluated_frames(context=context,
+                                                      obj=obj,
+                                                      frames=sample_frames,
+                                                      apply_transforms=props.apply_transforms,
+                                                      walker=self._walker,
+                                                      view_layer=self._get_view_layer())
+        return region_of_interest.get_moving_vertex_indices(frame_iterator=frame_iterator, basis_positions=basis_positions, threshold=props.roi_motion_threshold)
+
+    def _create_checkpoint(self, objs, frames, props) -> None:
+        if props.use_checkpoint == False:
+            return
+        # the output mode doesn't matter for the cached positions, so a cancelled conversion can be resumed with a different one
+        settings = {"objects": [obj_orig.name for obj_orig in objs],
+                    "apply_transforms": props.apply_transforms,
+                    "blend_file": bpy.data.filepath,
+                    "bake_up_to_modifier": props.bake_up_to_modifier,
+                    "region": self._get_region_settings(props=props)}
+        self._checkpoint = BakeCheckpoint(frames=frames, settings=settings)
+        frames_cached = len(self._checkpoint.get_done_frames())
+        if frames_cached != 0:
+            self.report({'INFO'}, "Resuming, " + str(frames_cached) + " of " + str(len(frames)) + " frames are already cached.")
+
+    def _create_isolated_scene(self, context, objs, frames, props) -> None:
+        """Creates the isolated scene (see isolated_scene.py) and the walker for it, if enabled."""
+        if props.isolate_dependencies == False or len(frames) == 0:
+            return
+        if props.worker_count > 1:
+            self.report({'INFO'}, "Isolate Dependencies is ignored when using worker processes.")
+            return
+        problem = isolated_scene.get_isolation_problem(objs=objs)
+        if problem != None:
+            self.report({'WARNING'}, "Isolate Dependencies is ignored and the full scene gets evaluated, " + problem + ".")
+            return
+        self._isolated_scene = IsolatedEvaluationScene(context=context, objs=objs)
+        self._isolated_scene.create()
+        speedup = self._isolated_scene.measure_speedup(frames=frames)
+        self._walker = FrameWalker(scene=self._isolated_scene.scene)
+        self.report({'INFO'}, "Isolated scene with " + str(len(self._isolated_scene.objects)) + " objects evaluates "
+                    + str(round(speedup, 2)) + " times as fast as the full scene.")
+
+    def _get_view_layer(self):
+        if self._isolated_scene == None:
+            return None
+        return self._isolated_scene.view_layer
+
+    def _remove_isolated_scene(self) -> None:
+        if self._isolated_scene != None:
+            self._isolated_scene.remove()
+
+    def _prepare_conversion(self, context, obj, props) -> bool:
+        """Creates the sinks and the feeder for all outputs that stream the frames (everything except the shapekeys with datablocks).
+        No frames are processed yet. Returns False if something went wrong."""
+        self._output_mode = props.output_mode
+        self._outputs = []
+        self._statistics = StatisticsSink()
+        self._walker = FrameWalker(scene=context.scene)
+        self._checkpoint = None
+        self._multi_converter = None
+        self._fingerprints = None
+        self._isolated_scene = None
+        self._pipelined_sinks = []
+        frames = list(range(props.frame_start, props.frame_end + 1))
+        objs = self._get_objects_to_convert(context=context, obj=obj, props=props)
+        use_physics_cache = None
+        if props.worker_count > 1:
+            if len(objs) > 1:
+                self.report({'ERROR'}, "Multiple worker processes can only be used when converting a single object.")
+                return False
+            # the workers aren't used at all if the frames come from the simulation cache
+            if parallel_bake.has_simulation(obj=obj) == True:
+                use_physics_cache = self._can_read_physics_cache(context=context, obj=obj, frames=frames, props=props)
+            if use_physics_cache == False:
+                self.report({'ERROR'}, "Objects with simulations can't be converted with multiple worker processes, each frame depends on the previous ones.")
+                return False
+        if self._modifier_splitter != None and len(objs) > 1:
+            self.report({'ERROR'}, "Baking up to a modifier can only be used when converting a single object.")
+            return False
+        if props.region_of_interest != "NONE" and (len(objs) > 1 or self._output_mode != "SHAPEKEYS"):
+            self.report({'ERROR'}, "A region of interest can only be used when converting a single object to shapekeys.")
+            return False
+        memory_estimated = self._estimate_memory(context=context, objs=objs, frames=frames, props=props)
+        memory_budget = props.memory_budget_gb * 1024 ** 3
+        if memory_budget > 0 and memory_estimated > memory_budget and self._output_mode not in _file_output_modes:
+            self.report({'WARNING'}, "The conversion would need about " + memory_estimate.format_byte_count(memory_estimated) + ", more than the budget of "
+                        + memory_estimate.format_byte_count(memory_budget) + ". The frames get written into .npy files instead.")
+            self._output_mode = "NPY_FILE"
+        if self._output_mode == "GEOMETRY_NODES":
+            vertex_counts = [memory_estimate.get_cached_vertex_count(obj=obj_orig) for obj_orig in objs]
+            # one table for all objects if they're combined, otherwise one each
+            table_vertex_count = sum(vertex_counts) if props.combine_selected_objects == True else max(vertex_counts)
+            if geometry_nodes_playback.is_table_size_supported(table_size=table_vertex_count * len(frames)) == False:
+                self.report({'ERROR'}, "The frame table would have " + str(table_vertex_count * len(frames)) + " vertices, more than the "
+                            + str(geometry_nodes_playback.max_float_table_size) + " that Geometry Nodes can index before Blender 4.2. Convert fewer frames or use another output.")
+                return False
+        create_basis_shapekey = (self._output_mode == "SHAPEKEYS")
+
+        if len(objs) > 1:
+            # target_obj is ignored here, every object gets its own new object
+            self._multi_converter = animation_to_shapekeys.MultiObjectAnimationConverter(main_context=context, objs_orig=objs, apply_transforms=props.apply_transforms)
+            if props.combine_selected_objects == True:
+                # one object (or file) for all of them, its sink gets the vertices of every object
+                obj_combined = None
+                if self._output_mode not in _file_output_modes:
+                    obj_combined = self._multi_converter.set_combined_obj_new(frame=props.frame_start, create_basis_shapekey=create_basis_shapekey)
+                if self._output_mode == "SHAPEKEYS":
+                    sink = self._create_shapekey_sink(obj_new=obj_combined, props=props)
+                    if sink == None:
+                        sink = ShapekeySink(obj=obj_combined, dedup_tolerance=self._get_dedup_tolerance(props=props))
+                else:
+                    sink = self._create_output_sink(context=context, obj=obj, obj_new=obj_combined, props=props, is_multiple=False)
+                self._outputs = [(obj_combined, sink)]
+                sinks_per_object = []
+                extra_sinks = [sink, self._statistics]
+            else:
+                if self._output_mode in _file_output_modes:
+                    objs_new = [None] * len(objs)
+                else:
+                    objs_new = self._multi_converter.set_objs_new(frame=props.frame_start, create_basis_shapekey=create_basis_shapekey)
+                if self._output_mode == "SHAPEKEYS":
+                    sinks_per_object = self._multi_converter.create_shapekey_sinks(dedup_tolerance=self._get_dedup_tolerance(props=props),
+                                                                                   shapekey_sinks=[self._create_shapekey_sink(obj_new=obj_new, props=props) for obj_new in objs_new])
+                    sinks = [converter.shapekey_sink for converter in self._multi_converter.converters]
+                else:
+                    sinks = [self._create_output_sink(context=context, obj=obj_orig, obj_new=obj_new, props=props, is_multiple=True) for obj_orig, obj_new in zip(objs, objs_new)]
+                    sinks_per_object = [[sink] for sink in sinks]
+                self._outputs = list(zip(objs_new, sinks))
+                extra_sinks = [self._statistics]
+            frames_to_evaluate = self._get_frames_to_evaluate(objs=objs, frames=frames, props=props)
+            self._create_checkpoint(objs=objs, frames=frames_to_evaluate if frames_to_evaluate != None else frames, props=props)
+            self._create_isolated_scene(context=context, objs=objs, frames=frames, props=props)
+            self._feeder = self._multi_converter.create_frame_feeder(frames=frames,
+                                                                     sinks_per_object=[self._pipeline_sinks(sinks=object_sinks, props=props) for object_sinks in sinks_per_object],
+                                                                     extra_sinks=self._pipeline_sinks(sinks=extra_sinks, props=props),
+                                                                     print_frames=is_print_enabled(context=context),
+                                                                     walker=self._walker,
+                                                                     walk_sequentially=props.walk_sequentially,
+                                                                     checkpoint=self._checkpoint,
+                                                                     view_layer=self._get_view_layer(),
+                                                                     frames_to_evaluate=frames_to_evaluate)
+            return True
+
+        sk_converter = self._create_converter(context=context, obj=obj, props=props)
+        obj_new = None
+        if self._output_mode not in _file_output_modes:
+            obj_target = props.target_obj
+            obj_new = sk_converter.set_obj_new(obj_new=obj_target, frame=props.frame_start, create_basis_shapekey=create_basis_shapekey)
+            if obj_target != None and sk_converter.is_given_obj_new_valid() == False:
+                # means we use an already existing object and it's not valid
+                self.report({'ERROR'}, "target object does not have the same topology of your main object (if every modifier had been applied).")
+                return False
+        if self._output_mode == "SHAPEKEYS" and props.incremental_rebake == True:
+            # only the frames whose inputs changed since the last conversion onto obj_new get evaluated again
+            settings = {"object": obj.name,
+                        "apply_transforms": props.apply_transforms,
+                        "bake_up_to_modifier": props.bake_up_to_modifier,
+                        "region": self._get_region_settings(props=props)}
+            self._fingerprints = bake_fingerprint.get_frame_fingerprints(obj=obj, frames=frames, settings=settings)
+            frames = bake_fingerprint.get_changed_frames(fingerprints=self._fingerprints, stored_fingerprints=bake_fingerprint.get_stored_fingerprints(obj=obj_new))
+            sinks = sk_converter.create_shapekey_sinks(extra_sinks=[self._statistics], shapekey_sink=IncrementalShapekeySink(obj=obj_new))
+            sink = sk_converter.shapekey_sink
+        elif self._output_mode == "SHAPEKEYS":
+            sinks = sk_converter.create_shapekey_sinks(extra_sinks=[self._statistics],
+                                                       dedup_tolerance=self._get_dedup_tolerance(props=props),
+                                                       shapekey_sink=self._create_shapekey_sink(obj_new=obj_new, props=props))
+            sink = sk_converter.shapekey_sink
+        else:
+            sink = self._create_output_sink(context=context, obj=obj, obj_new=obj_new, props=props, is_multiple=False)
+            sinks = [sink, self._statistics]
+        self._outputs = [(obj_new, sink)]
+        frames_to_evaluate = self._get_frames_to_evaluate(objs=objs, frames=frames, props=props)
+        self._create_checkpoint(objs=objs, frames=frames_to_evaluate if frames_to_evaluate != None else frames, props=props)
+        if use_physics_cache == None:
+            use_physics_cache = self._can_read_physics_cache(context=context, obj=obj, frames=frames_to_evaluate if frames_to_evaluate != None else frames, props=props)
+        if use_physics_cache == False:
+            self._create_isolated_scene(context=context, objs=objs, frames=frames, props=props)
+        vertex_indices = None
+        if props.region_of_interest != "NONE" and self._output_mode == "SHAPEKEYS":
+            basis_positions = np.empty((len(obj_new.data.vertices), 3), dtype=np.float32)
+            obj_new.data.vertices.foreach_get("co", basis_positions.ravel())
+            vertex_indices = self._get_region_vertex_indices(context=context, obj=obj, obj_new=obj_new, frames=frames, basis_positions=basis_positions,
+                                                             use_physics_cache=use_physics_cache, props=props)
+            if len(vertex_indices) == 0:
+                self.report({'ERROR'}, "The region of interest doesn't contain any vertices.")
+                self._remove_isolated_scene()
+                self._remove_new_objs(props=props)
+                return False
+            # only the shapekey sink needs whole frames, the statistics are fine with the region
+            sinks[0] = RegionOfInterestSink(sink=sinks[0], vertex_indices=vertex_indices, basis_positions=basis_positions)
+            self.report({'INFO'}, "Region of interest: " + str(len(vertex_indices)) + " of " + str(len(basis_positions)) + " vertices.")
+        self._feeder = sk_converter.create_frame_feeder(frames=frames,
+                                                        sinks=self._pipeline_sinks(sinks=sinks, props=props),
+                                                        print_frames=is_print_enabled(context=context),
+                                                        walker=self._walker,
+                                                        walk_sequentially=props.walk_sequentially,
+                                                        worker_count=props.worker_count,
+                                                        checkpoint=self._checkpoint,
+                                                        view_layer=self._get_view_layer(),
+                                                        vertex_indices=vertex_indices,
+                                                        frames_to_evaluate=frames_to_evaluate,
+                                                        use_physics_cache=use_physics_cache)
+        return True
+
+    def _get_objs_new(self) -> list:
+        return [obj_new for obj_new, sink in self._outputs if obj_new != None]
+
+    def _remove_new_objs(self, props) -> None:
+        """Removes the objects this conversion created (not the target object), for example if they didn't get any frames."""
+        outputs = []
+        for obj_new, sink in self._outputs:
+            if obj_new != None and obj_new != props.target_obj:
+                mesh = obj_new.data
+                bpy.data.objects.remove(obj_new)
+                if mesh.users == 0:
+                    bpy.data.meshes.remove(mesh)
+                obj_new = None
+            outputs.append((obj_new, sink))
+        self._outputs = outputs
+
+    def _abort_conversion(self, props) -> None:
+        """Cleans up after an exception while converting, the caller raises it again.
+        The sinks are closed without a result (see ChunkedFrameFeeder.abort()), so the new objects are removed as well."""
+        self._feeder.abort()
+        if self._checkpoint != None:
+            # the frames done so far can still be used by the next conversion
+            self._checkpoint.close()
+        self._remove_isolated_scene()
+        self._remove_new_objs(props=props)
+
+    def _finish_conversion(self, context, props) -> bool:
+        """Reports the results once the feeder is done (or was cancelled). Returns False if nothing was converted."""
+        statistics = self._statistics
+        # the feeder is done with it, and the objects are still in the original scene
+        self._remove_isolated_scene()
+        # props.id_data is the converted object
+        _last_frames_per_second[props.id_data.name_full] = self._feeder.get_frames_per_second()
+        if self._feeder.was_cancelled == True:
+            self.report({'WARNING'}, "Cancelled after " + str(self._feeder.frames_done) + " of " + str(len(self._feeder.frames)) + " frames, the result only contains those.")
+        if self._checkpoint != None:
+            if self._feeder.was_cancelled == True:
+                self._checkpoint.close()
+                self.report({'INFO'}, "The converted frames are kept in " + self._checkpoint.directory + ", converting again with the same settings continues from there.")
+            else:
+                self._checkpoint.delete()
+        if self._fingerprints != None:
+            # only for the frames that were actually converted, so a cancelled update continues with the rest next time
+            obj_new = self._outputs[0][0]
+            frames_done = self._feeder.frames[:self._feeder.frames_done]
+            bake_fingerprint.store_fingerprints(obj=obj_new, fingerprints={frame: self._fingerprints[frame] for frame in frames_done})
+            self.report({'INFO'}, str(len(self._fingerprints) - len(self._feeder.frames)) + " of " + str(len(self._fingerprints)) + " frames were unchanged and skipped, "
+                        + str(len(self._outputs[0][1].updated_shapekeys)) + " shapekeys updated.")
+        for sink in self._pipelined_sinks:
+            message = ("Background thread of " + type(sink.sink).__name__ + ": queue depth " + str(round(sink.get_average_queue_depth(), 1)) + " on average, "
+                       + str(sink.max_queue_depth) + " of " + str(sink.queue_size) + " at most, main thread waited " + str(round(sink.producer_stall_seconds, 3))
+                       + " s, background thread waited " + str(round(sink.consumer_idle_seconds, 3)) + " s.")
+            self.report({'INFO'}, message)
+            if is_print_enabled(context=context):
+                print(message)
+        if statistics.frame_count == 0:
+            # e.g. cancelled before the first frame, the new objects would only be a copy of the original
+            self._remove_new_objs(props=props)
+            if self._output_mode in {"VAT", "GEOMETRY_NODES"}:
+                self.report({'ERROR'}, "No frames were converted.")
+                return False
+
+        speed = str(round(statistics.get_frames_per_second(), 2)) + " frames/s"
+        if self._multi_converter != None:
+            evaluations_saved = self._multi_converter.get_evaluations_saved(walker=self._walker)
+        else:
+            evaluations_saved = self._walker.get_evaluations_saved()
+        evaluations_saved = "saved " + str(evaluations_saved) + " scene evaluations."
+        for obj_new, sink in self._outputs:
+            if self._output_mode == "NPY_FILE":
+                self.report({'INFO'}, "Wrote " + str(sink.frames_written) + " frames (" + speed + ") to " + sink.filepath + ", " + evaluations_saved
+                            + " Load it with numpy.load(path, mmap_mode=\"r\").")
+            elif self._output_mode == "POINT_CACHE":
+                self.report({'INFO'}, "Wrote " + str(sink.frames_written) + " frames (" + speed + ") to " + sink.filepath + ", " + evaluations_saved)
+            elif self._output_mode == "VAT":
+                self.report({'INFO'}, "Created " + sink.image.name + " (" + str(sink.image.size[0]) + "x" + str(sink.image.size[1]) + ", " + speed + "), " + evaluations_saved
+                            + " Offset range: " + str(round(sink.offset_min, 6)) + " to " + str(round(sink.offset_max, 6)))
+                if sink.image.size[0] > 16384:
+                    self.report({'WARNING'}, "The image is wider than 16384 pixels, which many GPUs can't handle.")
+            elif self._output_mode == "GEOMETRY_NODES":
+                self.report({'INFO'}, "Created frame table " + sink.obj_table.name + " (" + str(sink.frames_written) + " frames, " + speed + "), " + evaluations_saved)
+            else:
+                self.report({'INFO'}, "Converted " + str(statistics.frame_count) + " frames (" + speed + ") into " + str(len(sink.created_shapekeys)) + " shapekeys, " + evaluations_saved)
+                if props.shapekey_compression == "PCA":
+                    self.report({'INFO'}, "PCA: " + str(sink.component_count) + " basis shapekeys, max. vertex error: " + str(round(sink.max_error_result, 6)))
+        return True
+
+    def _convert_to_shapekeys_with_datablocks(self, context, obj, props):
+        """The old way of creating the shapekeys, with a temporary mesh for every frame.
+        Returns the object with the new shapekeys, or None if something went wrong."""
+        frame_first = props.frame_start
+        frame_last = props.frame_end
+        obj_target = props.target_obj
+
+        sk_converter = self._create_converter(context=context, obj=obj, props=props)
+        obj_new = sk_converter.set_obj_new(obj_new=obj_target, frame=frame_first)
+        if obj_target != None:
+            # means we use an already existing object and should check if it's actually valid
+            if sk_converter.is_given_obj_new_valid() == False:
+                self.report({'ERROR'}, "target object does not have the same topology of your main object (if every modifier had been applied).")
+                print(self.as_keywords())
+                return None
+
+        evaluations_saved = sk_converter.go_over_multiple_frames_at_once(frame_start=frame_first,
+                                                                         frame_end=frame_last,
+                                                                         print_frames=is_print_enabled(context=context),
+                                                                         walk_sequentially=props.walk_sequentially)
+        self.report({'INFO'}, "Saved " + str(evaluations_saved) + " scene evaluations.")
+        return obj_new
+
+    @classmethod
+    def poll(clss, context):
+        obj = context.active_object
+        return OpPollMethods.is_object_with_mesh(obj=obj)
+
+
+class OBJECT_OT_compare_baked_playback(bpy.types.Operator):
+    bl_idname = "object.compare_baked_playback"
+    bl_label = "Compare the playback speed of the selected objects."
+    bl_description = "Steps through the frame range once for each selected object (with the others hidden) and reports how many frames per second could be evaluated"
+
+    def execute(self, context):
+        props = get_props_from_string(object=context.active_object, datapath=_data_path)
+        objects = [obj for obj in context.selected_objects if OpPollMethods.is_object_with_mesh(obj=obj)]
+        results = playback_benchmark.compare_playback(scene=context.scene, objects=objects, frame_start=props.frame_start, frame_end=props.frame_end)
+        for name, frames_per_second in results.items():
+            self.report({'INFO'}, name + ": " + str(round(frames_per_second, 2)) + " frames/s")
+            if is_print_enabled(context=context):
+                print(name + ": " + str(round(frames_per_second, 2)) + " frames/s")
+        return {'FINISHED'}
+
+    @classmethod
+    def poll(clss, context):
+        obj = context.active_object
+        return OpPollMethods.is_object_with_mesh(obj=obj)
+
+
+class OBJECT_OT_estimate_conversion_memory(bpy.types.Operator):
+    bl_idname = "object.estimate_conversion_memory"
+    bl_label = "Update the memory estimate of the conversion."
+    bl_description = "Evaluates the objects to convert once to get their amount of vertices for the memory estimate. It's also updated whenever their geometry changes"
+
+    def execute(self, context):
+        props = get_props_from_string(object=context.active_object, datapath=_data_path)
+        objs = get_objects_for_estimate(context=context, props=props)
+        memory_estimate.update_vertex_counts(depsgraph=context.evaluated_depsgraph_get(), objs=objs)
         return {'FINISHED'}
 
     @classmethod
@@ -90,6 +706,15 @@ class OBJECT_OT_animate_with_shapekeys(bpy.types.Operator):
         return OpPollMethods.is_object_with_mesh(obj=obj)
 
 
+def get_objects_for_estimate(context, props) -> list:
+    """The objects a conversion with the current settings would convert, for the memory estimate."""
+    obj = context.active_object
+    objs = [obj]
+    if props.convert_selected_objects == True:
+        objs += [obj_selected for obj_selected in context.selected_objects if obj_selected != obj and OpPollMethods.is_object_with_mesh(obj=obj_selected)]
+    return objs
+
+
 class OBJECT_PT_animate_with_shapekeys(bpy.types.Panel):
     bl_space_type = 'PROPERTIES'
     bl_region_type = 'WINDOW'
@@ -112,6 +737,7 @@ class OBJECT_PT_animate_with_shapekeys(bpy.types.Panel):
         only_current_frame = props.only_current_frame
         apply_transforms = props.apply_transforms
         obj_target = props.target_obj
+        is_shapekey_output = (only_current_frame == False and props.output_mode == "SHAPEKEYS")
 
         layout.prop(
             data=props,
@@ -119,6 +745,48 @@ class OBJECT_PT_animate_with_shapekeys(bpy.types.Panel):
             text="Only Convert Current Frame"
         )
 
+        # output
+        column_output = layout.column()
+        column_output.prop(
+            data=props,
+            property="output_mode",
+            text="Output")
+        if props.output_mode == "VAT":
+            column_output.prop(
+                data=props,
+                property="vat_normalize",
+                text="Normalize Offsets")
+        if props.output_mode == "POINT_CACHE":
+            column_output.prop(
+                data=props,
+                property="point_cache_format",
+                text="Format")
+            column_output.prop(
+                data=props,
+                property="point_cache_filepath",
+                text="File")
+            column_output.prop(
+                data=props,
+                property="point_cache_swap_yz",
+                text="Swap Y and Z")
+        column_output.prop(
+            data=props,
+            property="memory_budget_gb",
+            text="Memory Budget (GB)")
+        memory_estimated = self._estimate_memory(context=context, props=props)
+        row_memory = column_output.row()
+        if memory_estimated == None:
+            row_memory.label(text="Estimated Memory: unknown", translate=False)
+        else:
+            is_over_budget = (props.memory_budget_gb > 0 and memory_estimated > props.memory_budget_gb * 1024 ** 3)
+            row_memory.label(text="Estimated Memory: " + memory_estimate.format_byte_count(memory_estimated) + (" (over budget)" if is_over_budget == True else ""),
+                             icon='ERROR' if is_over_budget == True else 'NONE')
+        row_memory.operator(
+            operator=OBJECT_OT_estimate_conversion_memory.bl_idname,
+            text="",
+            icon='FILE_REFRESH')
+        column_output.active = (only_current_frame == False)
+
         # Frames and target object
         column_frames = layout.column()
         column_frames.prop(
@@ -130,13 +798,148 @@ class OBJECT_PT_animate_with_shapekeys(bpy.types.Panel):
             property="frame_end",
             text="End Frame")
         column_frames.active = (only_current_frame == False)
+        column_selected = layout.column()
+        column_selected.prop(
+            data=props,
+            property="convert_selected_objects",
+            text="Convert All Selected")
+        row_combine = column_selected.row()
+        row_combine.prop(
+            data=props,
+            property="combine_selected_objects",
+            text="Combine Into One Object")
+        row_combine.active = (props.convert_selected_objects == True)
+        column_selected.active = (only_current_frame == False and (props.output_mode != "SHAPEKEYS" or props.extract_without_datablocks == True))
         obj_target_selector = layout.column()
         obj_target_selector.prop(
             data=props,
             property="target_obj",
             text="Add Shapekeys to..."
         )
-        obj_target_selector.active = (only_current_frame == False)
+        obj_target_selector.active = (only_current_frame == False and props.output_mode != "POINT_CACHE" and props.convert_selected_objects == False)
+
+        column_walk = layout.column()
+        column_walk.prop(
+            data=props,
+            property="walk_sequentially",
+            text="Walk Frames Sequentially")
+        column_walk.prop(
+            data=props,
+            property="extract_without_datablocks",
+            text="Extract Without Datablocks")
+        row_workers = column_walk.row()
+        row_workers.prop(
+            data=props,
+            property="worker_count",
+            text="Worker Processes")
+        row_workers.active = (props.output_mode != "SHAPEKEYS" or props.extract_without_datablocks == True)
+        row_checkpoint = column_walk.row()
+        row_checkpoint.prop(
+            data=props,
+            property="use_checkpoint",
+            text="Resume Interrupted Conversions")
+        row_checkpoint.active = (props.output_mode != "SHAPEKEYS" or props.extract_without_datablocks == True)
+        row_isolate = column_walk.row()
+        row_isolate.prop(
+            data=props,
+            property="isolate_dependencies",
+            text="Isolate Dependencies")
+        row_isolate.active = ((props.output_mode != "SHAPEKEYS" or props.extract_without_datablocks == True) and props.worker_count == 1)
+        row_pipeline = column_walk.row()
+        row_pipeline.prop(
+            data=props,
+            property="pipeline_queue_size",
+            text="Background Queue Size")
+        row_pipeline.active = (props.output_mode != "SHAPEKEYS" or props.extract_without_datablocks == True)
+        row_physics_cache = column_walk.row()
+        row_physics_cache.prop(
+            data=props,
+            property="read_physics_cache",
+            text="Read Simulation Caches Directly")
+        row_physics_cache.active = (props.output_mode != "SHAPEKEYS" or props.extract_without_datablocks == True)
+        row_skip_static = column_walk.row()
+        row_skip_static.prop(
+            data=props,
+            property="skip_static_frames",
+            text="Skip Static Frames")
+        row_skip_static.active = (props.output_mode != "SHAPEKEYS" or props.extract_without_datablocks == True)
+        column_walk.active = (only_current_frame == False)
+
+        # deduplication
+        column_dedup = layout.column()
+        column_dedup.prop(
+            data=props,
+            property="deduplicate_static_frames",
+            text="Merge Static Frames")
+        row_dedup_tolerance = column_dedup.row()
+        row_dedup_tolerance.prop(
+            data=props,
+            property="dedup_tolerance",
+            text="Tolerance")
+        row_dedup_tolerance.active = (props.deduplicate_static_frames == True)
+        column_dedup.active = (is_shapekey_output and props.extract_without_datablocks == True and props.shapekey_compression == "NONE" and props.incremental_rebake == False)
+
+        # compression
+        column_compression = layout.column()
+        column_compression.prop(
+            data=props,
+            property="shapekey_compression",
+            text="Compression")
+        if props.shapekey_compression != "NONE":
+            column_compression.prop(
+                data=props,
+                property="compression_max_error",
+                text="Max. Error")
+        if props.shapekey_compression == "PCA":
+            column_compression.prop(
+                data=props,
+                property="pca_max_components",
+                text="Max. Shapekeys")
+        column_compression.active = (is_shapekey_output and props.extract_without_datablocks == True and props.incremental_rebake == False)
+
+        column_incremental = layout.column()
+        column_incremental.prop(
+            data=props,
+            property="incremental_rebake",
+            text="Only Update Changed Frames")
+        column_incremental.active = (is_shapekey_output and props.extract_without_datablocks == True and props.convert_selected_objects == False)
+
+        # region of interest
+        column_region = layout.column()
+        column_region.prop(
+            data=props,
+            property="region_of_interest",
+            text="Region")
+        if props.region_of_interest == "VERTEX_GROUP":
+            column_region.prop_search(
+                data=props,
+                property="roi_vertex_group",
+                search_data=obj,
+                search_property="vertex_groups",
+                text="Vertex Group")
+        elif props.region_of_interest == "MOTION":
+            column_region.prop(
+                data=props,
+                property="roi_motion_threshold",
+                text="Threshold")
+            column_region.prop(
+                data=props,
+                property="roi_sample_count",
+                text="Sample Frames")
+        column_region.active = (is_shapekey_output and props.extract_without_datablocks == True and props.convert_selected_objects == False)
+
+        # modifier stack split
+        column_split = layout.column()
+        column_split.prop_search(
+            data=props,
+            property="bake_up_to_modifier",
+            search_data=obj,
+            search_property="modifiers",
+            text="Bake Up To")
+        modifier_subdivision = get_trailing_subdivision_modifier(obj=obj)
+        if props.bake_up_to_modifier == "" and modifier_subdivision != None:
+            column_split.label(text="Tip: bake up to \"" + modifier_subdivision.name + "\" to keep the subdivision live")
+        column_split.active = (only_current_frame == False)
 
         # transforms
         column_apply_transforms = layout.column()
@@ -145,10 +948,43 @@ class OBJECT_PT_animate_with_shapekeys(bpy.types.Panel):
             property="apply_transforms",
             text="Apply Transforms")
 
+        # chunks
+        column_chunks = layout.column()
+        column_chunks.prop(
+            data=props,
+            property="bake_in_chunks",
+            text="Convert In Chunks")
+        row_chunk_budget = column_chunks.row()
+        row_chunk_budget.prop(
+            data=props,
+            property="chunk_budget_ms",
+            text="Chunk Budget (ms)")
+        row_chunk_budget.active = (props.bake_in_chunks == True)
+        column_chunks.active = (only_current_frame == False and (props.output_mode != "SHAPEKEYS" or props.extract_without_datablocks == True) and props.worker_count == 1)
+        frames_per_second = _last_frames_per_second.get(obj.name_full, 0)
+        if frames_per_second != 0:
+            layout.label(text="Last Conversion: " + str(round(frames_per_second, 2)) + " frames/s", translate=False, icon='INFO')
+
         layout.operator(
             operator=OBJECT_OT_animate_with_shapekeys.bl_idname,
             text="Convert!"
         )
+        layout.operator(
+            operator=OBJECT_OT_compare_baked_playback.bl_idname,
+            text="Compare Playback Of Selected"
+        )
+
+    def _estimate_memory(self, context, props):
+        """Same as OBJECT_OT_animate_with_shapekeys._estimate_memory(), for the settings as they are right now.
+        Only uses the stored vertex counts (see memory_estimate.py), None if one of them isn't known yet."""
+        vertex_counts = [memory_estimate.get_cached_vertex_count(obj=obj) for obj in get_objects_for_estimate(context=context, props=props)]
+        if None in vertex_counts:
+            return None
+        vertex_count = sum(vertex_counts)
+        return memory_estimate.estimate_peak_memory(vertex_count=vertex_count,
+                                                    frame_count=max(0, props.frame_end - props.frame_start + 1),
+                                                    output_mode=props.output_mode,
+                                                    shapekey_compression=props.shapekey_compression)
 
     @classmethod
     def poll(clss, context):
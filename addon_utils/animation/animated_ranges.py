@@ -0,0 +1,229 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+# Finds the frames at which an object can actually change, by looking at the animation (actions, NLA strips, drivers)
+# of the object and everything it depends on, without evaluating the scene.
+# Frames where nothing changes compared to the frame before don't need to be evaluated, they simply get the positions of that frame
+# (see iterate_frames_holding_static()).
+#
+# The analysis errs on the safe side: anything it can't look into (simulations, time based modifiers,
+# drivers that use the frame or other datablocks) makes every frame count as changing.
+
+import math
+import numpy as np
+
+from c0s_lewd_utilities.addon_utils.animation import bake_fingerprint
+from c0s_lewd_utilities.addon_utils.animation.parallel_bake import simulation_modifier_types
+
+
+# modifiers whose result can change over time without anything being keyframed
+time_dependent_modifier_types = simulation_modifier_types | {'WAVE',
+                                                             'BUILD',
+                                                             'EXPLODE',
+                                                             'MESH_CACHE',
+                                                             'MESH_SEQUENCE_CACHE',
+                                                             'OCEAN',
+                                                             'NODES'}
+
+
+def _get_dependency_ids(dependencies) -> list:
+    ids = []
+    for obj in dependencies:
+        ids.append(obj)
+        if obj.data != None:
+            ids.append(obj.data)
+            if getattr(obj.data, "shape_keys", None) != None:
+                ids.append(obj.data.shape_keys)
+    return ids
+
+
+def get_time_dependency(objs) -> str:
+    """Reason why the given objects (or what they depend on) can change at any frame, or None if only their animation decides that.
+
+    Parameters
+    ----------
+    objs : list of bpy.types.Object
+        Objects with the animation
+
+    Returns
+    -------
+    None or str
+        Human readable reason
+    """
+    dependencies = []
+    for obj in objs:
+        dependencies += [obj_dependency for obj_dependency in bake_fingerprint.get_dependency_objects(obj) if obj_dependency not in dependencies]
+    dependency_ids = _get_dependency_ids(dependencies)
+    for obj in dependencies:
+        for modifier in obj.modifiers:
+            if modifier.show_viewport == True and modifier.type in time_dependent_modifier_types:
+                return "\"" + obj.name + "\" has a " + modifier.type + " modifier"
+        for animation_data in bake_fingerprint.get_animation_datas(obj):
+            for fcurve in animation_data.drivers:
+                driver = fcurve.driver
+                if driver.type == 'SCRIPTED' and "frame" in driver.expression:
+                    return "a driver of \"" + obj.name + "\" uses the frame"
+                for variable in driver.variables:
+                    for target in variable.targets:
+                        # values of other datablocks could be animated in ways we don't look at
+                        if target.id != None and target.id not in dependency_ids:
+                            return "a driver of \"" + obj.name + "\" reads from \"" + target.id.name + "\""
+                    if variable.type not in {'SINGLE_PROP', 'TRANSFORMS', 'ROTATION_DIFF', 'LOC_DIFF'}:
+                        return "a driver of \"" + obj.name + "\" has a variable of an unknown type"
+    return None
+
+
+def _is_fcurve_constant(fcurve) -> bool:
+    if len(fcurve.modifiers) != 0:
+        return False
+    values = set()
+    for keyframe in fcurve.keyframe_points:
+        values.add(keyframe.co[1])
+        values.add(keyframe.handle_left[1])
+        values.add(keyframe.handle_right[1])
+    return len(values) <= 1
+
+
+def _mark_frames(is_changing, frames_all, first, last) -> None:
+    """Marks the frames from first to last (both included) as changing, as far as they're part of frames_all."""
+    first = max(0, first - int(frames_all[0]))
+    last = min(len(frames_all) - 1, last - int(frames_all[0]))
+    if first <= last:
+        is_changing[first:last + 1] = True
+
+
+def get_changing_frames(objs, frames) -> list:
+    """The frames at which anything that decides the shape of the objects is different from the frame before.
+
+    Parameters
+    ----------
+    objs : list of bpy.types.Object
+        Objects with the animation
+    frames : list of int
+        Frames to check, in increasing order
+
+    Returns
+    -------
+    list of int
+        The changing frames, in increasing order. All frames if get_time_dependency() finds a reason.
+    """
+    if len(frames) == 0 or get_time_dependency(objs) != None:
+        return list(frames)
+    dependencies = []
+    for obj in objs:
+        dependencies += [obj_dependency for obj_dependency in bake_fingerprint.get_dependency_objects(obj) if obj_dependency not in dependencies]
+
+    # every frame from the one before the first until the last one, so each frame can be compared with the one before it
+    frames_all = np.arange(frames[0] - 1, frames[-1] + 1)
+    is_changing = np.zeros(len(frames_all), dtype=np.bool_)
+    fcurves = []
+    for obj in dependencies:
+        for animation_data in bake_fingerprint.get_animation_datas(obj):
+            if animation_data.action != None:
+                fcurves += list(animation_data.action.fcurves)
+            for track in animation_data.nla_tracks:
+                if track.mute == True:
+                    continue
+                for strip in track.strips:
+                    # e.g. animated influence
+                    fcurves += list(strip.fcurves)
+                    if strip.mute == True or strip.action == None:
+                        continue
+                    if all(_is_fcurve_constant(fcurve) for fcurve in strip.action.fcurves) and strip.use_auto_blend == False:
+                        # a held pose still changes the shape where the strip starts and ends, and its influence changes while blending in and out
+                        _mark_frames(is_changing=is_changing, frames_all=frames_all,
+                                     first=math.floor(strip.frame_start), last=math.ceil(strip.frame_start + strip.blend_in))
+                        _mark_frames(is_changing=is_changing, frames_all=frames_all,
+                                     first=math.floor(strip.frame_end - strip.blend_out), last=math.ceil(strip.frame_end) + 1)
+                        continue
+                    # the time mapping of strips (scale, repeat, ...) and automatic blending aren't worth replicating, so the whole strip counts as changing
+                    _mark_frames(is_changing=is_changing, frames_all=frames_all, first=math.floor(strip.frame_start), last=math.ceil(strip.frame_end) + 1)
+
+    for fcurve in fcurves:
+        if fcurve.mute == True or _is_fcurve_constant(fcurve) == True:
+            continue
+        # fcurve.evaluate() only looks at the keyframes, no scene evaluation needed
+        values = np.array([fcurve.evaluate(frame) for frame in frames_all])
+        is_changing[1:] |= (values[1:] != values[:-1])
+
+    frames_changing = set(frames_all[is_changing].tolist())
+    return [frame for frame in frames if frame in frames_changing]
+
+
+def get_intervals(frames) -> list:
+    """Groups frames into intervals of consecutive frames, e.g. [1, 2, 3, 7, 8] becomes [(1, 3), (7, 8)]."""
+    intervals = []
+    for frame in frames:
+        if len(intervals) != 0 and intervals[-1][1] == frame - 1:
+            intervals[-1][1] = frame
+        else:
+            intervals.append([frame, frame])
+    return [tuple(interval) for interval in intervals]
+
+
+def get_frames_to_evaluate(frames, frames_changing) -> list:
+    """The frames that need to be evaluated: the changing ones, plus every frame whose previous frame isn't part of the frames (e.g. the first one).
+
+    Parameters
+    ----------
+    frames : list of int
+        All frames, in increasing order
+    frames_changing : list of int
+        See get_changing_frames()
+    """
+    frames_changing = set(frames_changing)
+    return [frame for index, frame in enumerate(frames) if index == 0 or frames[index - 1] != frame - 1 or frame in frames_changing]
+
+
+def iterate_frames_holding_static(frame_iterator, frames, frames_to_evaluate):
+    """Generator that yields (frame, positions) for all frames, but only the frames to evaluate come from the frame_iterator.
+    All other frames get the positions of the frame before them, without anything being evaluated.
+
+    Parameters
+    ----------
+    frame_iterator : iterable of (int, np.ndarray)
+        Yields exactly the frames to evaluate, for example iterate_evaluated_frames() (see frame_stream.py)
+    frames : list of int
+        All frames, in increasing order
+    frames_to_evaluate : list of int
+        See get_frames_to_evaluate()
+
+    Yields
+    ------
+    tuple (int, np.ndarray)
+        The frame and its positions. Copy them if you want to keep them.
+    """
+    frame_iterator = iter(frame_iterator)
+    frames_to_evaluate = set(frames_to_evaluate)
+    positions = None
+    try:
+        for frame in frames:
+            # only pulled when needed, the iterator may reuse its buffer for the next frame
+            if frame in frames_to_evaluate:
+                frame_evaluated, positions = next(frame_iterator)
+                if frame_evaluated != frame:
+                    raise Exception("Expected frame " + str(frame) + " from the frame iterator, got " + str(frame_evaluated))
+            elif positions is None:
+                raise Exception("The first frame (" + str(frame) + ") always needs to be evaluated")
+            yield (frame, positions)
+    finally:
+        if hasattr(frame_iterator, "close"):
+            frame_iterator.close()
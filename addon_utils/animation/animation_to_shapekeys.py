@@ -21,6 +21,17 @@
 import bpy
 from c0s_lewd_utilities.toolbox_1_0_0 import create_real_mesh, shapekeys, everything_key_frames
 from c0s_lewd_utilities.addon_utils.context_related.area_type_changer import AreaTypeChanger
+from c0s_lewd_utilities.addon_utils.animation.frame_walker import FrameWalker
+from c0s_lewd_utilities.addon_utils.animation.frame_stream import iterate_evaluated_frames, ChunkedFrameFeeder
+from c0s_lewd_utilities.addon_utils.animation.parallel_bake import iterate_frames_in_parallel
+from c0s_lewd_utilities.addon_utils.animation.bake_checkpoint import iterate_frames_with_checkpoint
+from c0s_lewd_utilities.addon_utils.animation.region_of_interest import iterate_region_frames
+from c0s_lewd_utilities.addon_utils.animation.animated_ranges import iterate_frames_holding_static
+from c0s_lewd_utilities.addon_utils.animation.physics_cache import iterate_cached_frames
+from c0s_lewd_utilities.addon_utils.animation.frame_sinks import ShapekeySink, VertexRangeSink
+from c0s_lewd_utilities.addon_utils.mesh.evaluated_geometry import EvaluatedPositionReader, MultiObjectPositionReader
+from c0s_lewd_utilities.addon_utils.mesh.combined_mesh import create_combined_obj
+from c0s_lewd_utilities.addon_utils.mesh import topology_fingerprint
 
 
 class AnimationToShapekeyConverter():
@@ -31,9 +42,12 @@ class AnimationToShapekeyConverter():
     __apply_transforms: bool
     __keep_vertex_groups: bool
     __keep_materials: bool
+    __extract_without_datablocks: bool
+    __position_reader: EvaluatedPositionReader
+    shapekey_sink: ShapekeySink
     main_context: bpy.types.Context
 
-    def __init__(self, main_context, obj_orig, apply_transforms=True, keep_vertex_groups=True, keep_materials=True):
+    def __init__(self, main_context, obj_orig, apply_transforms=True, keep_vertex_groups=True, keep_materials=True, extract_without_datablocks=True):
         """Converts the animation of an object to keyframed shapekeys (one shapekey for each frame).\\
         Almost anything that affects the geometry will be converted, this includes altered mesh topology from modifiers (such as subdivision surface mods),
         shapekeys, transforms (can be disabled), etc.
@@ -54,16 +68,20 @@ class AnimationToShapekeyConverter():
         keep_materials : bool
             Include the original materials and their values on the new object (not used if the new object is given by the user)\\
             Not properly tested.
+        extract_without_datablocks : bool
+            If True, the shape of each frame is read directly from the evaluated object into a reusable NumPy buffer.\\
+            If False, a full mesh copy (with create_real_mesh_copy()) gets created and deleted again for each frame instead, which is a lot slower.
         """
         self.main_context = main_context
         self.__obj_orig = obj_orig
         self.__apply_transforms = apply_transforms
         self.__keep_vertex_groups = keep_vertex_groups
         self.__keep_materials = keep_materials
+        self.__extract_without_datablocks = extract_without_datablocks
+        self.__position_reader = EvaluatedPositionReader(obj=obj_orig, apply_transforms=apply_transforms)
+        self.shapekey_sink = None
 
-    # TODO (future): enable using multiple objects to get one combined object
-
-    def set_obj_new(self, obj_new=None, frame="CURRENT") -> bpy.types.Object:
+    def set_obj_new(self, obj_new=None, frame="CURRENT", create_basis_shapekey=True) -> bpy.types.Object:
         """Sets the new object to use. If you want to add the shapekeys to an already existing object,
         you can specify that object instead and no new one will be created.
 
@@ -73,9 +91,12 @@ class AnimationToShapekeyConverter():
             If None, a new object will be created that gets the shapekeys.\\
             If object, no new object will be created and the shapekeys will be added to the specified object instead.
             The specified object must have the same topology as the original object looks like in the viewport
-            (i.e. same amount of vertices as if you had every modifier of the original object applied, not every modifier disabled)
+            (i.e. same vertex count, edges and faces as if you had every modifier of the original object applied, not every modifier disabled),
+            see is_given_obj_new_valid()
         frame : int or "CURRENT"
             Only used if obj_new=None. The new object will have the shape of the original object at that frame.
+        create_basis_shapekey : bool
+            Add a Basis shapekey if the object doesn't have one yet. Only outputs that don't use shapekeys (like vertex animation textures) should disable this.
 
         Returns
         -------
@@ -104,7 +125,7 @@ class AnimationToShapekeyConverter():
             self.__mesh_new = obj_new.data
 
         # create a base shapekey if not already present
-        if hasattr(self.__mesh_new.shape_keys, "reference_key") == False:
+        if create_basis_shapekey == True and hasattr(self.__mesh_new.shape_keys, "reference_key") == False:
             shapekey_base = self.__obj_new.shape_key_add(name="Basis")
 
         return self.__obj_new
@@ -112,30 +133,15 @@ class AnimationToShapekeyConverter():
     def is_given_obj_new_valid(self):
         """
         Checks if obj_new provided by set_obj_new() earlier is actually valid.
-        This just checks for the same amount of vertices if obj_orig had everything applied.
+        This compares the topology (vertex count, edges and faces, see topology_fingerprint.py) of obj_new with the one obj_orig has with everything applied.
 
         Returns
         -------
         bool
             Is valid or not?
         """
-        # create_real_mesh requires correct area type to be active
-        area_orig = AreaTypeChanger.change_area_to_good_type(context=self.main_context)
-        mesh_obj_orig_applied = create_real_mesh.create_real_mesh_copy(
-            context=self.main_context,
-            obj=self.__obj_orig,
-            frame="CURRENT",
-            apply_transforms=False,
-            keep_vertex_groups=False,
-            keep_materials=False
-        )
-        if len(mesh_obj_orig_applied.vertices) != len(self.__mesh_new.vertices):
-            is_valid = False
-        else:
-            is_valid = True
-        AreaTypeChanger.reset_area(area_orig)
-        bpy.data.meshes.remove(mesh=mesh_obj_orig_applied)
-        return is_valid
+        fingerprint_orig = topology_fingerprint.get_topology_fingerprint(depsgraph=self.main_context.evaluated_depsgraph_get(), obj=self.__obj_orig)
+        return fingerprint_orig == topology_fingerprint.hash_topology(self.__mesh_new)
 
     def _get_mesh_current_shape(self, frame) -> bpy.types.Mesh:
         """Gets the shape of the original object at a certain frame, but as if everything (such as modifiers) had been applied.
@@ -160,6 +166,29 @@ class AnimationToShapekeyConverter():
             keep_vertex_groups=False,  # we only care about the vertex locations of the mesh
             keep_materials=False)
 
+    def _get_positions_current_shape(self, frame):
+        """Gets the vertex positions of the original object at a certain frame, as if everything (such as modifiers) had been applied.
+
+        Faster alternative to _get_mesh_current_shape() that doesn't create any new datablocks.
+
+        Used by add_frame_as_shapekey()
+
+        Parameters
+        ----------
+        frame : int
+            The shape of the original object at that frame will be used.
+
+        Returns
+        -------
+        np.ndarray
+            float32 array with the shape (vertex_count, 3). Gets overwritten by the next call.
+        """
+        walker = FrameWalker(scene=self.main_context.scene)
+        walker.go_to_frame(frame=frame)
+        positions = self.__position_reader.read(depsgraph=self.main_context.evaluated_depsgraph_get())
+        walker.restore_original_frame()
+        return positions
+
     def _create_key_frames_for_single_frame(self, frame, fcurve) -> None:
         """Keyframes a shapekey to be active only at the specified frame and no other.
 
@@ -172,7 +201,7 @@ class AnimationToShapekeyConverter():
         fcurve : bpy.types.FCurve
             Created FCurve of the shapekey.
         """
-        everything_key_frames.create_key_frames_fast(fcurve=fcurve, values=[frame - 1, 0, frame, 1, frame + 1, 0])
+        everything_key_frames.create_key_frames_fast(fcurve=fcurve, values=ShapekeySink.get_single_frame_key_values(frame=frame))
 
     def add_frame_as_shapekey(self, frame="CURRENT", print_frame=False) -> bpy.types.ShapeKey:
         """Adds the shape of the original object at the specified frame to the new object.
@@ -196,21 +225,160 @@ class AnimationToShapekeyConverter():
             frame = self.main_context.scene.frame_current
         if print_frame == True:
             print("Current frame: ", frame)
-        mesh_current_shape = self._get_mesh_current_shape(frame=frame)
-        shapekey_new = shapekeys.create_shapekey(
-            obj=self.__obj_new,
-            reference=mesh_current_shape)
-        shapekey_new.name = "frame_" + str(frame)
-        datapath_to_sk = shapekey_new.path_from_id()
-        action = everything_key_frames.get_or_create_action(something=self.__mesh_new.shape_keys)
-        fcurve = action.fcurves.new(datapath_to_sk + ".value")
-        self._create_key_frames_for_single_frame(frame=frame, fcurve=fcurve)
-        bpy.data.meshes.remove(mesh_current_shape)
+        if self.__extract_without_datablocks == True:
+            positions = self._get_positions_current_shape(frame=frame)
+            sink = ShapekeySink(obj=self.__obj_new)
+            sink.start(frames=[frame], vertex_count=len(positions))
+            sink.add_frame(frame=frame, positions=positions)
+            sink.finish()
+            shapekey_new = sink.created_shapekeys[-1]
+        else:
+            mesh_current_shape = self._get_mesh_current_shape(frame=frame)
+            shapekey_new = shapekeys.create_shapekey(
+                obj=self.__obj_new,
+                reference=mesh_current_shape)
+            bpy.data.meshes.remove(mesh_current_shape)
+            shapekey_new.name = "frame_" + str(frame)
+            datapath_to_sk = shapekey_new.path_from_id()
+            action = everything_key_frames.get_or_create_action(something=self.__mesh_new.shape_keys)
+            fcurve = action.fcurves.new(datapath_to_sk + ".value")
+            self._create_key_frames_for_single_frame(frame=frame, fcurve=fcurve)
         AreaTypeChanger.reset_area(area_orig)
         return shapekey_new
 
-    def go_over_multiple_frames_at_once(self, frame_start, frame_end, print_frames=False):
-        """Calls add_frame_as_shapekey() in a loop over the specified frame range.
+    def stream_frames_to_sinks(self, frames, sinks, print_frames=False, walker=None, walk_sequentially=True, worker_count=1) -> int:
+        """Gives the shape of the original object at each of the frames to the sinks, without creating any shapekeys on its own.
+
+        Useful for outputs that don't need the new object at all, for example point cache files (see point_cache_sinks.py).
+        set_obj_new() doesn't need to be called for this.
+
+        Parameters
+        ----------
+        frames : list of int
+            Frames to go over, in increasing order.
+        sinks : list of FrameSink
+            Sinks (see frame_sinks.py) that get every frame.
+        print_frames : bool
+            Print the current frames to the console?
+        walker : None or FrameWalker
+            Walker to use, if None a new one is created.
+        walk_sequentially : bool
+            See go_over_multiple_frames_at_once()
+        worker_count : int
+            See create_frame_feeder()
+
+        Returns
+        -------
+        int
+            How many scene evaluations were saved by walking sequentially
+        """
+        area_orig = AreaTypeChanger.change_area_to_good_type(context=self.main_context)
+        if walker == None:
+            walker = FrameWalker(scene=self.main_context.scene)
+        self.create_frame_feeder(frames=frames, sinks=sinks, print_frames=print_frames, walker=walker, walk_sequentially=walk_sequentially, worker_count=worker_count).process_all()
+        AreaTypeChanger.reset_area(area_orig)
+        return walker.get_evaluations_saved()
+
+    def create_frame_feeder(self, frames, sinks, print_frames=False, walker=None, walk_sequentially=True, worker_count=1, checkpoint=None, view_layer=None, vertex_indices=None, frames_to_evaluate=None, use_physics_cache=False) -> ChunkedFrameFeeder:
+        """Same as stream_frames_to_sinks(), but nothing happens yet. Instead you get a ChunkedFrameFeeder (see frame_stream.py)
+        that you can use to process the frames in chunks, for example inside a modal operator.
+
+        Parameters
+        ----------
+        frames : list of int
+            Frames to go over, in increasing order.
+        sinks : list of FrameSink
+            Sinks (see frame_sinks.py) that get every frame.
+        print_frames : bool
+            Print the current frames to the console?
+        walker : None or FrameWalker
+            Walker to use, if None a new one is created. Give your own one if you want to know how many evaluations were saved afterwards.
+        walk_sequentially : bool
+            See go_over_multiple_frames_at_once()
+        worker_count : int
+            If bigger than 1, the frames are evaluated by that many background Blender processes instead (see parallel_bake.py).
+            The current file gets saved as a temporary copy for that. Only works if the frames don't depend on each other (no simulations).
+            The walker isn't used in that case.
+        checkpoint : None or BakeCheckpoint
+            If given, frames that are already in this on-disk cache (see bake_checkpoint.py) aren't evaluated again,
+            and newly evaluated frames get written into it. Its frames have to be the same as the given ones (or frames_to_evaluate, if given).
+        view_layer : None or bpy.types.ViewLayer
+            Evaluate the frames in the scene of this view layer instead of the one of the context, e.g. an IsolatedEvaluationScene (see isolated_scene.py).
+            A given walker has to walk that scene then.
+        vertex_indices : None or np.ndarray
+            If given, only these vertices (a region of interest, see region_of_interest.py) of each frame are kept after the evaluation,
+            before the checkpoint and the sinks get them. Sinks that need whole frames have to be wrapped in a RegionOfInterestSink.
+        frames_to_evaluate : None or list of int
+            If given, only these frames get evaluated, all other frames get the positions of the frame before them
+            (see animated_ranges.py). Has to contain at least the first frame.
+        use_physics_cache : bool
+            Read the frames from the baked cloth / softbody cache files instead of evaluating them (see physics_cache.py),
+            check physics_cache.get_direct_read_problem() before. The walker and worker_count aren't used then.
+
+        Returns
+        -------
+        ChunkedFrameFeeder
+            Feeder that hasn't processed any frames yet
+        """
+        if walker == None:
+            # id_data of a view layer is its scene
+            walker = FrameWalker(scene=view_layer.id_data if view_layer != None else self.main_context.scene)
+
+        def evaluate_frames(frames_to_evaluate):
+            if use_physics_cache == True:
+                frame_iterator = iterate_cached_frames(context=self.main_context, obj=self.__obj_orig, frames=frames_to_evaluate, apply_transforms=self.__apply_transforms)
+            elif worker_count > 1:
+                frame_iterator = iterate_frames_in_parallel(obj=self.__obj_orig, frames=frames_to_evaluate, worker_count=worker_count, apply_transforms=self.__apply_transforms)
+            else:
+                frame_iterator = iterate_evaluated_frames(
+                    context=self.main_context,
+                    obj=self.__obj_orig,
+                    frames=frames_to_evaluate,
+                    reader=self.__position_reader,
+                    walker=walker,
+                    rewind_every_frame=(walk_sequentially == False),
+                    view_layer=view_layer)
+            if vertex_indices is not None:
+                frame_iterator = iterate_region_frames(frame_iterator=frame_iterator, vertex_indices=vertex_indices)
+            return frame_iterator
+
+        if checkpoint != None:
+            frame_iterator = iterate_frames_with_checkpoint(checkpoint=checkpoint, evaluate_frames=evaluate_frames)
+        elif frames_to_evaluate != None:
+            frame_iterator = evaluate_frames(frames_to_evaluate)
+        else:
+            frame_iterator = evaluate_frames(frames)
+        if frames_to_evaluate != None:
+            frame_iterator = iterate_frames_holding_static(frame_iterator=frame_iterator, frames=frames, frames_to_evaluate=frames_to_evaluate)
+        return ChunkedFrameFeeder(frame_iterator=frame_iterator, sinks=sinks, frames=frames, print_frames=print_frames)
+
+    def create_shapekey_sinks(self, extra_sinks=(), dedup_tolerance=None, shapekey_sink=None) -> list:
+        """Creates the sinks that go_over_multiple_frames_at_once() uses when extracting without datablocks and sets self.shapekey_sink.
+
+        Use this together with create_frame_feeder() if you want to create the shapekeys in chunks.
+        set_obj_new() needs to be called before.
+
+        Parameters
+        ----------
+        extra_sinks : list of FrameSink
+            See go_over_multiple_frames_at_once()
+        dedup_tolerance : None or float
+            See go_over_multiple_frames_at_once()
+        shapekey_sink : None or ShapekeySink
+            See go_over_multiple_frames_at_once()
+
+        Returns
+        -------
+        list of FrameSink
+            The shapekey sink, followed by the extra sinks
+        """
+        if shapekey_sink == None:
+            shapekey_sink = ShapekeySink(obj=self.__obj_new, dedup_tolerance=dedup_tolerance)
+        self.shapekey_sink = shapekey_sink
+        return [self.shapekey_sink] + list(extra_sinks)
+
+    def go_over_multiple_frames_at_once(self, frame_start, frame_end, print_frames=False, walk_sequentially=True, extra_sinks=(), dedup_tolerance=None, shapekey_sink=None) -> int:
+        """Adds every frame of the specified frame range as a shapekey to the new object.
 
         Parameters
         ----------
@@ -220,12 +388,261 @@ class AnimationToShapekeyConverter():
             Last frame of the animation
         print_frames : bool
             Print the current frames to the console?
+        walk_sequentially : bool
+            If True, the scene only moves forward one frame at a time and gets reset to the original frame once at the end.\\
+            If False, the scene jumps back to the original frame after every single frame (old behaviour, twice the scene evaluations).
+        extra_sinks : list of FrameSink
+            Additional sinks (see frame_sinks.py) that get every frame as well, for example to write them into a file.\\
+            Only supported together with extract_without_datablocks.
+        dedup_tolerance : None or float
+            If a number, frames that look the same as the previous shapekey (within this distance) don't get their own shapekey,
+            the previous one stays active longer instead. See ShapekeySink.\\
+            Only supported together with extract_without_datablocks.
+        shapekey_sink : None or ShapekeySink
+            If None, a normal ShapekeySink for the new object gets created.\\
+            Otherwise the given one is used instead, for example a PcaShapekeySink (see shapekey_compression.py) to get fewer shapekeys.
+            dedup_tolerance is ignored in that case. Only supported together with extract_without_datablocks.
+
+        Returns
+        -------
+        int
+            How many scene evaluations were saved by walking sequentially (0 if walk_sequentially is False)
         """
         area_orig = AreaTypeChanger.change_area_to_good_type(context=self.main_context)
         if print_frames == True:
             print("\n\nStarting conversion of animation to shapekeys.")
-        for f in range(frame_start, frame_end + 1):
-            self.add_frame_as_shapekey(frame=f, print_frame=print_frames)
+        frames = list(range(frame_start, frame_end + 1))
+        walker = FrameWalker(scene=self.main_context.scene)
+        if self.__extract_without_datablocks == True:
+            sinks = self.create_shapekey_sinks(extra_sinks=extra_sinks, dedup_tolerance=dedup_tolerance, shapekey_sink=shapekey_sink)
+            self.stream_frames_to_sinks(frames=frames, sinks=sinks, print_frames=print_frames, walker=walker, walk_sequentially=walk_sequentially)
+        else:
+            if len(extra_sinks) != 0 or dedup_tolerance != None or shapekey_sink != None:
+                AreaTypeChanger.reset_area(area_orig)
+                raise Exception("Extra sinks, custom shapekey sinks and deduplication are only supported together with extract_without_datablocks.")
+            for f in frames:
+                if walk_sequentially == True:
+                    # add_frame_as_shapekey() won't change the frame if the scene is already at it
+                    walker.go_to_frame(frame=f)
+                self.add_frame_as_shapekey(frame=f, print_frame=print_frames)
+            walker.restore_original_frame()
+        evaluations_saved = walker.get_evaluations_saved()
         if print_frames == True:
-            print("Conversion finished.")
+            print("Conversion finished. Scene evaluations saved: " + str(evaluations_saved))
         AreaTypeChanger.reset_area(area_orig)
+        return evaluations_saved
+
+
+class MultiObjectAnimationConverter():
+    """Same as AnimationToShapekeyConverter, but for several objects at once.
+    Each object either gets its own new object, or all of them get combined into a single one (see set_combined_obj_new()).
+
+    The scene is only evaluated once per frame and the shapes of all objects are read from that single evaluation,
+    instead of walking over the whole frame range again for every object.
+    """
+
+    converters: list
+    main_context: bpy.types.Context
+    obj_combined: bpy.types.Object
+    __objs_orig: list
+    __apply_transforms: bool
+    __keep_vertex_groups: bool
+    __keep_materials: bool
+    __position_reader: MultiObjectPositionReader
+
+    def __init__(self, main_context, objs_orig, apply_transforms=True, keep_vertex_groups=True, keep_materials=True):
+        """Same as AnimationToShapekeyConverter, but for several objects at once.
+
+        Parameters
+        ----------
+        main_context : bpy.types.Context
+            Your current context
+        objs_orig : list of bpy.types.Object
+            Objects that have the animations to be converted
+        apply_transforms : bool
+            When converting the animation, convert the transforms as well
+        keep_vertex_groups : bool
+            Include the original vertex groups and their values on the new objects
+        keep_materials : bool
+            Include the original materials and their values on the new objects
+        """
+        self.main_context = main_context
+        self.obj_combined = None
+        self.__objs_orig = list(objs_orig)
+        self.__apply_transforms = apply_transforms
+        self.__keep_vertex_groups = keep_vertex_groups
+        self.__keep_materials = keep_materials
+        # frames are always extracted without datablocks, creating a mesh copy of every object for every frame would defeat the point
+        self.converters = [AnimationToShapekeyConverter(main_context=main_context,
+                                                        obj_orig=obj_orig,
+                                                        apply_transforms=apply_transforms,
+                                                        keep_vertex_groups=keep_vertex_groups,
+                                                        keep_materials=keep_materials,
+                                                        extract_without_datablocks=True) for obj_orig in self.__objs_orig]
+        self.__position_reader = MultiObjectPositionReader(objects=self.__objs_orig, apply_transforms=apply_transforms)
+
+    def set_objs_new(self, frame="CURRENT", create_basis_shapekey=True) -> list:
+        """Creates a new object for each original object, see AnimationToShapekeyConverter.set_obj_new().
+
+        Returns
+        -------
+        list of bpy.types.Object
+            The new objects, in the same order as the original ones
+        """
+        return [converter.set_obj_new(obj_new=None, frame=frame, create_basis_shapekey=create_basis_shapekey) for converter in self.converters]
+
+    def set_combined_obj_new(self, frame="CURRENT", create_basis_shapekey=True) -> bpy.types.Object:
+        """Creates one new object that contains all original objects joined together (see combined_mesh.py), instead of one new object each.
+
+        Its vertices are in the same order as the frames given to the extra sinks of create_frame_feeder(),
+        so a single ShapekeySink in extra_sinks can animate the whole thing with one set of shapekeys.
+
+        Parameters
+        ----------
+        frame : int or "CURRENT"
+            The new object will have the combined shape of the original objects at that frame.
+        create_basis_shapekey : bool
+            Add a Basis shapekey
+
+        Returns
+        -------
+        bpy.types.Object
+            The combined object, also stored as obj_combined
+        """
+        # create_real_mesh requires correct area type to be active
+        area_orig = AreaTypeChanger.change_area_to_good_type(context=self.main_context)
+        self.obj_combined = create_combined_obj(context=self.main_context,
+                                                objs=self.__objs_orig,
+                                                name=self.__objs_orig[0].name + " combined with keyframed shapekeys",
+                                                frame=frame,
+                                                apply_transforms=self.__apply_transforms,
+                                                keep_vertex_groups=self.__keep_vertex_groups,
+                                                keep_materials=self.__keep_materials)
+        AreaTypeChanger.reset_area(area_orig)
+        if create_basis_shapekey == True:
+            self.obj_combined.shape_key_add(name="Basis")
+        return self.obj_combined
+
+    def create_shapekey_sinks(self, dedup_tolerance=None, shapekey_sinks=None) -> list:
+        """Creates one shapekey sink per object, see AnimationToShapekeyConverter.create_shapekey_sinks(). set_objs_new() needs to be called before.
+
+        Parameters
+        ----------
+        dedup_tolerance : None or float
+            See AnimationToShapekeyConverter.go_over_multiple_frames_at_once()
+        shapekey_sinks : None or list of (None or ShapekeySink)
+            Custom shapekey sink for each object, None entries get a normal ShapekeySink.
+
+        Returns
+        -------
+        list of list of FrameSink
+            The sinks of each object, for create_frame_feeder()
+        """
+        if shapekey_sinks == None:
+            shapekey_sinks = [None] * len(self.converters)
+        return [converter.create_shapekey_sinks(dedup_tolerance=dedup_tolerance, shapekey_sink=shapekey_sink)
+                for converter, shapekey_sink in zip(self.converters, shapekey_sinks)]
+
+    def create_frame_feeder(self, frames, sinks_per_object, extra_sinks=(), print_frames=False, walker=None, walk_sequentially=True, checkpoint=None, view_layer=None, frames_to_evaluate=None) -> ChunkedFrameFeeder:
+        """Same as AnimationToShapekeyConverter.create_frame_feeder(), but every object has its own sinks.
+
+        Parameters
+        ----------
+        frames : list of int
+            Frames to go over, in increasing order.
+        sinks_per_object : list of list of FrameSink
+            The sinks of each object (same order as the objects), they only get the vertices of their object.
+        extra_sinks : list of FrameSink
+            Sinks that get the vertices of all objects together (in the same order as the objects), for example a StatisticsSink.
+        print_frames : bool
+            Print the current frames to the console?
+        walker : None or FrameWalker
+            Walker to use, if None a new one is created.
+        walk_sequentially : bool
+            See AnimationToShapekeyConverter.go_over_multiple_frames_at_once()
+        checkpoint : None or BakeCheckpoint
+            See AnimationToShapekeyConverter.create_frame_feeder(). Contains the vertices of all objects together.
+        view_layer : None or bpy.types.ViewLayer
+            See AnimationToShapekeyConverter.create_frame_feeder()
+        frames_to_evaluate : None or list of int
+            See AnimationToShapekeyConverter.create_frame_feeder()
+
+        Returns
+        -------
+        ChunkedFrameFeeder
+            Feeder that hasn't processed any frames yet
+        """
+        # the sinks need to know which vertices belong to which object, so the current frame is read once in advance
+        self.__position_reader.read(depsgraph=self.main_context.evaluated_depsgraph_get())
+        sinks = list(extra_sinks)
+        for (vertex_start, vertex_end), object_sinks in zip(self.__position_reader.vertex_ranges, sinks_per_object):
+            sinks += [VertexRangeSink(sink=sink, vertex_start=vertex_start, vertex_end=vertex_end) for sink in object_sinks]
+
+        if walker == None:
+            # id_data of a view layer is its scene
+            walker = FrameWalker(scene=view_layer.id_data if view_layer != None else self.main_context.scene)
+
+        def evaluate_frames(frames_to_evaluate):
+            return iterate_evaluated_frames(
+                context=self.main_context,
+                obj=None,
+                frames=frames_to_evaluate,
+                reader=self.__position_reader,
+                walker=walker,
+                rewind_every_frame=(walk_sequentially == False),
+                view_layer=view_layer)
+
+        if checkpoint != None:
+            frame_iterator = iterate_frames_with_checkpoint(checkpoint=checkpoint, evaluate_frames=evaluate_frames)
+        elif frames_to_evaluate != None:
+            frame_iterator = evaluate_frames(frames_to_evaluate)
+        else:
+            frame_iterator = evaluate_frames(frames)
+        if frames_to_evaluate != None:
+            frame_iterator = iterate_frames_holding_static(frame_iterator=frame_iterator, frames=frames, frames_to_evaluate=frames_to_evaluate)
+        return ChunkedFrameFeeder(frame_iterator=frame_iterator, sinks=sinks, frames=frames, print_frames=print_frames)
+
+    def go_over_multiple_frames_at_once(self, frame_start, frame_end, print_frames=False, walk_sequentially=True, extra_sinks=(), dedup_tolerance=None) -> int:
+        """Adds every frame of the specified frame range as a shapekey to each new object.
+        set_objs_new() or set_combined_obj_new() needs to be called before, in the latter case the combined object gets the shapekeys.
+
+        Parameters
+        ----------
+        frame_start : int
+            First frame of the animation
+        frame_end : int
+            Last frame of the animation
+        print_frames : bool
+            Print the current frames to the console?
+        walk_sequentially : bool
+            See AnimationToShapekeyConverter.go_over_multiple_frames_at_once()
+        extra_sinks : list of FrameSink
+            See create_frame_feeder()
+        dedup_tolerance : None or float
+            See AnimationToShapekeyConverter.go_over_multiple_frames_at_once()
+
+        Returns
+        -------
+        int
+            How many scene evaluations were saved, compared to converting every object on its own without walking sequentially
+        """
+        area_orig = AreaTypeChanger.change_area_to_good_type(context=self.main_context)
+        frames = list(range(frame_start, frame_end + 1))
+        walker = FrameWalker(scene=self.main_context.scene)
+        if self.obj_combined != None:
+            sinks_per_object = []
+            extra_sinks = [ShapekeySink(obj=self.obj_combined, dedup_tolerance=dedup_tolerance)] + list(extra_sinks)
+        else:
+            sinks_per_object = self.create_shapekey_sinks(dedup_tolerance=dedup_tolerance)
+        self.create_frame_feeder(frames=frames,
+                                 sinks_per_object=sinks_per_object,
+                                 extra_sinks=extra_sinks,
+                                 print_frames=print_frames,
+                                 walker=walker,
+                                 walk_sequentially=walk_sequentially).process_all()
+        AreaTypeChanger.reset_area(area_orig)
+        return self.get_evaluations_saved(walker=walker)
+
+    def get_evaluations_saved(self, walker) -> int:
+        """Scene evaluations saved by the given walker, plus the ones saved by not walking over the frames again for every further object."""
+        return walker.get_evaluations_saved() + (len(self.converters) - 1) * walker.evaluations_without_walker
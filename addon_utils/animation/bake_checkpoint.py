@@ -0,0 +1,214 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Keeps the evaluated frames of a conversion in an on-disk cache, so a conversion that crashed or got cancelled
+# can continue where it stopped instead of evaluating everything again.
+#
+# A cache folder contains:
+# - settings.json: the settings the cache belongs to, plus the amount of vertices
+# - positions.npy: all frames, shape (frame_count, vertex_count, 3)
+# - done.npy: one bool per frame, True if that row of positions.npy is filled
+
+import bpy
+import hashlib
+import json
+import numpy as np
+import os
+import shutil
+import tempfile
+import time
+
+
+def get_settings_hash(settings) -> str:
+    """Short hash of a dict with JSON-compatible values, the same settings always give the same hash."""
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def get_default_cache_dir() -> str:
+    """Folder next to the current .blend file ("<file name>_bake_cache"), or inside the temp folder if the file hasn't been saved yet."""
+    if bpy.data.filepath == "":
+        return os.path.join(tempfile.gettempdir(), "c0_bake_cache")
+    blend_dir, blend_name = os.path.split(bpy.data.filepath)
+    return os.path.join(blend_dir, bpy.path.clean_name(os.path.splitext(blend_name)[0]) + "_bake_cache")
+
+
+class BakeCheckpoint():
+    """On-disk cache for the evaluated frames of one conversion.
+
+    The cache belongs to a set of settings (object, frame range, ...). If a cache with the same settings already exists,
+    its finished frames can be reused, see iterate_frames_with_checkpoint().
+
+    Attention: The settings can't tell if the animation itself was changed in the meantime.
+    Simulations also won't be correct if only the remaining frames are evaluated, unless they're baked.
+    """
+
+    directory: str
+    frames: list
+    settings: dict
+    flush_interval: float
+    vertex_count: int
+    __positions: np.memmap
+    __done: np.memmap
+    __row_of_frame: dict
+    __last_flush: float
+
+    def __init__(self, frames, settings, cache_dir=None, flush_interval=5.0):
+        """On-disk cache for the evaluated frames of one conversion. Existing data for the same settings is loaded automatically.
+
+        Parameters
+        ----------
+        frames : list of int
+            All frames of the conversion, in increasing order
+        settings : dict
+            Everything that decides what the frames look like (object name, apply_transforms, ...), values must be JSON-compatible.
+            The frames get added automatically.
+        cache_dir : None or str
+            Folder for all caches, if None get_default_cache_dir() is used
+        flush_interval : float
+            New frames get written to the disk at least every this many seconds
+        """
+        self.frames = list(frames)
+        self.settings = dict(settings)
+        self.settings["frames"] = [self.frames[0], self.frames[-1], len(self.frames)] if len(self.frames) != 0 else []
+        if cache_dir == None:
+            cache_dir = get_default_cache_dir()
+        self.directory = os.path.join(cache_dir, get_settings_hash(self.settings))
+        self.flush_interval = flush_interval
+        self.vertex_count = None
+        self.__positions = None
+        self.__done = None
+        self.__row_of_frame = {frame: row for row, frame in enumerate(self.frames)}
+        self.__last_flush = time.perf_counter()
+        self.__load_existing()
+
+    def __get_path(self, file_name) -> str:
+        return os.path.join(self.directory, file_name)
+
+    def __load_existing(self) -> None:
+        try:
+            with open(self.__get_path("settings.json"), "r") as file:
+                stored = json.load(file)
+            if stored["settings"] != json.loads(json.dumps(self.settings)):
+                return
+            positions = np.load(self.__get_path("positions.npy"), mmap_mode="r+")
+            done = np.load(self.__get_path("done.npy"), mmap_mode="r+")
+        except (OSError, ValueError, KeyError):
+            # no (usable) cache yet
+            return
+        if positions.shape != (len(self.frames), stored["vertex_count"], 3) or done.shape != (len(self.frames),):
+            return
+        self.vertex_count = stored["vertex_count"]
+        self.__positions = positions
+        self.__done = done
+
+    def __create(self, vertex_count) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.vertex_count = vertex_count
+        self.__positions = np.lib.format.open_memmap(self.__get_path("positions.npy"), mode="w+", dtype=np.float32, shape=(len(self.frames), vertex_count, 3))
+        self.__done = np.lib.format.open_memmap(self.__get_path("done.npy"), mode="w+", dtype=np.bool_, shape=(len(self.frames),))
+        self.__done[:] = False
+        with open(self.__get_path("settings.json"), "w") as file:
+            json.dump({"settings": self.settings, "vertex_count": vertex_count}, file)
+
+    def get_done_frames(self) -> list:
+        """Frames that are already in the cache."""
+        if self.__done is None:
+            return []
+        return [frame for frame, is_done in zip(self.frames, self.__done) if is_done == True]
+
+    def get_missing_frames(self) -> list:
+        """Frames that still need to be evaluated."""
+        if self.__done is None:
+            return list(self.frames)
+        return [frame for frame, is_done in zip(self.frames, self.__done) if is_done == False]
+
+    def is_frame_done(self, frame) -> bool:
+        return self.__done is not None and bool(self.__done[self.__row_of_frame[frame]])
+
+    def read_frame(self, frame) -> np.ndarray:
+        """Positions of a frame that is done, shape (vertex_count, 3)."""
+        return self.__positions[self.__row_of_frame[frame]]
+
+    def write_frame(self, frame, positions) -> None:
+        """Stores the positions of a frame. The first written frame decides the amount of vertices, if there wasn't a cache yet."""
+        if self.__positions is None:
+            self.__create(vertex_count=len(positions))
+        elif len(positions) != self.vertex_count:
+            raise Exception("The amount of vertices doesn't match the cache (" + str(len(positions)) + " instead of " + str(self.vertex_count) + ")")
+        row = self.__row_of_frame[frame]
+        self.__positions[row] = positions
+        self.__done[row] = True
+        if time.perf_counter() - self.__last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes everything to the disk."""
+        if self.__positions is not None:
+            # positions first, so done.npy never claims frames that aren't written yet
+            self.__positions.flush()
+            self.__done.flush()
+        self.__last_flush = time.perf_counter()
+
+    def close(self) -> None:
+        """Writes everything to the disk and closes the files, the cache stays on the disk."""
+        self.flush()
+        self.__positions = None
+        self.__done = None
+
+    def delete(self) -> None:
+        """Deletes the cache from the disk, for example once the conversion is finished."""
+        self.__positions = None
+        self.__done = None
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def iterate_frames_with_checkpoint(checkpoint, evaluate_frames):
+    """Generator that yields (frame, positions) for all frames of the checkpoint, in order.
+    Frames that are already in the checkpoint are read from it, only the missing ones get evaluated (and written into it).
+
+    Parameters
+    ----------
+    checkpoint : BakeCheckpoint
+        The cache to use
+    evaluate_frames : callable
+        Gets the list of missing frames and returns an iterable of (frame, positions) for them, for example iterate_evaluated_frames().
+
+    Yields
+    ------
+    tuple (int, np.ndarray)
+        The frame and a float32 array with the shape (vertex_count, 3). Copy it if you want to keep it.
+    """
+    missing_frames = checkpoint.get_missing_frames()
+    evaluated_frames = None
+    try:
+        for frame in checkpoint.frames:
+            if checkpoint.is_frame_done(frame) == True:
+                yield (frame, checkpoint.read_frame(frame))
+                continue
+            if evaluated_frames == None:
+                # nothing is evaluated (and the scene frame isn't touched) before the first missing frame
+                evaluated_frames = iter(evaluate_frames(missing_frames))
+            frame_evaluated, positions = next(evaluated_frames)
+            checkpoint.write_frame(frame=frame_evaluated, positions=positions)
+            yield (frame_evaluated, positions)
+    finally:
+        if evaluated_frames != None and hasattr(evaluated_frames, "close"):
+            evaluated_frames.close()
+        checkpoint.flush()
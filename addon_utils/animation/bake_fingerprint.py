@@ -0,0 +1,337 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Per-frame fingerprints of everything that decides the shape of an object at a frame, without evaluating the scene.
+# If the fingerprints are stored on the converted object, a later conversion only needs to evaluate the frames whose fingerprint changed.
+#
+# A fingerprint consists of:
+# - the values of all fcurves (actions and NLA strips) of the object and the objects it depends on, at that frame
+# - the settings of their modifiers and constraints (also of pose bones), their transforms and poses as far as they aren't animated,
+#   and the rest positions of armature bones
+# - the mesh (topology and coordinates), vertex group weights and shapekey coordinates of the object itself
+# - the expressions and variables of their drivers, and which fcurves are muted
+# Driver values that come from outside of these objects, simulations and anything else outside of these objects aren't covered.
+
+import bpy
+import hashlib
+import json
+import numpy as np
+
+
+_property_name = "c0_bake_fingerprints"
+
+# transform properties of objects and pose bones. Animated ones are covered by the per-frame fcurve values instead,
+# their current value depends on the frame the scene happens to be at.
+_transform_attributes = ("location", "rotation_mode", "rotation_euler", "rotation_quaternion", "rotation_axis_angle", "scale")
+_object_transform_attributes = _transform_attributes + ("delta_location", "delta_rotation_euler", "delta_rotation_quaternion", "delta_scale")
+
+
+def _get_pointer_references(struct) -> list:
+    """Objects and collections that the RNA pointer properties of a struct (e.g. a modifier) point to."""
+    references = []
+    for prop in struct.bl_rna.properties:
+        if prop.type == 'POINTER' and prop.fixed_type in (bpy.types.Object.bl_rna, bpy.types.Collection.bl_rna):
+            value = getattr(struct, prop.identifier)
+            if value != None:
+                references.append(value)
+    return references
+
+
+def _get_node_group_references(node_group, node_groups_done) -> list:
+    """Objects and collections used by the nodes of a node group (e.g. Object Info, Collection Info), also in nested groups."""
+    references = []
+    if node_group in node_groups_done:
+        return references
+    node_groups_done.append(node_group)
+    for node in node_group.nodes:
+        references += _get_pointer_references(node)
+        for socket in node.inputs:
+            # linked sockets get their value from another node, whose own inputs are checked as well
+            if socket.type in {'OBJECT', 'COLLECTION'} and socket.is_linked == False and socket.default_value != None:
+                references.append(socket.default_value)
+        if getattr(node, "node_tree", None) != None:
+            references += _get_node_group_references(node_group=node.node_tree, node_groups_done=node_groups_done)
+    return references
+
+
+def _get_modifier_input_references(modifier) -> list:
+    """Objects and collections a Geometry Nodes modifier uses, which aren't RNA pointers of the modifier."""
+    references = []
+    if modifier.type != 'NODES':
+        return references
+    # the inputs of the modifier are stored as ID properties
+    for key in modifier.keys():
+        value = modifier[key]
+        if isinstance(value, (bpy.types.Object, bpy.types.Collection)):
+            references.append(value)
+    if modifier.node_group != None:
+        references += _get_node_group_references(node_group=modifier.node_group, node_groups_done=[])
+    return references
+
+
+def get_dependency_objects(obj) -> list:
+    """The object itself, plus every object it depends on through parents, modifiers (also their collections and Geometry Nodes inputs),
+    constraints (also of pose bones) and drivers (recursively). Collections count as all objects in them."""
+    dependencies = []
+    objs_to_check = [obj]
+    while len(objs_to_check) != 0:
+        obj_current = objs_to_check.pop()
+        if obj_current in dependencies:
+            continue
+        dependencies.append(obj_current)
+        if obj_current.parent != None:
+            objs_to_check.append(obj_current.parent)
+        structs = list(obj_current.modifiers) + list(obj_current.constraints)
+        if obj_current.pose != None:
+            # e.g. IK targets
+            for pose_bone in obj_current.pose.bones:
+                structs += list(pose_bone.constraints)
+        references = []
+        for modifier in obj_current.modifiers:
+            references += _get_modifier_input_references(modifier)
+        for struct in structs:
+            references += _get_pointer_references(struct)
+            # e.g. the Armature constraint has a list of targets
+            for target in getattr(struct, "targets", []):
+                if getattr(target, "target", None) != None:
+                    objs_to_check.append(target.target)
+        for reference in references:
+            if isinstance(reference, bpy.types.Collection):
+                # e.g. a Boolean modifier in collection mode
+                objs_to_check += list(reference.all_objects)
+            else:
+                objs_to_check.append(reference)
+        for animation_data in get_animation_datas(obj_current):
+            for fcurve in animation_data.drivers:
+                for variable in fcurve.driver.variables:
+                    for target in variable.targets:
+                        if isinstance(target.id, bpy.types.Object):
+                            objs_to_check.append(target.id)
+    return dependencies
+
+
+def _get_rna_values(struct) -> list:
+    """All simple property values of a struct (e.g. a modifier), for hashing."""
+    values = []
+    for prop in struct.bl_rna.properties:
+        if prop.identifier == "rna_type" or prop.type == 'COLLECTION':
+            continue
+        try:
+            value = getattr(struct, prop.identifier)
+        except AttributeError:
+            continue
+        if prop.type == 'POINTER':
+            # only references to datablocks matter, nested structs would need their own handling
+            value = value.name if isinstance(value, bpy.types.ID) else None
+        elif getattr(prop, "is_array", False) == True:
+            value = tuple(value)
+        values.append((prop.identifier, repr(value)))
+    return values
+
+
+def _hash_mesh(hasher, mesh) -> None:
+    hasher.update(repr((len(mesh.vertices), len(mesh.edges), len(mesh.polygons))).encode("utf-8"))
+    for collection, attribute, dtype, width in ((mesh.vertices, "co", np.float32, 3),
+                                                (mesh.edges, "vertices", np.int32, 2),
+                                                (mesh.polygons, "loop_total", np.int32, 1),
+                                                (mesh.loops, "vertex_index", np.int32, 1)):
+        values = np.empty(len(collection) * width, dtype=dtype)
+        collection.foreach_get(attribute, values)
+        hasher.update(values.tobytes())
+
+
+def _hash_vertex_group_weights(hasher, obj) -> None:
+    hasher.update(repr([vertex_group.name for vertex_group in obj.vertex_groups]).encode("utf-8"))
+    if len(obj.vertex_groups) == 0:
+        return
+    # there's no foreach_get() for the weights
+    weights = [(vertex.index, group.group, group.weight) for vertex in obj.data.vertices for group in vertex.groups]
+    hasher.update(repr(weights).encode("utf-8"))
+
+
+def _hash_shapekey_coordinates(hasher, mesh) -> None:
+    for key_block in mesh.shape_keys.key_blocks:
+        values = np.empty(len(key_block.data) * 3, dtype=np.float32)
+        key_block.data.foreach_get("co", values)
+        hasher.update(values.tobytes())
+
+
+def _get_animated_data_paths(obj) -> set:
+    """Data paths (e.g. 'location' or 'pose.bones["Bone"].rotation_quaternion') of the object that have an fcurve or a driver."""
+    data_paths = set()
+    if obj.animation_data == None:
+        return data_paths
+    actions = [obj.animation_data.action] + [strip.action for track in obj.animation_data.nla_tracks for strip in track.strips]
+    fcurves = [fcurve for action in actions if action != None for fcurve in action.fcurves] + list(obj.animation_data.drivers)
+    for fcurve in fcurves:
+        data_paths.add(fcurve.data_path)
+    return data_paths
+
+
+def _get_static_transform_values(struct, attributes, data_path_prefix, animated_data_paths) -> list:
+    values = []
+    for attribute in attributes:
+        if data_path_prefix + attribute in animated_data_paths:
+            continue
+        value = getattr(struct, attribute)
+        values.append((attribute, value if isinstance(value, str) else tuple(value)))
+    return values
+
+
+def _hash_transforms(hasher, obj) -> None:
+    """Hashes the transforms of the object and the pose of its bones, except the animated ones, plus the rest positions of armature bones."""
+    animated_data_paths = _get_animated_data_paths(obj)
+    values = _get_static_transform_values(struct=obj, attributes=_object_transform_attributes, data_path_prefix="", animated_data_paths=animated_data_paths)
+    values.append(tuple(value for row in obj.matrix_parent_inverse for value in row))
+    values.append((obj.parent_type, obj.parent_bone))
+    hasher.update(repr(values).encode("utf-8"))
+    if obj.pose != None:
+        for pose_bone in obj.pose.bones:
+            data_path_prefix = pose_bone.path_from_id() + "."
+            values = _get_static_transform_values(struct=pose_bone, attributes=_transform_attributes, data_path_prefix=data_path_prefix, animated_data_paths=animated_data_paths)
+            hasher.update(repr((pose_bone.name, values)).encode("utf-8"))
+            for constraint in pose_bone.constraints:
+                hasher.update(repr(_get_rna_values(constraint)).encode("utf-8"))
+    if obj.type == 'ARMATURE':
+        for bone in obj.data.bones:
+            rest = tuple(value for row in bone.matrix_local for value in row)
+            hasher.update(repr((bone.name, bone.parent.name if bone.parent != None else None, bone.length, bone.use_deform, rest)).encode("utf-8"))
+
+
+def _get_driver_values(fcurve) -> tuple:
+    """Everything that decides what a driver does, for hashing. Its result at a frame isn't known without evaluating the scene."""
+    driver = fcurve.driver
+    variables = []
+    for variable in driver.variables:
+        targets = [(target.id.name if target.id != None else None, target.data_path, target.bone_target, target.transform_type, target.transform_space, target.rotation_mode)
+                   for target in variable.targets]
+        variables.append((variable.name, variable.type, targets))
+    return (fcurve.data_path, fcurve.array_index, fcurve.mute, driver.type, driver.expression, driver.use_self, variables)
+
+
+def get_animation_datas(obj) -> list:
+    """The animation data of the object, its data (e.g. the armature) and its shapekeys, if they have one."""
+    animation_datas = [obj.animation_data]
+    if obj.data != None:
+        animation_datas.append(getattr(obj.data, "animation_data", None))
+        shape_keys = getattr(obj.data, "shape_keys", None)
+        if shape_keys != None:
+            animation_datas.append(shape_keys.animation_data)
+    return [animation_data for animation_data in animation_datas if animation_data != None]
+
+
+def get_static_fingerprint(obj, settings=None) -> str:
+    """Hash of everything about the object and its dependencies that doesn't change from frame to frame.
+
+    Parameters
+    ----------
+    obj : bpy.types.Object
+        The original object with the animation
+    settings : None or dict
+        Conversion settings that change the result (e.g. apply_transforms), values must be JSON-compatible.
+    """
+    hasher = hashlib.sha1()
+    hasher.update(json.dumps(settings if settings != None else {}, sort_keys=True).encode("utf-8"))
+    if obj.type == 'MESH':
+        _hash_mesh(hasher=hasher, mesh=obj.data)
+        _hash_vertex_group_weights(hasher=hasher, obj=obj)
+        if obj.data.shape_keys != None:
+            for key_block in obj.data.shape_keys.key_blocks:
+                hasher.update(repr(_get_rna_values(key_block)).encode("utf-8"))
+            _hash_shapekey_coordinates(hasher=hasher, mesh=obj.data)
+    for obj_dependency in get_dependency_objects(obj):
+        hasher.update(obj_dependency.name.encode("utf-8"))
+        _hash_transforms(hasher=hasher, obj=obj_dependency)
+        for struct in list(obj_dependency.modifiers) + list(obj_dependency.constraints):
+            hasher.update(repr(_get_rna_values(struct)).encode("utf-8"))
+        for animation_data in get_animation_datas(obj_dependency):
+            for track in animation_data.nla_tracks:
+                hasher.update(repr(_get_rna_values(track)).encode("utf-8"))
+                for strip in track.strips:
+                    hasher.update(repr(_get_rna_values(strip)).encode("utf-8"))
+            for fcurve in animation_data.drivers:
+                hasher.update(repr(_get_driver_values(fcurve)).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def get_animated_fcurves(obj) -> list:
+    """All fcurves (of actions and NLA strips) of the object and the objects it depends on."""
+    actions = []
+    for obj_dependency in get_dependency_objects(obj):
+        for animation_data in get_animation_datas(obj_dependency):
+            actions_used = [animation_data.action]
+            for track in animation_data.nla_tracks:
+                actions_used += [strip.action for strip in track.strips]
+            for action in actions_used:
+                # the same action can be used several times
+                if action != None and action not in actions:
+                    actions.append(action)
+    return [fcurve for action in actions for fcurve in action.fcurves]
+
+
+def get_frame_fingerprints(obj, frames, settings=None) -> dict:
+    """Fingerprint of each frame, see the top of this file. Frames with the same fingerprint as in an earlier conversion don't need to be evaluated again.
+
+    Parameters
+    ----------
+    obj : bpy.types.Object
+        The original object with the animation
+    frames : list of int
+        Frames to get the fingerprints for
+    settings : None or dict
+        See get_static_fingerprint()
+
+    Returns
+    -------
+    dict
+        {frame: fingerprint string}
+    """
+    fcurves = get_animated_fcurves(obj)
+    # a muted fcurve still returns its values in evaluate(), but doesn't change anything
+    fcurve_states = repr([(fcurve.data_path, fcurve.array_index, fcurve.mute) for fcurve in fcurves]).encode("utf-8")
+    static_fingerprint = get_static_fingerprint(obj=obj, settings=settings).encode("utf-8") + fcurve_states
+    # fcurve.evaluate() only looks at the keyframes, no scene evaluation needed
+    values = np.empty((len(frames), len(fcurves)), dtype=np.float64)
+    for column, fcurve in enumerate(fcurves):
+        values[:, column] = [fcurve.evaluate(frame) for frame in frames]
+    fingerprints = dict()
+    for row, frame in enumerate(frames):
+        fingerprints[frame] = hashlib.sha1(static_fingerprint + values[row].tobytes()).hexdigest()[:16]
+    return fingerprints
+
+
+def get_stored_fingerprints(obj) -> dict:
+    """Fingerprints stored on a converted object by store_fingerprints(), {frame: fingerprint}. Empty if there are none."""
+    if _property_name not in obj.keys():
+        return dict()
+    return {int(frame): fingerprint for frame, fingerprint in json.loads(obj[_property_name]).items()}
+
+
+def store_fingerprints(obj, fingerprints) -> None:
+    """Stores fingerprints on a converted object (as a custom property), merged with the ones that are already stored."""
+    stored = get_stored_fingerprints(obj)
+    stored.update(fingerprints)
+    # a single JSON string, ID properties can't hold large lists of strings well
+    obj[_property_name] = json.dumps({str(frame): fingerprint for frame, fingerprint in sorted(stored.items())})
+
+
+def get_changed_frames(fingerprints, stored_fingerprints) -> list:
+    """Frames whose fingerprint differs from the stored one (or that don't have a stored one), in increasing order."""
+    return sorted(frame for frame, fingerprint in fingerprints.items() if stored_fingerprints.get(frame) != fingerprint)
@@ -0,0 +1,469 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Sinks receive the evaluated positions of an object frame by frame (see frame_stream.py) and decide what to do with them,
+# for example turning them into shapekeys or writing them into a file.
+
+import bpy
+import os
+import time
+import numpy as np
+
+from c0s_lewd_utilities.toolbox_1_0_0 import shapekeys, everything_key_frames
+from c0s_lewd_utilities.addon_utils.animation.keyframe_helper import create_fcurves_with_key_frames_bulk
+
+
+class FrameSink():
+    """Base class for all sinks.
+
+    The order of calls is always: start() once, add_frame() for every frame, finish() once.
+    If the conversion fails with an exception, close() is called instead of finish() (possibly without start() or after a failed finish()).
+
+    Sinks whose add_frame() doesn't touch any Blender data (only NumPy and files) set is_thread_safe to True.
+    Their add_frame() may then run on a background thread, see pipelined_sinks.py. start() and finish() always run on the main thread.
+    """
+
+    is_thread_safe = False
+
+    def start(self, frames, vertex_count) -> None:
+        """Called once before the first frame.
+
+        Parameters
+        ----------
+        frames : list of int
+            All frames that are going to be added.
+        vertex_count : int
+            Amount of vertices every frame has.
+        """
+        pass
+
+    def add_frame(self, frame, positions) -> None:
+        """Called for every frame.
+
+        Parameters
+        ----------
+        frame : int
+            The current frame
+        positions : np.ndarray
+            float32 array with the shape (vertex_count, 3). Copy it if you want to keep it, it will be overwritten by the next frame.
+        """
+        raise NotImplementedError()
+
+    def finish(self) -> None:
+        """Called once after the last frame."""
+        pass
+
+    def close(self) -> None:
+        """Called instead of finish() after an error. Only releases what start() opened (files, threads, ...), no result is created.
+        Must work at any point, also more than once."""
+        pass
+
+
+class ShapekeySink(FrameSink):
+    """Adds every frame as a new shapekey to an object and keyframes it to be active only at that frame.
+
+    The keyframes aren't created right away. Instead they're collected and all fcurves get created in one go in finish(),
+    because creating them frame by frame gets slower the bigger the action becomes.
+
+    Optionally, frames that look the same as the previous shapekey don't get their own shapekey,
+    the previous shapekey simply stays active for longer instead.
+    """
+
+    obj: bpy.types.Object
+    name_prefix: str
+    interpolation: str
+    dedup_tolerance: float
+    created_shapekeys: list
+    frames_deduplicated: int
+    _key_spans: list
+    __last_positions: np.ndarray
+
+    def __init__(self, obj, name_prefix="frame_", interpolation="LINEAR", dedup_tolerance=None):
+        """Adds every frame as a new shapekey to an object and keyframes it to be active only at that frame.
+
+        Parameters
+        ----------
+        obj : bpy.types.Object
+            Object that gets the shapekeys. Needs to have a Basis shapekey already and the same amount of vertices as the frames.
+        name_prefix : str
+            Shapekeys get named name_prefix + frame.
+        interpolation : str
+            Interpolation of the created keyframes, see keyframe_helper.interpolation_values
+        dedup_tolerance : None or float
+            If None, every frame gets its own shapekey.\\
+            If a number, a frame where no vertex is further away than this distance from the last created shapekey
+            doesn't get a new shapekey, instead the last one is keyframed to stay active for that frame as well.
+        """
+        self.obj = obj
+        self.name_prefix = name_prefix
+        self.interpolation = interpolation
+        self.dedup_tolerance = dedup_tolerance
+        self.created_shapekeys = []
+        self.frames_deduplicated = 0
+        # [shapekey, first frame, last frame] for each created shapekey
+        self._key_spans = []
+        self.__last_positions = None
+
+    @classmethod
+    def get_single_frame_key_values(clss, frame) -> list:
+        """Keyframe values for a shapekey that's supposed to be active only at the specified frame and no other.
+
+        Parameters
+        ----------
+        frame : int
+            Single frame at which the shapekey is supposed to be active
+
+        Returns
+        -------
+        list
+            [frame1, value1, frame2, value2, ...], as used by everything_key_frames.create_key_frames_fast()
+        """
+        return clss.get_crossfade_key_values(frame=frame, frame_before=frame - 1, frame_after=frame + 1)
+
+    @classmethod
+    def get_crossfade_key_values(clss, frame, frame_before, frame_after) -> list:
+        """Keyframe values for a shapekey that's fully active at the specified frame and fades in from frame_before and out until frame_after.
+
+        With linear interpolation, neighbouring shapekeys keyframed like this blend exactly into each other.
+
+        Parameters
+        ----------
+        frame : int
+            Frame at which the shapekey is fully active
+        frame_before : int
+            Last frame before that where the shapekey is inactive
+        frame_after : int
+            First frame after that where the shapekey is inactive again
+
+        Returns
+        -------
+        list
+            [frame1, value1, frame2, value2, ...], as used by everything_key_frames.create_key_frames_fast()
+        """
+        return [frame_before, 0, frame, 1, frame_after, 0]
+
+    @classmethod
+    def get_frame_span_key_values(clss, frame_first, frame_last) -> list:
+        """Keyframe values for a shapekey that's supposed to be active from frame_first to frame_last (both included) and at no other frame.
+
+        Parameters
+        ----------
+        frame_first : int
+            First frame at which the shapekey is supposed to be active
+        frame_last : int
+            Last frame at which the shapekey is supposed to be active
+
+        Returns
+        -------
+        list
+            [frame1, value1, frame2, value2, ...], as used by everything_key_frames.create_key_frames_fast()
+        """
+        if frame_first == frame_last:
+            return clss.get_single_frame_key_values(frame=frame_first)
+        return [frame_first - 1, 0, frame_first, 1, frame_last, 1, frame_last + 1, 0]
+
+    def _add_shapekey(self, frame, positions) -> bpy.types.ShapeKey:
+        # an empty dictionary means the new shapekey keeps the basis coordinates, we overwrite them directly from the buffer
+        shapekey_new = shapekeys.create_shapekey(obj=self.obj, reference={})
+        shapekey_new.data.foreach_set("co", positions.ravel())
+        shapekey_new.name = self.name_prefix + str(frame)
+        self.created_shapekeys.append(shapekey_new)
+        return shapekey_new
+
+    def _is_same_as_last_shapekey(self, frame, positions) -> bool:
+        if self.dedup_tolerance == None or self.__last_positions is None:
+            return False
+        if self._key_spans[-1][2] != frame - 1:
+            # only extend shapekeys over consecutive frames
+            return False
+        # all vertices at once instead of coordinates_stuff.is_vector_close() for each one
+        squared_distances = np.square(positions - self.__last_positions).sum(axis=1)
+        return bool(squared_distances.max() <= self.dedup_tolerance ** 2)
+
+    def add_frame(self, frame, positions):
+        if self._is_same_as_last_shapekey(frame=frame, positions=positions) == True:
+            self._key_spans[-1][2] = frame
+            self.frames_deduplicated += 1
+            return
+        shapekey_new = self._add_shapekey(frame=frame, positions=positions)
+        self._key_spans.append([shapekey_new, frame, frame])
+        if self.dedup_tolerance != None:
+            if self.__last_positions is None:
+                self.__last_positions = positions.copy()
+            else:
+                self.__last_positions[:] = positions
+
+    def _get_key_frames_per_data_path(self) -> dict:
+        key_frames_per_data_path = dict()
+        for shapekey, frame_first, frame_last in self._key_spans:
+            key_frames_per_data_path[shapekey.path_from_id() + ".value"] = self.get_frame_span_key_values(frame_first=frame_first, frame_last=frame_last)
+        return key_frames_per_data_path
+
+    def finish(self):
+        if len(self.created_shapekeys) == 0:
+            return
+        action = everything_key_frames.get_or_create_action(something=self.obj.data.shape_keys)
+        create_fcurves_with_key_frames_bulk(
+            action=action,
+            key_frames_per_data_path=self._get_key_frames_per_data_path(),
+            interpolation=self.interpolation)
+
+
+class IncrementalShapekeySink(ShapekeySink):
+    """Same as ShapekeySink, but if the object already has the shapekey of a frame (from an earlier conversion), only its coordinates get replaced
+    and its keyframes stay as they are. Frames that don't have a shapekey yet get a new one, like with ShapekeySink.
+
+    Meant for updating only some frames of an earlier conversion, see bake_fingerprint.py.
+    """
+
+    updated_shapekeys: list
+
+    def __init__(self, obj, name_prefix="frame_", interpolation="LINEAR"):
+        """Same as ShapekeySink, but already existing shapekeys of a frame get overwritten instead of added again.
+
+        Parameters
+        ----------
+        obj : bpy.types.Object
+            Object that gets the shapekeys. Needs to have a Basis shapekey already and the same amount of vertices as the frames.
+        name_prefix : str
+            Shapekeys are named name_prefix + frame, this is also how the existing ones are found.
+        interpolation : str
+            Interpolation of the keyframes of new shapekeys, see keyframe_helper.interpolation_values
+        """
+        super().__init__(obj=obj, name_prefix=name_prefix, interpolation=interpolation, dedup_tolerance=None)
+        self.updated_shapekeys = []
+
+    def add_frame(self, frame, positions):
+        shapekey = self.obj.data.shape_keys.key_blocks.get(self.name_prefix + str(frame))
+        if shapekey == None:
+            super().add_frame(frame=frame, positions=positions)
+            return
+        shapekey.data.foreach_set("co", positions.ravel())
+        self.updated_shapekeys.append(shapekey)
+
+
+class VertexRangeSink(FrameSink):
+    """Only gives a range of the vertices to another sink, for example the part of one object if the frames contain several objects
+    (see MultiObjectPositionReader)."""
+
+    sink: FrameSink
+    vertex_start: int
+    vertex_end: int
+
+    def __init__(self, sink, vertex_start, vertex_end):
+        """Only gives a range of the vertices to another sink.
+
+        Parameters
+        ----------
+        sink : FrameSink
+            Sink that gets the vertices from vertex_start to vertex_end (exclusive)
+        vertex_start : int
+            First vertex of the range
+        vertex_end : int
+            End of the range (exclusive)
+        """
+        self.sink = sink
+        self.vertex_start = vertex_start
+        self.vertex_end = vertex_end
+
+    def start(self, frames, vertex_count):
+        self.sink.start(frames=frames, vertex_count=self.vertex_end - self.vertex_start)
+
+    def add_frame(self, frame, positions):
+        # a view, no copy
+        self.sink.add_frame(frame=frame, positions=positions[self.vertex_start:self.vertex_end])
+
+    def finish(self):
+        self.sink.finish()
+
+    def close(self):
+        self.sink.close()
+
+
+class RegionOfInterestSink(FrameSink):
+    """Gets only the vertices of a region (see region_of_interest.py) and gives another sink whole frames,
+    with all vertices outside of the region at their basis positions."""
+
+    sink: FrameSink
+    vertex_indices: np.ndarray
+    __buffer: np.ndarray
+
+    def __init__(self, sink, vertex_indices, basis_positions):
+        """Gets only the vertices of a region and gives another sink whole frames.
+
+        Parameters
+        ----------
+        sink : FrameSink
+            Sink that gets the whole frames
+        vertex_indices : np.ndarray
+            Sorted int array with the vertices of the region, in the same order as the positions this sink gets
+        basis_positions : np.ndarray
+            float32 array with the shape (vertex_count, 3), used for all vertices outside of the region
+        """
+        self.sink = sink
+        self.vertex_indices = vertex_indices
+        self.__buffer = np.array(basis_positions, dtype=np.float32)
+
+    def start(self, frames, vertex_count):
+        if vertex_count != len(self.vertex_indices):
+            raise Exception("Got frames with " + str(vertex_count) + " vertices, but the region has " + str(len(self.vertex_indices)))
+        self.sink.start(frames=frames, vertex_count=len(self.__buffer))
+
+    def add_frame(self, frame, positions):
+        # vertices outside of the region are never touched, so they keep the basis positions
+        self.__buffer[self.vertex_indices] = positions
+        self.sink.add_frame(frame=frame, positions=self.__buffer)
+
+    def finish(self):
+        self.sink.finish()
+
+    def close(self):
+        self.sink.close()
+
+
+class AttributeSink(FrameSink):
+    """Stores every frame as a vector point attribute on a mesh."""
+
+    mesh: bpy.types.Mesh
+    name_prefix: str
+
+    def __init__(self, mesh, name_prefix="frame_"):
+        """Stores every frame as a vector point attribute on a mesh.
+
+        Parameters
+        ----------
+        mesh : bpy.types.Mesh
+            Mesh that gets the attributes, needs the same amount of vertices as the frames.
+        name_prefix : str
+            Attributes get named name_prefix + frame. Already existing attributes with that name are overwritten.
+        """
+        self.mesh = mesh
+        self.name_prefix = name_prefix
+
+    def add_frame(self, frame, positions):
+        name = self.name_prefix + str(frame)
+        attribute = self.mesh.attributes.get(name)
+        if attribute == None:
+            attribute = self.mesh.attributes.new(name=name, type='FLOAT_VECTOR', domain='POINT')
+        attribute.data.foreach_set("vector", positions.ravel())
+
+
+class NpyFileSink(FrameSink):
+    """Writes all frames into a single .npy file with the shape (frame_count, vertex_count, 3).
+
+    The file is memory-mapped, so memory usage stays the same no matter how many frames there are.\\
+    Load it again with numpy.load(filepath, mmap_mode="r").
+    """
+
+    is_thread_safe = True
+
+    filepath: str
+    frames_written: int
+    __array: np.memmap
+    __row_of_frame: dict
+
+    def __init__(self, filepath):
+        """Writes all frames into a single .npy file with the shape (frame_count, vertex_count, 3).
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the file, Blender-relative paths ("//...") are allowed. Existing files are overwritten.
+        """
+        self.filepath = bpy.path.abspath(filepath)
+        self.frames_written = 0
+        self.__array = None
+        self.__row_of_frame = dict()
+
+    def start(self, frames, vertex_count):
+        self.__array = np.lib.format.open_memmap(self.filepath, mode="w+", dtype=np.float32, shape=(len(frames), vertex_count, 3))
+        self.__row_of_frame = {frame: row for row, frame in enumerate(frames)}
+
+    def add_frame(self, frame, positions):
+        self.__array[self.__row_of_frame[frame]] = positions
+        self.frames_written += 1
+
+    def finish(self):
+        self.__array.flush()
+        del self.__array
+        self.__array = None
+
+    def close(self):
+        if self.__array is None:
+            return
+        del self.__array
+        self.__array = None
+        # an incomplete file would look like a valid one
+        try:
+            os.remove(self.filepath)
+        except OSError:
+            pass
+
+
+class StatisticsSink(FrameSink):
+    """Doesn't output anything, just collects some numbers about the frames, such as the bounding box and how fast frames arrive."""
+
+    is_thread_safe = True
+
+    frame_count: int
+    bound_min: np.ndarray
+    bound_max: np.ndarray
+    max_displacement: float
+    seconds_total: float
+    __last_positions: np.ndarray
+    __time_start: float
+
+    def __init__(self):
+        """Doesn't output anything, just collects some numbers about the frames, such as the bounding box and how fast frames arrive."""
+        self.frame_count = 0
+        self.bound_min = None
+        self.bound_max = None
+        self.max_displacement = 0.0
+        self.seconds_total = 0.0
+        self.__last_positions = None
+        self.__time_start = None
+
+    def start(self, frames, vertex_count):
+        self.__time_start = time.perf_counter()
+        self.__last_positions = np.empty((vertex_count, 3), dtype=np.float32)
+
+    def add_frame(self, frame, positions):
+        frame_min = positions.min(axis=0)
+        frame_max = positions.max(axis=0)
+        if self.frame_count == 0:
+            self.bound_min = frame_min
+            self.bound_max = frame_max
+        else:
+            np.minimum(self.bound_min, frame_min, out=self.bound_min)
+            np.maximum(self.bound_max, frame_max, out=self.bound_max)
+            # biggest distance a single vertex moved between two frames
+            displacement = np.sqrt(((positions - self.__last_positions) ** 2).sum(axis=1)).max()
+            self.max_displacement = max(self.max_displacement, float(displacement))
+        self.__last_positions[:] = positions
+        self.frame_count += 1
+
+    def finish(self):
+        self.seconds_total = time.perf_counter() - self.__time_start
+
+    def get_frames_per_second(self) -> float:
+        """Average amount of frames that arrived per second between start() and finish()."""
+        if self.seconds_total == 0:
+            return 0.0
+        return self.frame_count / self.seconds_total
@@ -0,0 +1,230 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Streams the evaluated shape of an object frame by frame, without keeping anything in Blender datablocks.
+# What happens with each frame is decided by the sinks (see frame_sinks.py) you give it.
+
+import time
+
+from c0s_lewd_utilities.addon_utils.animation.frame_walker import FrameWalker
+from c0s_lewd_utilities.addon_utils.mesh.evaluated_geometry import EvaluatedPositionReader
+
+
+def iterate_evaluated_frames(context, obj, frames, apply_transforms=True, reader=None, walker=None, rewind_every_frame=False, view_layer=None):
+    """Generator that goes over the given frames and yields the evaluated vertex positions of the object at each of them.
+
+    Frames are only evaluated when you ask for the next one, so nothing but the current frame is kept in memory.\\
+    The original frame of the scene gets restored once the generator is finished (or closed early).
+
+    Parameters
+    ----------
+    context : bpy.types.Context
+        Your current context
+    obj : bpy.types.Object
+        Object with the animation
+    frames : iterable of int
+        Frames to go over. Should be in increasing order, otherwise the scene has to jump backwards.
+    apply_transforms : bool
+        Include the transforms of the object in the positions. Ignored if you provide your own reader.
+    reader : None or EvaluatedPositionReader
+        Reader to use, if None a new one is created.
+    walker : None or FrameWalker
+        Walker to use, if None a new one is created. Give your own one if you want to know how many evaluations were saved afterwards.
+    rewind_every_frame : bool
+        Jump back to the original frame after every single frame, like create_real_mesh_copy() does. Only useful for comparisons.
+    view_layer : None or bpy.types.ViewLayer
+        Read from the depsgraph of this view layer instead of the one of the context, e.g. of an IsolatedEvaluationScene.
+        A given walker then needs to walk the scene of that view layer.
+
+    Yields
+    ------
+    tuple (int, np.ndarray)
+        The frame and a float32 array with the shape (vertex_count, 3).\\
+        The array is the same buffer for every frame, so copy it if you want to keep it.
+    """
+    if reader == None:
+        reader = EvaluatedPositionReader(obj=obj, apply_transforms=apply_transforms)
+    if walker == None:
+        walker = FrameWalker(scene=view_layer.id_data if view_layer != None else context.scene)
+    try:
+        for frame in frames:
+            walker.go_to_frame(frame=frame)
+            if view_layer != None:
+                depsgraph = view_layer.depsgraph
+            else:
+                depsgraph = context.evaluated_depsgraph_get()
+            positions = reader.read(depsgraph=depsgraph)
+            if rewind_every_frame == True:
+                walker.restore_original_frame()
+            yield (frame, positions)
+    finally:
+        walker.restore_original_frame()
+
+
+def feed_frames_to_sinks(frame_iterator, sinks, frames, print_frames=False):
+    """Takes (frame, positions) tuples, for example from iterate_evaluated_frames(), and gives each of them to all sinks.
+
+    Parameters
+    ----------
+    frame_iterator : iterable of (int, np.ndarray)
+        Source of the frames and their positions.
+    sinks : list of FrameSink
+        Every frame is given to every sink, in the order of this list.
+    frames : list of int
+        All frames that frame_iterator is going to yield. Sinks use this to prepare themselves (e.g. to preallocate memory).
+    print_frames : bool
+        Print the current frame to the console?
+    """
+    ChunkedFrameFeeder(frame_iterator=frame_iterator, sinks=sinks, frames=frames, print_frames=print_frames).process_all()
+
+
+class ChunkedFrameFeeder():
+    """Same as feed_frames_to_sinks(), but the frames can be processed in chunks with a time limit each, and the whole thing can be cancelled.
+
+    Meant for modal operators or timers, so Blender doesn't freeze for the whole conversion:
+    call process_chunk() again and again until it returns True.
+    """
+
+    frames: list
+    sinks: list
+    print_frames: bool
+    frames_done: int
+    seconds_spent: float
+    is_finished: bool
+    was_cancelled: bool
+    __frame_iterator: any
+    __is_started: bool
+
+    def __init__(self, frame_iterator, sinks, frames, print_frames=False):
+        """Same as feed_frames_to_sinks(), but the frames can be processed in chunks with a time limit each, and the whole thing can be cancelled.
+
+        Parameters
+        ----------
+        frame_iterator : iterable of (int, np.ndarray)
+            Source of the frames and their positions, for example iterate_evaluated_frames().
+        sinks : list of FrameSink
+            Every frame is given to every sink, in the order of this list.
+        frames : list of int
+            All frames that frame_iterator is going to yield.
+        print_frames : bool
+            Print the current frame to the console?
+        """
+        self.frames = list(frames)
+        self.sinks = sinks
+        self.print_frames = print_frames
+        self.frames_done = 0
+        self.seconds_spent = 0.0
+        self.is_finished = False
+        self.was_cancelled = False
+        self.__frame_iterator = iter(frame_iterator)
+        self.__is_started = False
+
+    def __finish(self):
+        self.is_finished = True
+        if self.__is_started == True:
+            for sink in self.sinks:
+                sink.finish()
+
+    def __process_frame(self, frame, positions):
+        if self.__is_started == False:
+            # the amount of vertices is only known after the first frame was evaluated
+            for sink in self.sinks:
+                sink.start(frames=self.frames, vertex_count=len(positions))
+            self.__is_started = True
+        if self.print_frames == True:
+            print("Current frame: ", frame)
+        for sink in self.sinks:
+            sink.add_frame(frame=frame, positions=positions)
+        self.frames_done += 1
+
+    def process_chunk(self, time_budget=None) -> bool:
+        """Processes frames until the time budget is used up (at least one frame is always processed).
+
+        Parameters
+        ----------
+        time_budget : None or float
+            Seconds this chunk may take. If None, all remaining frames are processed.
+
+        Returns
+        -------
+        bool
+            True if all frames are done (the sinks have been finished as well).
+        """
+        if self.is_finished == True:
+            return True
+        time_start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    frame, positions = next(self.__frame_iterator)
+                except StopIteration:
+                    self.__finish()
+                    return True
+                self.__process_frame(frame=frame, positions=positions)
+                if time_budget != None and time.perf_counter() - time_start >= time_budget:
+                    return False
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self.seconds_spent += time.perf_counter() - time_start
+
+    def process_all(self) -> None:
+        """Processes all remaining frames."""
+        self.process_chunk(time_budget=None)
+
+    def cancel(self) -> None:
+        """Stops early. The sinks are still finished, so they contain a clean result of the frames done so far."""
+        if self.is_finished == True:
+            return
+        self.was_cancelled = True
+        if hasattr(self.__frame_iterator, "close"):
+            # lets iterate_evaluated_frames() restore the original frame
+            self.__frame_iterator.close()
+        self.__finish()
+
+    def abort(self) -> None:
+        """Stops after an error, process_chunk() calls this itself before raising the exception again.
+        Unlike cancel(), the sinks aren't finished but closed (see FrameSink.close()), so files, memory maps and threads get released without a result.
+        Can be called more than once."""
+        self.is_finished = True
+        if hasattr(self.__frame_iterator, "close"):
+            try:
+                self.__frame_iterator.close()
+            except Exception as exception:
+                print("Couldn't close the frame source: " + str(exception))
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as exception:
+                # the original exception is more important
+                print("Couldn't close " + type(sink).__name__ + ": " + str(exception))
+
+    def get_progress(self) -> float:
+        """Done frames compared to all frames, between 0 and 1."""
+        if len(self.frames) == 0:
+            return 1.0
+        return self.frames_done / len(self.frames)
+
+    def get_frames_per_second(self) -> float:
+        """Average amount of processed frames per second, only counting the time spent inside process_chunk()."""
+        if self.seconds_spent == 0:
+            return 0.0
+        return self.frames_done / self.seconds_spent
@@ -0,0 +1,85 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import bpy
+
+
+class FrameWalker():
+    """Walks a scene over multiple frames without jumping back to the original frame in between.
+
+    create_real_mesh.create_real_mesh_copy() sets the requested frame and afterwards resets the scene to the original frame again,
+    meaning every frame you get a mesh copy for costs two full scene evaluations.\\
+    If you instead use this class to go to the frame first, create_real_mesh_copy() notices that it's already at the correct frame and
+    doesn't change anything. The original frame only gets restored once, when calling restore_original_frame().
+
+    Also counts how many scene evaluations that saved compared to the "jump back every time" way.
+    """
+
+    scene: bpy.types.Scene
+    frame_orig: int
+    evaluations_done: int
+    evaluations_without_walker: int
+
+    def __init__(self, scene):
+        """Walks a scene over multiple frames without jumping back to the original frame in between.
+
+        Parameters
+        ----------
+        scene : bpy.types.Scene
+            The scene whose frames should be changed, most likely context.scene
+        """
+        self.scene = scene
+        self.frame_orig = scene.frame_current
+        self.evaluations_done = 0
+        self.evaluations_without_walker = 0
+
+    def go_to_frame(self, frame) -> None:
+        """Sets the scene to the specified frame, but only if it isn't already at that frame.
+
+        Frames should be given in increasing order to keep things like simulation caches happy,
+        but nothing stops you from going backwards.
+
+        Parameters
+        ----------
+        frame : int
+            Frame to go to.
+        """
+        if frame != self.frame_orig:
+            # create_real_mesh_copy() would have needed one evaluation to go to the frame and another one to go back
+            self.evaluations_without_walker += 2
+        if self.scene.frame_current != frame:
+            self.scene.frame_set(frame)
+            self.evaluations_done += 1
+
+    def restore_original_frame(self) -> None:
+        """Sets the scene back to the frame it had when this walker was created."""
+        if self.scene.frame_current != self.frame_orig:
+            self.scene.frame_set(self.frame_orig)
+            self.evaluations_done += 1
+
+    def get_evaluations_saved(self) -> int:
+        """How many scene evaluations were saved so far compared to resetting the frame after every single frame.
+
+        Returns
+        -------
+        int
+            Amount of saved evaluations, can't be negative.
+        """
+        return max(0, self.evaluations_without_walker - self.evaluations_done)
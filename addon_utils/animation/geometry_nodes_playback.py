@@ -0,0 +1,203 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Alternative to shapekeys for playing back a baked animation:
+# All frames are stored as the vertices of a separate "frame table" mesh, and a Geometry Nodes modifier on the new object
+# copies the positions of the current frame from that table.
+# With shapekeys, Blender has to evaluate one fcurve per shapekey every frame. Here it's always one lookup, no matter how many frames there are.
+
+import bpy
+import numpy as np
+
+from c0s_lewd_utilities.addon_utils.animation.frame_sinks import FrameSink
+from c0s_lewd_utilities.toolbox_1_0_0 import create_real_mesh
+from c0s_lewd_utilities.toolbox_1_0_0.advanced.node_helper import GeometryNodesModifierHandler
+
+
+# float math nodes can't represent every integer above this, so bigger tables need the Integer Math node (Blender 4.2+)
+max_float_table_size = 2 ** 24
+
+
+def has_integer_math() -> bool:
+    return hasattr(bpy.types, "FunctionNodeIntegerMath")
+
+
+def is_table_size_supported(table_size) -> bool:
+    """Checks if a frame table with this many vertices (vertex_count * frame_count) can be indexed correctly in this Blender version."""
+    return has_integer_math() == True or table_size <= max_float_table_size
+
+
+class FrameTableSink(FrameSink):
+    """Stores all frames in a "frame table" mesh and adds a Geometry Nodes modifier to the object that picks the positions of the current frame from it.
+
+    The frame table has vertex_count * frame_count loose vertices, frame after frame.
+    Loose vertices aren't drawn in object mode, so the table object is invisible unless you enter edit mode.
+
+    Attention: All frames are kept in memory until finish().
+    """
+
+    is_thread_safe = True
+
+    context: bpy.types.Context
+    obj: bpy.types.Object
+    obj_table: bpy.types.Object
+    modifier: bpy.types.NodesModifier
+    frames_written: int
+    __table: np.ndarray
+    __row_of_frame: dict
+    __frames: list
+
+    def __init__(self, context, obj):
+        """Stores all frames in a "frame table" mesh and adds a Geometry Nodes modifier to the object that picks the positions of the current frame from it.
+
+        Parameters
+        ----------
+        context : bpy.types.Context
+            Your current context, the table object gets linked to its scene.
+        obj : bpy.types.Object
+            Object that gets the Geometry Nodes modifier. Needs the same amount of vertices as the frames.
+        """
+        self.context = context
+        self.obj = obj
+        self.obj_table = None
+        self.modifier = None
+        self.frames_written = 0
+        self.__table = None
+        self.__row_of_frame = dict()
+        self.__frames = []
+
+    def start(self, frames, vertex_count):
+        self.__table = np.empty((len(frames), vertex_count, 3), dtype=np.float32)
+        self.__row_of_frame = {frame: row for row, frame in enumerate(frames)}
+        self.__frames = list(frames)
+
+    def add_frame(self, frame, positions):
+        self.__table[self.__row_of_frame[frame]] = positions
+        self.frames_written += 1
+
+    def finish(self):
+        if self.frames_written == 0:
+            self.__table = None
+            return
+        # if the conversion was cancelled, only the first frames have been filled
+        table = self.__table[:self.frames_written]
+        self.__table = None
+        frame_count, vertex_count = table.shape[:2]
+
+        mesh_table = bpy.data.meshes.new(self.obj.name + "_frame_table")
+        mesh_table.vertices.add(count=frame_count * vertex_count)
+        mesh_table.vertices.foreach_set("co", table.ravel())
+        mesh_table.update()
+        self.obj_table = create_real_mesh.create_new_obj_for_mesh(context=self.context, name=mesh_table.name, mesh=mesh_table)
+        self.obj_table.hide_render = True
+        self.obj_table.hide_select = True
+        self.obj_table["frame_table_frame_start"] = self.__frames[0]
+        self.obj_table["frame_table_frame_count"] = frame_count
+        self.obj_table["frame_table_vertex_count"] = vertex_count
+
+        self.modifier = self.obj.modifiers.new(name="Baked Animation", type='NODES')
+        create_playback_node_group(obj_table=self.obj_table, frame_start=self.__frames[0], frame_count=frame_count, vertex_count=vertex_count).link_ng_to_modifier(self.modifier)
+
+
+def _get_enabled_socket(sockets, name) -> bpy.types.NodeSocket:
+    # Some nodes have one socket per data type, all with the same name. Only the one for the current data type is enabled.
+    for socket in sockets:
+        if socket.name == name and socket.enabled == True:
+            return socket
+    raise Exception("No enabled socket called '" + name + "' was found")
+
+
+def create_playback_node_group(obj_table, frame_start, frame_count, vertex_count) -> GeometryNodesModifierHandler:
+    """Creates the node group that replaces the positions of the geometry with the ones of the current frame from a frame table.
+
+    index in table = clamp(round(scene frame - frame_start), 0, frame_count - 1) * vertex_count + vertex index
+
+    Needs the Sample Index node (Blender 3.4 and newer). The index is calculated with integer math if available (Blender 4.2+),
+    otherwise with float math, which limits the table to max_float_table_size vertices (see is_table_size_supported()).
+
+    Parameters
+    ----------
+    obj_table : bpy.types.Object
+        Object with the frame table mesh, see FrameTableSink
+    frame_start : int
+        Frame that the first frame of the table belongs to
+    frame_count : int
+        Amount of frames in the table
+    vertex_count : int
+        Amount of vertices per frame
+
+    Returns
+    -------
+    GeometryNodesModifierHandler
+        Handler of the new node group
+    """
+    if is_table_size_supported(table_size=frame_count * vertex_count) == False:
+        raise ValueError("The frame table has " + str(frame_count * vertex_count) + " vertices, this Blender version can only index "
+                         + str(max_float_table_size) + " (the Integer Math node of Blender 4.2+ is needed for more)")
+    handler = GeometryNodesModifierHandler(source=None)
+    handler.node_group.name = obj_table.name + "_playback"
+    handler.add_input("NodeSocketGeometry", "Geometry")
+    handler.add_output("NodeSocketGeometry", "Geometry")
+
+    node_object_info = handler.add_node("GeometryNodeObjectInfo")
+    node_object_info.transform_space = 'ORIGINAL'
+    node_object_info.inputs["Object"].default_value = obj_table
+
+    node_time = handler.add_node("GeometryNodeInputSceneTime")
+
+    def add_math_node(operation, input_socket, value):
+        node = handler.add_node("ShaderNodeMath")
+        node.operation = operation
+        handler.connect_nodes(output_socket=input_socket, input_socket=node.inputs[0])
+        node.inputs[1].default_value = value
+        return node
+
+    node_offset = add_math_node('SUBTRACT', node_time.outputs["Frame"], frame_start)
+    node_round = add_math_node('ROUND', node_offset.outputs[0], 0)
+    node_min = add_math_node('MAXIMUM', node_round.outputs[0], 0)
+    node_max = add_math_node('MINIMUM', node_min.outputs[0], frame_count - 1)
+    # the row is small enough for float math, but row * vertex_count may not be
+    if has_integer_math() == True:
+        node_row_start = handler.add_node("FunctionNodeIntegerMath")
+        node_row_start.operation = 'MULTIPLY'
+        handler.connect_nodes(output_socket=node_max.outputs[0], input_socket=node_row_start.inputs[0])
+        node_row_start.inputs[1].default_value = vertex_count
+        node_table_index = handler.add_node("FunctionNodeIntegerMath")
+        node_table_index.operation = 'ADD'
+        handler.connect_nodes(output_socket=node_row_start.outputs[0], input_socket=node_table_index.inputs[0])
+    else:
+        node_row_start = add_math_node('MULTIPLY', node_max.outputs[0], vertex_count)
+        node_table_index = add_math_node('ADD', node_row_start.outputs[0], 0)
+    node_index = handler.add_node("GeometryNodeInputIndex")
+    handler.connect_nodes(output_socket=node_index.outputs["Index"], input_socket=node_table_index.inputs[1])
+
+    node_position = handler.add_node("GeometryNodeInputPosition")
+    node_sample = handler.add_node("GeometryNodeSampleIndex")
+    node_sample.data_type = 'FLOAT_VECTOR'
+    node_sample.domain = 'POINT'
+    handler.connect_nodes(output_socket=node_object_info.outputs["Geometry"], input_socket=node_sample.inputs["Geometry"])
+    handler.connect_nodes(output_socket=node_position.outputs["Position"], input_socket=_get_enabled_socket(node_sample.inputs, "Value"))
+    handler.connect_nodes(output_socket=node_table_index.outputs[0], input_socket=node_sample.inputs["Index"])
+
+    node_set_position = handler.add_node("GeometryNodeSetPosition")
+    handler.connect_nodes(output_socket=handler.main_input_node.outputs["Geometry"], input_socket=node_set_position.inputs["Geometry"])
+    handler.connect_nodes(output_socket=_get_enabled_socket(node_sample.outputs, "Value"), input_socket=node_set_position.inputs["Position"])
+    handler.connect_nodes(output_socket=node_set_position.outputs["Geometry"], input_socket=handler.main_output_node.inputs["Geometry"])
+    return handler
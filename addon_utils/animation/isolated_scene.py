@@ -0,0 +1,170 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+# Evaluating a frame evaluates the whole scene, even objects that have nothing to do with the one being converted.
+# An isolated scene only contains the object and everything it depends on (armature, constraint targets, deform cages,
+# driver targets, ...), so each frame_set() has less to do. The objects are only linked into it, not copied.
+# Objects that are affected by things they don't reference (collisions, force fields, the scene camera, ...) can't be isolated,
+# see get_isolation_problem().
+
+import bpy
+
+from c0s_lewd_utilities.addon_utils.animation import bake_fingerprint, playback_benchmark
+
+
+# these get collision objects, force fields and so on from the whole scene
+scene_dependent_modifier_types = {'CLOTH',
+                                  'SOFT_BODY',
+                                  'DYNAMIC_PAINT',
+                                  'FLUID',
+                                  'PARTICLE_SYSTEM',
+                                  'COLLISION'}
+
+# Geometry Nodes that read something from the scene instead of a referenced object
+scene_dependent_node_types = {'GeometryNodeInputActiveCamera'}
+
+
+def get_evaluation_dependencies(objs) -> list:
+    """All given objects plus everything they depend on, see bake_fingerprint.get_dependency_objects()."""
+    dependencies = []
+    for obj in objs:
+        for obj_dependency in bake_fingerprint.get_dependency_objects(obj):
+            if obj_dependency not in dependencies:
+                dependencies.append(obj_dependency)
+    return dependencies
+
+
+def _find_scene_dependent_node(node_group, node_groups_done):
+    if node_group in node_groups_done:
+        return None
+    node_groups_done.append(node_group)
+    for node in node_group.nodes:
+        if node.bl_idname in scene_dependent_node_types:
+            return node
+        if getattr(node, "node_tree", None) != None:
+            node_found = _find_scene_dependent_node(node_group=node.node_tree, node_groups_done=node_groups_done)
+            if node_found != None:
+                return node_found
+    return None
+
+
+def get_isolation_problem(objs):
+    """Reason why the objects would be evaluated differently in an isolated scene, or None if they can be isolated.
+
+    Parameters
+    ----------
+    objs : list of bpy.types.Object
+        Objects whose frames you want to evaluate
+
+    Returns
+    -------
+    None or str
+        Human readable reason
+    """
+    for obj in get_evaluation_dependencies(objs):
+        if obj.rigid_body != None:
+            return "\"" + obj.name + "\" is a rigid body"
+        for modifier in obj.modifiers:
+            if modifier.show_viewport == False:
+                continue
+            if modifier.type in scene_dependent_modifier_types:
+                return "\"" + obj.name + "\" has a " + modifier.type + " modifier, which uses other objects of the scene"
+            if modifier.type == 'NODES' and modifier.node_group != None:
+                node = _find_scene_dependent_node(node_group=modifier.node_group, node_groups_done=[])
+                if node != None:
+                    return "the Geometry Nodes of \"" + obj.name + "\" use the node \"" + node.name + "\", which reads from the scene"
+    return None
+
+
+class IsolatedEvaluationScene():
+    """Temporary scene that only contains some objects and their dependencies, for evaluating frames faster.
+
+    Steps:
+    - create(): creates the scene and links the objects into it
+    - measure_speedup(): optional, compares its evaluation speed to the original scene
+    - evaluate frames with scene.frame_set() and view_layer.depsgraph, e.g. iterate_evaluated_frames(view_layer=...) in frame_stream.py
+    - remove(): deletes the scene again, the objects stay in the original scene
+
+    Attention: Anything else that affects the objects (e.g. a rigid body world, force fields, collision objects of a cloth)
+    isn't part of the isolated scene, so the results can differ for such objects. Check get_isolation_problem() first.
+    """
+
+    scene_orig: bpy.types.Scene
+    objects: list
+    scene: bpy.types.Scene
+    view_layer: bpy.types.ViewLayer
+
+    def __init__(self, context, objs):
+        """Temporary scene that only contains some objects and their dependencies.
+
+        Parameters
+        ----------
+        context : bpy.types.Context
+            Your current context
+        objs : list of bpy.types.Object
+            Objects whose frames you want to evaluate
+        """
+        self.scene_orig = context.scene
+        self.objects = get_evaluation_dependencies(objs)
+        self.scene = None
+        self.view_layer = None
+
+    def create(self) -> None:
+        """Creates the scene (not visible to the user) and evaluates it once."""
+        scene = bpy.data.scenes.new("c0_isolated_evaluation")
+        # settings that change how the objects get evaluated
+        for attribute in ("frame_start", "frame_end", "frame_current"):
+            setattr(scene, attribute, getattr(self.scene_orig, attribute))
+        for attribute in ("fps", "fps_base", "use_simplify", "simplify_subdivision"):
+            setattr(scene.render, attribute, getattr(self.scene_orig.render, attribute))
+        for obj in self.objects:
+            scene.collection.objects.link(obj)
+        self.scene = scene
+        self.view_layer = scene.view_layers[0]
+        # makes sure the view layer has an evaluated depsgraph
+        self.view_layer.update()
+
+    def measure_speedup(self, frames, sample_size=10) -> float:
+        """How many times faster frames get evaluated in this scene than in the original one.
+
+        Both scenes step over the first few frames (see playback_benchmark.time_playback()), their current frames are restored afterwards.
+
+        Parameters
+        ----------
+        frames : list of int
+            Frames of the conversion, in increasing order
+        sample_size : int
+            Amount of frames to measure
+        """
+        frame_start = frames[0]
+        frame_end = min(frames[-1], frame_start + sample_size - 1)
+        fps_full = playback_benchmark.time_playback(scene=self.scene_orig, frame_start=frame_start, frame_end=frame_end)
+        fps_isolated = playback_benchmark.time_playback(scene=self.scene, frame_start=frame_start, frame_end=frame_end)
+        if fps_full == 0:
+            return 1.0
+        return fps_isolated / fps_full
+
+    def remove(self) -> None:
+        """Deletes the scene, can be called more than once."""
+        if self.scene != None:
+            bpy.data.scenes.remove(self.scene)
+            self.scene = None
+            self.view_layer = None
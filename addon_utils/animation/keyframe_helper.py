@@ -0,0 +1,82 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+# foreach_set() doesn't accept the names of enum values, only their internal integer values.
+interpolation_values = {
+    "CONSTANT": 0,
+    "LINEAR": 1,
+    "BEZIER": 2,
+}
+
+handle_type_values = {
+    "FREE": 0,
+    "AUTO": 1,
+    "VECTOR": 2,
+    "ALIGNED": 3,
+    "AUTO_CLAMPED": 4,
+}
+
+
+def create_fcurves_with_key_frames_bulk(action, key_frames_per_data_path, interpolation="LINEAR", handle_type="VECTOR") -> list:
+    """Creates many new fcurves with all their keyframes in one go.
+
+    Meant to be used once at the end of something that would otherwise create a new fcurve with a few keyframes again and again,
+    which gets slower the bigger the action gets.\\
+    Everything, including interpolation and handle types, is set with foreach_set() and every fcurve only gets updated once.
+
+    Attention: None of the data paths should already have an fcurve in the action.
+
+    Parameters
+    ----------
+    action : bpy.types.Action
+        The action that gets the fcurves, see everything_key_frames.get_or_create_action()
+    key_frames_per_data_path : dict
+        {data_path: [frame1, value1, frame2, value2, ...], ...}\\
+        Same list layout as in everything_key_frames.create_key_frames_fast(), frames should be in increasing order.
+    interpolation : str
+        "CONSTANT", "LINEAR" or "BEZIER", used for all keyframes.
+    handle_type : str
+        "FREE", "AUTO", "VECTOR", "ALIGNED" or "AUTO_CLAMPED", used for both handles of all keyframes.
+
+    Returns
+    -------
+    list
+        The created fcurves, in the same order as key_frames_per_data_path
+    """
+    interpolation_value = interpolation_values[interpolation]
+    handle_type_value = handle_type_values[handle_type]
+    fcurves_new = []
+    for data_path, values in key_frames_per_data_path.items():
+        fcurve = action.fcurves.new(data_path)
+        key_frame_points = fcurve.keyframe_points
+        count = len(values) // 2
+        key_frame_points.add(count=count)
+        key_frame_points.foreach_set("co", values)
+        # handles start on top of their keyframes, update() moves them to the correct positions for the handle type
+        key_frame_points.foreach_set("handle_left", values)
+        key_frame_points.foreach_set("handle_right", values)
+        key_frame_points.foreach_set("interpolation", [interpolation_value] * count)
+        key_frame_points.foreach_set("handle_left_type", [handle_type_value] * count)
+        key_frame_points.foreach_set("handle_right_type", [handle_type_value] * count)
+        fcurves_new.append(fcurve)
+    for fcurve in fcurves_new:
+        fcurve.update()
+    return fcurves_new
@@ -0,0 +1,135 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+# Rough estimate of how much memory a conversion needs at its peak, so huge conversions can be noticed before they run out of memory.
+# Only the parts that grow with vertex count times frame count are counted, everything else is small in comparison.
+#
+# The panel shows the estimate, but drawing a panel must not evaluate the depsgraph. So it only reads vertex counts that
+# a depsgraph handler (call register() once) or update_vertex_counts() stored before.
+
+import bpy
+
+
+# bytes per vertex and frame for each output mode, see the sinks for where they come from
+bytes_per_vertex_and_frame = {
+    # the shapekeys (3 floats per vertex), plus the copy the undo system keeps of them
+    "SHAPEKEYS": 12 * 2,
+    # streamed into the file, nothing is kept
+    "POINT_CACHE": 0,
+    "NPY_FILE": 0,
+    # RGBA float pixels in the sink, plus the same again in the image
+    "VAT": 16 * 2,
+    # the frame table in the sink, plus the vertices of the frame table mesh
+    "GEOMETRY_NODES": 12 * 2,
+}
+
+bytes_per_vertex_and_frame_compression = {
+    # all frames are kept until the end, plus about the same again while calculating the components
+    "PCA": 12 * 3,
+    # kept shapekeys and the pending frames, in the worst case every frame is kept
+    "ADAPTIVE": 12 * 3,
+}
+
+# buffers that only exist once per conversion (reader, last frame, ...)
+bytes_per_vertex = 12 * 8
+
+# {object name: evaluated vertex count}
+_vertex_counts = dict()
+
+
+def get_evaluated_vertex_count(depsgraph, obj) -> int:
+    """Amount of vertices of the object with all modifiers applied, without creating a temporary mesh."""
+    obj_eval = obj.evaluated_get(depsgraph)
+    # the data of an evaluated mesh object is the evaluated mesh
+    return len(obj_eval.data.vertices)
+
+
+def estimate_peak_memory(vertex_count, frame_count, output_mode, shapekey_compression="NONE") -> int:
+    """Estimates how many bytes a conversion needs at its peak.
+
+    Parameters
+    ----------
+    vertex_count : int
+        Amount of vertices of every frame (of all objects together)
+    frame_count : int
+        Amount of frames
+    output_mode : str
+        "SHAPEKEYS", "POINT_CACHE", "NPY_FILE", "VAT" or "GEOMETRY_NODES"
+    shapekey_compression : str
+        "NONE", "PCA" or "ADAPTIVE", only used for shapekeys
+
+    Returns
+    -------
+    int
+        Estimated bytes
+    """
+    per_vertex_and_frame = bytes_per_vertex_and_frame[output_mode]
+    if output_mode == "SHAPEKEYS" and shapekey_compression in bytes_per_vertex_and_frame_compression:
+        per_vertex_and_frame = bytes_per_vertex_and_frame_compression[shapekey_compression]
+    return vertex_count * (frame_count * per_vertex_and_frame + bytes_per_vertex)
+
+
+def format_byte_count(byte_count) -> str:
+    """E.g. 1536 becomes "1.5 KB"."""
+    size = float(byte_count)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return str(round(size, 1)) + " " + unit
+        size /= 1024
+    return str(round(size, 1)) + " TB"
+
+
+def update_vertex_counts(depsgraph, objs) -> None:
+    """Stores the evaluated vertex counts of the objects for get_cached_vertex_count()."""
+    for obj in objs:
+        _vertex_counts[obj.name_full] = get_evaluated_vertex_count(depsgraph=depsgraph, obj=obj)
+
+
+def get_cached_vertex_count(obj):
+    """The evaluated vertex count stored by the depsgraph handler or update_vertex_counts(), None if there isn't one yet.
+    Can be called while drawing a panel."""
+    return _vertex_counts.get(obj.name_full)
+
+
+@bpy.app.handlers.persistent
+def _on_depsgraph_update(scene, depsgraph) -> None:
+    for update in depsgraph.updates:
+        if update.is_updated_geometry == False or isinstance(update.id, bpy.types.Object) == False or update.id.type != 'MESH':
+            continue
+        _vertex_counts[update.id.name_full] = get_evaluated_vertex_count(depsgraph=depsgraph, obj=update.id.original)
+
+
+@bpy.app.handlers.persistent
+def _on_load(*args) -> None:
+    _vertex_counts.clear()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    bpy.app.handlers.load_post.append(_on_load)
+
+
+def unregister():
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    if _on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load)
+    _vertex_counts.clear()
@@ -0,0 +1,213 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Evaluating frames is single-threaded, but most animations don't depend on the previous frames.
+# So the frame range can be split into shards and each shard evaluated by its own background Blender process
+# (see parallel_bake_worker.py), using a temporary copy of the current file.
+
+import bpy
+import numpy as np
+import os
+import shutil
+import subprocess
+import tempfile
+
+
+_worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parallel_bake_worker.py")
+
+# with these, a frame depends on the frames before it, so it can't be evaluated on its own
+simulation_modifier_types = {'CLOTH',
+                             'SOFT_BODY',
+                             'DYNAMIC_PAINT',
+                             'FLUID',
+                             'PARTICLE_SYSTEM'}
+
+
+def has_simulation(obj) -> bool:
+    """Checks if the object has modifiers whose result depends on the previous frames (cloth, softbody, ...).
+
+    Such objects can't be baked in parallel, because each worker would start its simulation from scratch.
+    Dependencies of the object (e.g. a simulated armature) aren't checked.
+    """
+    for modifier in obj.modifiers:
+        if modifier.type in simulation_modifier_types and modifier.show_viewport == True:
+            return True
+    return False
+
+
+def split_frames_into_shards(frames, shard_count) -> list:
+    """Splits the frames into shard_count (or less, if there aren't enough frames) consecutive parts of roughly the same size.
+
+    Parameters
+    ----------
+    frames : list of int
+        Frames in increasing order
+    shard_count : int
+        Wanted amount of shards
+
+    Returns
+    -------
+    list of list of int
+        The shards, in order
+    """
+    shard_count = max(1, min(shard_count, len(frames)))
+    return [[int(frame) for frame in shard] for shard in np.array_split(np.asarray(frames), shard_count) if len(shard) != 0]
+
+
+class ParallelFrameBaker():
+    """Evaluates the frames of an object in several background Blender processes at once and gives you the results in frame order.
+
+    Steps:
+    - start(): saves a temporary copy of the current file and starts the worker processes
+    - wait(): waits until all workers are done
+    - iterate_frames(): (frame, positions) tuples, same as iterate_evaluated_frames() in frame_stream.py
+    - cleanup(): deletes the temporary files
+
+    Only works if the frames don't depend on each other, see has_simulation().
+    """
+
+    obj: bpy.types.Object
+    frames: list
+    worker_count: int
+    apply_transforms: bool
+    shards: list
+    __temp_dir: str
+    __processes: list
+    __result_paths: list
+    __log_paths: list
+
+    def __init__(self, obj, frames, worker_count, apply_transforms=True):
+        """Evaluates the frames of an object in several background Blender processes at once.
+
+        Parameters
+        ----------
+        obj : bpy.types.Object
+            Object with the animation
+        frames : list of int
+            Frames to evaluate, in increasing order. Workers evaluate everything from the first to the last frame of their shard, so gaps cost time.
+        worker_count : int
+            Amount of Blender processes to start. Each one needs as much memory as a normal Blender instance with this file.
+        apply_transforms : bool
+            Include the transforms of the object in the positions
+        """
+        self.obj = obj
+        self.frames = list(frames)
+        self.worker_count = worker_count
+        self.apply_transforms = apply_transforms
+        self.shards = split_frames_into_shards(frames=self.frames, shard_count=worker_count)
+        self.__temp_dir = None
+        self.__processes = []
+        self.__result_paths = []
+        self.__log_paths = []
+
+    def start(self) -> None:
+        """Saves a temporary copy of the current file and starts one worker process per shard. Doesn't wait for them."""
+        self.__temp_dir = tempfile.mkdtemp(prefix="c0_parallel_bake_")
+        blend_path = os.path.join(self.__temp_dir, "bake.blend")
+        # copy=True keeps the current file path and the "unsaved changes" state as they are
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+
+        for index, shard in enumerate(self.shards):
+            result_path = os.path.join(self.__temp_dir, "shard_" + str(index) + ".npy")
+            log_path = os.path.join(self.__temp_dir, "shard_" + str(index) + ".log")
+            command = [bpy.app.binary_path,
+                       "-b", blend_path,
+                       "--python-exit-code", "1",
+                       "--python", _worker_script,
+                       "--",
+                       self.obj.name, str(shard[0]), str(shard[-1]), "1" if self.apply_transforms == True else "0", result_path]
+            # output goes into a file, a pipe that nobody reads could fill up and block the worker
+            with open(log_path, "w") as log_file:
+                process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+            self.__processes.append(process)
+            self.__result_paths.append(result_path)
+            self.__log_paths.append(log_path)
+
+    def is_done(self) -> bool:
+        """True if all workers have stopped (successfully or not)."""
+        return all(process.poll() != None for process in self.__processes)
+
+    def wait(self) -> None:
+        """Waits for all workers and raises an Exception with the end of its output if one of them failed."""
+        for index, process in enumerate(self.__processes):
+            return_code = process.wait()
+            if return_code != 0:
+                with open(self.__log_paths[index], "r", errors="replace") as log_file:
+                    log_end = log_file.read()[-2000:]
+                raise Exception("Bake worker for frames " + str(self.shards[index][0]) + "-" + str(self.shards[index][-1])
+                                + " failed with exit code " + str(return_code) + ":\n" + log_end)
+
+    def iterate_frames(self):
+        """Generator that yields (frame, positions) for every frame, in order. Call wait() before.
+
+        positions is a read-only float32 array with the shape (vertex_count, 3), copy it if you want to keep it.
+        """
+        vertex_count = None
+        for shard, result_path in zip(self.shards, self.__result_paths):
+            positions_per_frame = np.load(result_path, mmap_mode="r")
+            if vertex_count == None:
+                vertex_count = positions_per_frame.shape[1]
+            elif positions_per_frame.shape[1] != vertex_count:
+                raise Exception("The amount of vertices of the object changed between frames, that's not supported")
+            for frame in shard:
+                # the worker evaluated every frame from the first to the last one of its shard
+                yield (frame, positions_per_frame[frame - shard[0]])
+            del positions_per_frame
+
+    def cleanup(self) -> None:
+        """Stops workers that are still running and deletes the temporary files."""
+        for process in self.__processes:
+            if process.poll() == None:
+                process.kill()
+                process.wait()
+        self.__processes = []
+        if self.__temp_dir != None:
+            shutil.rmtree(self.__temp_dir, ignore_errors=True)
+            self.__temp_dir = None
+
+
+def iterate_frames_in_parallel(obj, frames, worker_count, apply_transforms=True):
+    """Same as iterate_evaluated_frames() in frame_stream.py, but the frames are evaluated by several background Blender processes.
+
+    Nothing is yielded until all workers are done, so this can't be processed in chunks. The temporary files get deleted once the generator is finished (or closed early).
+
+    Parameters
+    ----------
+    obj : bpy.types.Object
+        Object with the animation, must not have a simulation (see has_simulation())
+    frames : list of int
+        Frames to go over, in increasing order
+    worker_count : int
+        Amount of Blender processes
+    apply_transforms : bool
+        Include the transforms of the object in the positions
+
+    Yields
+    ------
+    tuple (int, np.ndarray)
+        The frame and a float32 array with the shape (vertex_count, 3)
+    """
+    baker = ParallelFrameBaker(obj=obj, frames=frames, worker_count=worker_count, apply_transforms=apply_transforms)
+    try:
+        baker.start()
+        baker.wait()
+        yield from baker.iterate_frames()
+    finally:
+        baker.cleanup()
@@ -0,0 +1,51 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Not a module to import. This script is run by the background Blender processes that parallel_bake.py starts:
+#   blender -b file.blend --python parallel_bake_worker.py -- object_name frame_first frame_last apply_transforms output.npy
+# It evaluates its share of the frames and writes them into a .npy file (see NpyFileSink).
+
+import bpy
+import os
+import sys
+
+# the add-on doesn't have to be enabled (or even installed) in the background process
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from c0s_lewd_utilities.addon_utils.animation.frame_stream import iterate_evaluated_frames, feed_frames_to_sinks
+from c0s_lewd_utilities.addon_utils.animation.frame_sinks import NpyFileSink
+
+
+def main():
+    args = sys.argv[sys.argv.index("--") + 1:]
+    obj_name = args[0]
+    frame_first = int(args[1])
+    frame_last = int(args[2])
+    apply_transforms = (args[3] == "1")
+    filepath = args[4]
+
+    context = bpy.context
+    obj = bpy.data.objects[obj_name]
+    frames = list(range(frame_first, frame_last + 1))
+    frame_iterator = iterate_evaluated_frames(context=context, obj=obj, frames=frames, apply_transforms=apply_transforms)
+    feed_frames_to_sinks(frame_iterator=frame_iterator, sinks=[NpyFileSink(filepath=filepath)], frames=frames)
+
+
+main()
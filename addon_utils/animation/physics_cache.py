@@ -0,0 +1,367 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+# Objects whose shape comes from a baked cloth or softbody simulation don't need to be evaluated frame by frame:
+# the positions of every frame are already stored in the point cache files (.bphys) of the simulation and can be read directly.
+# That's a lot faster and never risks resetting the simulation by jumping around in the timeline.
+#
+# Only works if:
+# - the cache is baked, stored on disk and not compressed
+# - the enabled modifiers after the simulation modifier (if any) always keep the same topology and aren't animated.
+#   They get evaluated on top of the cached positions: a temporary object in a temporary scene gets a mesh with the shape
+#   that goes into the simulation modifier and copies of those modifiers, its vertices are then replaced with the cache of each frame.
+# Modifiers before the simulation modifier (including a Mesh Sequence Cache) are already part of the cache.
+# Everything else, e.g. a Mesh Sequence Cache / Alembic without a simulation after it (reading it needs the importer libraries), gets evaluated normally.
+#
+# Layout of an uncompressed .bphys file (see pointcache.cc in the Blender source):
+# - "BPHYSICS", then uint32 type flags, uint32 point count and uint32 data types (one bit per BPHYS_DATA_* type)
+# - for every point, the values of each contained data type in the order of the BPHYS_DATA_* types
+# Cloth and softbody store their positions in world space.
+
+import bpy
+import numpy as np
+import os
+import re
+import struct
+
+from c0s_lewd_utilities.addon_utils.mesh.evaluated_geometry import EvaluatedPositionReader
+from c0s_lewd_utilities.addon_utils.mesh.modifier_stack import ModifierStackSplitter, copy_modifier
+
+
+physics_modifier_types = {'CLOTH', 'SOFT_BODY'}
+
+# modifiers that can come after the simulation modifier: their topology doesn't depend on the positions and they don't reference other objects
+trailing_modifier_types = {'SUBSURF', 'SMOOTH', 'LAPLACIANSMOOTH', 'SOLIDIFY'}
+
+# size in bytes of each BPHYS_DATA_* type: index, location, velocity, rotation, angular velocity (or xconst for cloth), size, times, boids
+_data_type_sizes = [4, 12, 12, 16, 12, 4, 12, 20]
+_data_type_location = 1
+_data_type_boids = 7
+_typeflag_compress = 1 << 16
+_header_size = 20
+
+
+def get_physics_modifier(obj):
+    """The last enabled cloth or softbody modifier of the object, or None if there isn't any."""
+    for modifier in reversed(obj.modifiers):
+        if modifier.show_viewport == True and modifier.type in physics_modifier_types:
+            return modifier
+    return None
+
+
+def get_trailing_modifiers(obj, modifier) -> list:
+    """The enabled modifiers after the given one."""
+    names = [modifier_other.name for modifier_other in obj.modifiers]
+    return [modifier_other for modifier_other in obj.modifiers[names.index(modifier.name) + 1:] if modifier_other.show_viewport == True]
+
+
+def _is_modifier_animated(obj, modifier) -> bool:
+    if obj.animation_data == None:
+        return False
+    data_path_prefix = 'modifiers["' + bpy.utils.escape_identifier(modifier.name) + '"]'
+    fcurves = list(obj.animation_data.drivers)
+    if obj.animation_data.action != None:
+        fcurves += list(obj.animation_data.action.fcurves)
+    return any(fcurve.data_path.startswith(data_path_prefix) for fcurve in fcurves)
+
+
+def _get_trailing_modifier_problem(obj, modifiers) -> str:
+    for modifier in modifiers:
+        if modifier.type not in trailing_modifier_types:
+            return "its " + modifier.name + " modifier comes after the simulation and isn't supported there"
+        if _is_modifier_animated(obj=obj, modifier=modifier) == True:
+            return "its " + modifier.name + " modifier comes after the simulation and is animated"
+    if len(modifiers) != 0 and _has_static_transforms(obj) == False:
+        # the modifiers work in local space, moving the cache there would need the transforms of every frame
+        return "its transforms are animated and modifiers come after the simulation"
+    return None
+
+
+def _create_input_mesh(context, obj, modifier) -> bpy.types.Mesh:
+    """New mesh with the evaluated shape of the object as it goes into the given modifier (at the current frame)."""
+    splitter = ModifierStackSplitter(obj=obj, modifier_name=modifier.name)
+    splitter.disable()
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        depsgraph.update()
+        return bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph), preserve_all_data_layers=True, depsgraph=depsgraph)
+    finally:
+        splitter.restore()
+        context.evaluated_depsgraph_get().update()
+
+
+def _get_cache_directory(point_cache) -> str:
+    if point_cache.use_external == True:
+        return bpy.path.abspath(point_cache.filepath)
+    if bpy.data.filepath == "":
+        # unsaved files keep their disk caches in a session temp folder that we can't know
+        return None
+    blend_dir, blend_name = os.path.split(bpy.data.filepath)
+    return os.path.join(blend_dir, "blendcache_" + os.path.splitext(blend_name)[0])
+
+
+def _get_cache_file_prefix(obj, point_cache) -> str:
+    if point_cache.name != "" or point_cache.use_external == True:
+        return point_cache.name
+    # without a name, Blender uses the object name with every byte written as hex (as a signed char, like in C)
+    return "".join("%02X" % (byte if byte < 128 else (byte - 256) & 0xFFFFFFFF) for byte in obj.name.encode("utf-8"))
+
+
+def find_cache_files(obj, point_cache) -> dict:
+    """The .bphys files of a point cache, {frame: path}. Empty if there are none."""
+    directory = _get_cache_directory(point_cache)
+    if directory == None or os.path.isdir(directory) == False:
+        return dict()
+    pattern = re.compile(re.escape(_get_cache_file_prefix(obj=obj, point_cache=point_cache)) + r"_(\d{6})(?:_(\d{2}))?\.bphys$")
+    files_per_index = dict()
+    for file_name in os.listdir(directory):
+        match = pattern.match(file_name)
+        if match == None:
+            continue
+        index = int(match.group(2)) if match.group(2) != None else -1
+        files_per_index.setdefault(index, dict())[int(match.group(1))] = os.path.join(directory, file_name)
+    if point_cache.index in files_per_index:
+        return files_per_index[point_cache.index]
+    if len(files_per_index) == 1:
+        return list(files_per_index.values())[0]
+    # several caches with the same name and none of them matches the index
+    return dict()
+
+
+def read_bphys_header(filepath) -> tuple:
+    """Reads the header of a .bphys file.
+
+    Returns
+    -------
+    tuple (int, int, int)
+        Type flags, point count and data types
+    """
+    with open(filepath, "rb") as file:
+        header = file.read(_header_size)
+    if len(header) != _header_size or header[:8] != b"BPHYSICS":
+        raise Exception(filepath + " isn't a point cache file")
+    return struct.unpack("<III", header[8:])
+
+
+def read_bphys_positions(filepath) -> np.ndarray:
+    """Reads the positions of all points from an uncompressed .bphys file.
+
+    Returns
+    -------
+    np.ndarray
+        float32 array with the shape (point_count, 3)
+    """
+    typeflag, point_count, data_types = read_bphys_header(filepath)
+    if typeflag & _typeflag_compress != 0:
+        raise Exception(filepath + " is compressed")
+    if data_types & (1 << _data_type_location) == 0 or data_types & (1 << _data_type_boids) != 0:
+        raise Exception(filepath + " has unsupported data types (" + str(data_types) + ")")
+    sizes = [size for data_type, size in enumerate(_data_type_sizes) if data_types & (1 << data_type) != 0]
+    offset = sum(size for data_type, size in enumerate(_data_type_sizes[:_data_type_location]) if data_types & (1 << data_type) != 0)
+    # the values of each point are interleaved, a structured dtype picks the positions out of them without a Python loop
+    point_dtype = np.dtype({"names": ["co"], "formats": [("<f4", 3)], "offsets": [offset], "itemsize": sum(sizes)})
+    with open(filepath, "rb") as file:
+        file.seek(_header_size)
+        points = np.fromfile(file, dtype=point_dtype, count=point_count)
+    if len(points) != point_count:
+        raise Exception(filepath + " is incomplete")
+    return points["co"].astype(np.float32)
+
+
+def _has_static_transforms(obj) -> bool:
+    return obj.animation_data == None and obj.parent == None and len(obj.constraints) == 0
+
+
+def get_direct_read_problem(context, obj, frames, apply_transforms, vertex_count) -> str:
+    """Reason why the frames of an object can't be read directly from its simulation cache, or None if they can.
+
+    Parameters
+    ----------
+    context : bpy.types.Context
+        Your current context
+    obj : bpy.types.Object
+        Object with the animation
+    frames : list of int
+        Frames to read
+    apply_transforms : bool
+        See iterate_cached_frames()
+    vertex_count : int
+        Amount of vertices of the evaluated object
+    """
+    modifier = get_physics_modifier(obj)
+    if modifier == None:
+        return "it has no enabled cloth or softbody modifier"
+    modifiers_trailing = get_trailing_modifiers(obj=obj, modifier=modifier)
+    problem = _get_trailing_modifier_problem(obj=obj, modifiers=modifiers_trailing)
+    if problem != None:
+        return problem
+    point_cache = modifier.point_cache
+    if point_cache.is_baked == False or point_cache.use_disk_cache == False:
+        return "its " + modifier.name + " cache isn't baked to the disk"
+    if point_cache.compression != 'NO':
+        return "its " + modifier.name + " cache is compressed"
+    if apply_transforms == False and _has_static_transforms(obj) == False:
+        # the cache is in world space, undoing animated transforms would need them for every frame
+        return "its transforms are animated and Apply Transforms is disabled"
+    files = find_cache_files(obj=obj, point_cache=point_cache)
+    frames_missing = [frame for frame in frames if frame not in files]
+    if len(frames_missing) != 0:
+        return "its " + modifier.name + " cache has no file for frame " + str(frames_missing[0])
+    if len(frames) != 0:
+        typeflag, point_count, data_types = read_bphys_header(files[frames[0]])
+        if len(modifiers_trailing) != 0:
+            # the cache has the points of the mesh that goes into the simulation, not of the final one
+            mesh_input = _create_input_mesh(context=context, obj=obj, modifier=modifier)
+            vertex_count = len(mesh_input.vertices)
+            bpy.data.meshes.remove(mesh_input)
+        if point_count != vertex_count:
+            return "its " + modifier.name + " cache has " + str(point_count) + " points instead of " + str(vertex_count)
+    return None
+
+
+class TrailingModifierStack():
+    """Evaluates the modifiers after the simulation modifier of an object on top of positions read from its cache.
+
+    Steps:
+    - create(): creates a temporary scene with a temporary object that has the mesh going into the simulation modifier
+      and copies of the modifiers after it
+    - evaluate(): replaces the vertices of that mesh and returns the evaluated positions, as often as you want
+    - remove(): deletes everything again, always call it (e.g. in a finally block)
+    """
+
+    context: bpy.types.Context
+    obj: bpy.types.Object
+    modifier: bpy.types.Modifier
+    scene: bpy.types.Scene
+    obj_temp: bpy.types.Object
+    __reader: EvaluatedPositionReader
+
+    def __init__(self, context, obj, modifier):
+        """Evaluates the modifiers after the simulation modifier of an object on top of positions read from its cache.
+
+        Parameters
+        ----------
+        context : bpy.types.Context
+            Your current context
+        obj : bpy.types.Object
+            Object with the simulation
+        modifier : bpy.types.Modifier
+            The simulation modifier, see get_physics_modifier()
+        """
+        self.context = context
+        self.obj = obj
+        self.modifier = modifier
+        self.scene = None
+        self.obj_temp = None
+        self.__reader = None
+
+    def create(self) -> None:
+        mesh = _create_input_mesh(context=self.context, obj=self.obj, modifier=self.modifier)
+        self.obj_temp = bpy.data.objects.new("c0_trailing_modifiers", mesh)
+        # the deform weights of the mesh use the indices of the vertex groups
+        for vertex_group in self.obj.vertex_groups:
+            self.obj_temp.vertex_groups.new(name=vertex_group.name)
+        for modifier in get_trailing_modifiers(obj=self.obj, modifier=self.modifier):
+            copy_modifier(modifier=modifier, obj_to=self.obj_temp)
+        self.scene = bpy.data.scenes.new("c0_trailing_modifiers")
+        self.scene.collection.objects.link(self.obj_temp)
+        self.__reader = EvaluatedPositionReader(obj=self.obj_temp, apply_transforms=False)
+
+    def evaluate(self, positions) -> np.ndarray:
+        """The positions after the modifiers, in the same space as the given ones.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            float32 array with the shape (vertex count of the mesh going into the simulation modifier, 3), in local space
+
+        Returns
+        -------
+        np.ndarray
+            float32 array with the shape (vertex_count, 3). It's the same array for every call, so copy it if you want to keep the values.
+        """
+        mesh = self.obj_temp.data
+        mesh.vertices.foreach_set("co", positions.ravel())
+        mesh.update()
+        view_layer = self.scene.view_layers[0]
+        view_layer.update()
+        return self.__reader.read(depsgraph=view_layer.depsgraph)
+
+    def remove(self) -> None:
+        """Can be called more than once."""
+        if self.scene != None:
+            bpy.data.scenes.remove(self.scene)
+            self.scene = None
+        if self.obj_temp != None:
+            mesh = self.obj_temp.data
+            bpy.data.objects.remove(self.obj_temp)
+            bpy.data.meshes.remove(mesh)
+            self.obj_temp = None
+
+
+def iterate_cached_frames(context, obj, frames, apply_transforms=True):
+    """Same as iterate_evaluated_frames() (see frame_stream.py), but the positions are read from the cloth / softbody cache files
+    of the object instead of evaluating the scene. Modifiers after the simulation modifier get evaluated on top (see TrailingModifierStack).
+    Check get_direct_read_problem() before.
+
+    Parameters
+    ----------
+    context : bpy.types.Context
+        Your current context
+    obj : bpy.types.Object
+        Object with the baked simulation
+    frames : iterable of int
+        Frames to read
+    apply_transforms : bool
+        If False, the world space positions of the cache get moved into the local space of the object
+
+    Yields
+    ------
+    tuple (int, np.ndarray)
+        The frame and a float32 array with the shape (vertex_count, 3)
+    """
+    modifier = get_physics_modifier(obj)
+    files = find_cache_files(obj=obj, point_cache=modifier.point_cache)
+    if len(get_trailing_modifiers(obj=obj, modifier=modifier)) == 0:
+        matrix_inverse = None
+        if apply_transforms == False:
+            matrix_inverse = np.array(obj.matrix_world.inverted(), dtype=np.float32)
+        for frame in frames:
+            positions = read_bphys_positions(files[frame])
+            if matrix_inverse is not None:
+                positions = positions @ matrix_inverse[:3, :3].T + matrix_inverse[:3, 3]
+            yield (frame, positions)
+        return
+
+    # the transforms are static in this case (see get_direct_read_problem()), so one matrix works for every frame
+    matrix = np.array(obj.matrix_world, dtype=np.float32)
+    matrix_inverse = np.array(obj.matrix_world.inverted(), dtype=np.float32)
+    stack = TrailingModifierStack(context=context, obj=obj, modifier=modifier)
+    try:
+        stack.create()
+        for frame in frames:
+            positions = read_bphys_positions(files[frame])
+            positions = stack.evaluate(positions=positions @ matrix_inverse[:3, :3].T + matrix_inverse[:3, 3])
+            if apply_transforms == True:
+                positions = positions @ matrix[:3, :3].T + matrix[:3, 3]
+            yield (frame, positions)
+    finally:
+        stack.remove()
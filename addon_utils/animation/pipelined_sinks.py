@@ -0,0 +1,166 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+# Evaluating frames has to happen on the main thread, but many sinks only do NumPy work or write files (see FrameSink.is_thread_safe).
+# A PipelinedSink hands the frames of such a sink to a background thread through a bounded queue,
+# so the main thread can already evaluate the next frame while the previous one is still being processed.
+# NumPy and file writes release the GIL, so both really run at the same time.
+
+import queue
+import threading
+import time
+import numpy as np
+
+from c0s_lewd_utilities.addon_utils.animation.frame_sinks import FrameSink
+
+
+class PipelinedSink(FrameSink):
+    """Calls add_frame() of another sink on a background thread, the frames are passed through a bounded queue in order.
+
+    The main thread only has to wait (stall) if the queue is full, meaning the sink is slower than the evaluation.
+    The numbers for tuning the queue size are collected while converting:
+    - max_queue_depth / get_average_queue_depth(): how many frames were waiting for the sink
+    - producer_stall_seconds: time the main thread waited for a free slot, the sink is the bottleneck if this is big
+    - consumer_idle_seconds: time the thread waited for new frames, the evaluation is the bottleneck if this is big
+    """
+
+    sink: FrameSink
+    queue_size: int
+    frames_queued: int
+    max_queue_depth: int
+    producer_stall_seconds: float
+    consumer_idle_seconds: float
+    __queue_depth_sum: int
+    __frames: queue.Queue
+    __free_buffers: queue.Queue
+    __thread: threading.Thread
+    __exception: BaseException
+
+    def __init__(self, sink, queue_size=8):
+        """Calls add_frame() of another sink on a background thread.
+
+        Parameters
+        ----------
+        sink : FrameSink
+            Sink whose is_thread_safe is True
+        queue_size : int
+            Maximum amount of frames waiting for the sink. Each one needs a buffer of vertex_count * 12 bytes.
+        """
+        self.sink = sink
+        self.queue_size = max(1, queue_size)
+        self.frames_queued = 0
+        self.max_queue_depth = 0
+        self.producer_stall_seconds = 0.0
+        self.consumer_idle_seconds = 0.0
+        self.__queue_depth_sum = 0
+        self.__frames = None
+        self.__free_buffers = None
+        self.__thread = None
+        self.__exception = None
+
+    def start(self, frames, vertex_count):
+        self.sink.start(frames=frames, vertex_count=vertex_count)
+        self.__frames = queue.Queue(maxsize=self.queue_size)
+        self.__free_buffers = queue.Queue()
+        # the positions given to add_frame() get overwritten by the next frame, so each queued frame needs its own copy.
+        # One more buffer than queue slots, for the frame the thread is working on.
+        for index in range(self.queue_size + 1):
+            self.__free_buffers.put(np.empty((vertex_count, 3), dtype=np.float32))
+        self.__thread = threading.Thread(target=self.__process_frames, name="c0_pipelined_sink", daemon=True)
+        self.__thread.start()
+
+    def __process_frames(self) -> None:
+        while True:
+            time_start = time.perf_counter()
+            item = self.__frames.get()
+            self.consumer_idle_seconds += time.perf_counter() - time_start
+            if item == None:
+                return
+            frame, buffer = item
+            if self.__exception == None:
+                try:
+                    self.sink.add_frame(frame=frame, positions=buffer)
+                except BaseException as exception:
+                    # raised on the main thread later, the remaining frames are only taken out of the queue so it doesn't block
+                    self.__exception = exception
+            self.__free_buffers.put(buffer)
+
+    def __raise_exception(self) -> None:
+        if self.__exception != None:
+            raise self.__exception
+
+    def add_frame(self, frame, positions):
+        self.__raise_exception()
+        time_start = time.perf_counter()
+        buffer = self.__free_buffers.get()
+        self.producer_stall_seconds += time.perf_counter() - time_start
+        np.copyto(buffer, positions)
+        queue_depth = min(self.__frames.qsize() + 1, self.queue_size)
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+        self.__queue_depth_sum += queue_depth
+        self.__frames.put((frame, buffer))
+        self.frames_queued += 1
+
+    def __stop_thread(self) -> None:
+        if self.__thread != None:
+            # waits until all queued frames are processed
+            self.__frames.put(None)
+            self.__thread.join()
+            self.__thread = None
+        self.__free_buffers = None
+
+    def finish(self):
+        self.__stop_thread()
+        try:
+            self.__raise_exception()
+        except BaseException:
+            # the sink still has to release its files
+            self.sink.close()
+            raise
+        self.sink.finish()
+
+    def close(self):
+        self.__stop_thread()
+        self.sink.close()
+
+    def get_average_queue_depth(self) -> float:
+        """Average amount of frames in the queue (including the new one) whenever a frame was added."""
+        if self.frames_queued == 0:
+            return 0.0
+        return self.__queue_depth_sum / self.frames_queued
+
+
+def pipeline_thread_safe_sinks(sinks, queue_size=8) -> list:
+    """Wraps every sink whose is_thread_safe is True in a PipelinedSink, the others are returned as they are.
+
+    Parameters
+    ----------
+    sinks : list of FrameSink
+        Sinks for a frame feeder
+    queue_size : int
+        See PipelinedSink
+
+    Returns
+    -------
+    list of FrameSink
+        Same order as the given sinks
+    """
+    return [PipelinedSink(sink=sink, queue_size=queue_size) if sink.is_thread_safe == True else sink for sink in sinks]
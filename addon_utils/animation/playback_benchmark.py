@@ -0,0 +1,312 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Measures how fast baked objects play back, so the different output modes of the animation converter can be compared.
+# Only the depsgraph evaluation is timed (scene.frame_set()), not the drawing in the viewport.
+#
+# run_benchmark() additionally generates baked objects with increasing vertex and frame counts on its own and writes
+# frames per second and peak memory of each one into a JSON file. Every case runs in its own background Blender process
+# (see playback_benchmark_script.py), so the peak memory of one case doesn't hide the one of the next.
+
+import bpy
+import json
+import math
+import numpy as np
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    # doesn't exist on Windows
+    resource = None
+
+from c0s_lewd_utilities.addon_utils.animation.frame_sinks import ShapekeySink
+from c0s_lewd_utilities.addon_utils.animation.frame_stream import feed_frames_to_sinks
+from c0s_lewd_utilities.addon_utils.animation.point_cache_sinks import Pc2FileSink
+from c0s_lewd_utilities.addon_utils.animation.texture_sinks import VertexAnimationTextureSink
+from c0s_lewd_utilities.addon_utils.animation.geometry_nodes_playback import FrameTableSink
+from c0s_lewd_utilities.toolbox_1_0_0 import create_real_mesh
+
+
+_benchmark_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "playback_benchmark_script.py")
+
+# the output modes of the animation converter, plus "LIVE" (the unbaked animation, a Wave modifier) for reference
+benchmark_output_modes = ("LIVE", "SHAPEKEYS", "POINT_CACHE", "VAT", "GEOMETRY_NODES")
+
+
+def time_playback(scene, frame_start, frame_end, repetitions=1) -> float:
+    """Steps the scene over the frame range and measures how many frames per second could be evaluated.
+
+    The original frame of the scene is restored afterwards.
+
+    Parameters
+    ----------
+    scene : bpy.types.Scene
+        Scene to step through
+    frame_start : int
+        First frame
+    frame_end : int
+        Last frame
+    repetitions : int
+        How often to go over the whole frame range
+
+    Returns
+    -------
+    float
+        Evaluated frames per second
+    """
+    frame_orig = scene.frame_current
+    # the first evaluation after a change can be a lot slower, so it's not part of the measurement
+    scene.frame_set(frame_start)
+    frame_count = 0
+    time_start = time.perf_counter()
+    for repetition in range(repetitions):
+        for frame in range(frame_start, frame_end + 1):
+            scene.frame_set(frame)
+            frame_count += 1
+    seconds = time.perf_counter() - time_start
+    scene.frame_set(frame_orig)
+    if seconds == 0:
+        return 0.0
+    return frame_count / seconds
+
+
+def compare_playback(scene, objects, frame_start, frame_end, repetitions=1) -> dict:
+    """Measures the playback speed of each object on its own, with all other given objects hidden in the meantime.
+
+    Parameters
+    ----------
+    scene : bpy.types.Scene
+        Scene that contains the objects
+    objects : list of bpy.types.Object
+        Objects to compare, for example one with shapekeys and one with the Geometry Nodes playback.
+    frame_start : int
+        First frame
+    frame_end : int
+        Last frame
+    repetitions : int
+        How often to go over the whole frame range per object
+
+    Returns
+    -------
+    dict
+        {object name: frames per second}
+    """
+    hide_orig = {obj: obj.hide_viewport for obj in objects}
+    results = dict()
+    try:
+        for obj in objects:
+            # hidden objects aren't evaluated, so only the current one costs time
+            for other in objects:
+                other.hide_viewport = (other != obj)
+            results[obj.name] = time_playback(scene=scene, frame_start=frame_start, frame_end=frame_end, repetitions=repetitions)
+    finally:
+        for obj, hide in hide_orig.items():
+            obj.hide_viewport = hide
+    return results
+
+
+def get_peak_memory_bytes():
+    """Highest amount of memory this process has used so far, in bytes. None on systems without the resource module (Windows)."""
+    if resource == None:
+        return None
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS gives bytes, Linux kilobytes
+    if sys.platform == "darwin":
+        return peak_memory
+    return peak_memory * 1024
+
+
+def create_grid_object(context, vertex_count, name="benchmark_grid") -> bpy.types.Object:
+    """Creates a flat square grid of quads with at least vertex_count vertices (the next square number) and links it to the scene."""
+    side = max(2, math.ceil(math.sqrt(vertex_count)))
+    xs, ys = np.meshgrid(np.arange(side), np.arange(side))
+    coordinates = np.zeros((side * side, 3))
+    coordinates[:, 0] = xs.ravel() / (side - 1) * 2 - 1
+    coordinates[:, 1] = ys.ravel() / (side - 1) * 2 - 1
+    corners = (ys[:-1, :-1] * side + xs[:-1, :-1]).ravel()
+    faces = np.column_stack((corners, corners + 1, corners + side + 1, corners + side))
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(coordinates.tolist(), [], faces.tolist())
+    mesh.update()
+    return create_real_mesh.create_new_obj_for_mesh(context=context, name=name, mesh=mesh)
+
+
+def _iterate_wave_frames(positions_rest, frames):
+    """Yields (frame, positions) of a wave moving over the grid, instead of evaluating a real animation. The positions array is reused."""
+    positions = positions_rest.copy()
+    for frame in frames:
+        positions[:, 2] = 0.1 * np.sin(positions_rest[:, 0] * 6 + frame * 0.2)
+        yield (frame, positions)
+
+
+def create_benchmark_object(context, output_mode, vertex_count, frames, directory) -> list:
+    """Creates a grid object that plays back a wave animation the same way the animation converter would create it for the given output mode.
+
+    The frames are generated directly and given to the same sinks the converter uses, so no scene evaluation is needed for baking.\
+    Keep in mind that VAT only moves vertices in a shader, so its playback only costs as much as a static object here.
+
+    Parameters
+    ----------
+    context : bpy.types.Context
+        Objects get linked to the scene of this context
+    output_mode : str
+        One of benchmark_output_modes
+    vertex_count : int
+        Minimum amount of vertices, see create_grid_object()
+    frames : list of int
+        Frames to bake
+    directory : str
+        Folder for files (the point cache)
+
+    Returns
+    -------
+    list of bpy.types.Object
+        The baked object first, followed by helper objects (the frame table of GEOMETRY_NODES)
+    """
+    obj = create_grid_object(context=context, vertex_count=vertex_count, name="benchmark_" + output_mode.lower())
+    if output_mode == "LIVE":
+        obj.modifiers.new(name="Wave", type='WAVE')
+        return [obj]
+
+    positions_rest = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get("co", positions_rest)
+    positions_rest = positions_rest.reshape((-1, 3))
+    filepath = os.path.join(directory, obj.name + ".pc2")
+    if output_mode == "SHAPEKEYS":
+        obj.shape_key_add(name="Basis")
+        sink = ShapekeySink(obj=obj)
+    elif output_mode == "POINT_CACHE":
+        sink = Pc2FileSink(filepath=filepath)
+    elif output_mode == "VAT":
+        sink = VertexAnimationTextureSink(obj=obj)
+    elif output_mode == "GEOMETRY_NODES":
+        sink = FrameTableSink(context=context, obj=obj)
+    else:
+        raise ValueError("Unknown output mode: " + str(output_mode))
+    feed_frames_to_sinks(frame_iterator=_iterate_wave_frames(positions_rest=positions_rest, frames=frames), sinks=[sink], frames=frames)
+
+    if output_mode == "POINT_CACHE":
+        # how the point cache gets played back inside Blender
+        modifier = obj.modifiers.new(name="Mesh Cache", type='MESH_CACHE')
+        modifier.cache_format = 'PC2'
+        modifier.filepath = filepath
+        # the first sample of the file belongs to the first frame
+        modifier.frame_start = frames[0]
+    elif output_mode == "GEOMETRY_NODES":
+        return [obj, sink.obj_table]
+    return [obj]
+
+
+def run_benchmark_case(context, output_mode, vertex_count, frame_count, directory, repetitions=1) -> dict:
+    """Creates one baked object (see create_benchmark_object()) in the current scene and measures its playback speed.
+
+    Meant for an empty file, for example a background Blender started with --factory-startup. Nothing gets removed afterwards.
+
+    Returns
+    -------
+    dict
+        JSON-compatible result, peak_memory_bytes is the peak of the whole process (None on Windows)
+    """
+    frames = list(range(1, frame_count + 1))
+    time_start = time.perf_counter()
+    objs = create_benchmark_object(context=context, output_mode=output_mode, vertex_count=vertex_count, frames=frames, directory=directory)
+    bake_seconds = time.perf_counter() - time_start
+    frames_per_second = time_playback(scene=context.scene, frame_start=frames[0], frame_end=frames[-1], repetitions=repetitions)
+    return {"output_mode": output_mode,
+            "vertex_count": len(objs[0].data.vertices),
+            "frame_count": frame_count,
+            "repetitions": repetitions,
+            "bake_seconds": bake_seconds,
+            "frames_per_second": frames_per_second,
+            "peak_memory_bytes": get_peak_memory_bytes()}
+
+
+def write_results(results, filepath) -> None:
+    """Writes results of run_benchmark_case() into a JSON file, together with the Blender version and the platform."""
+    data = {"blender_version": bpy.app.version_string,
+            "platform": sys.platform,
+            "results": results}
+    with open(filepath, "w") as file:
+        json.dump(data, file, indent=4)
+
+
+def run_benchmark(filepath, vertex_counts=(1000, 10000, 100000), frame_counts=(50, 250, 1000), output_modes=benchmark_output_modes, repetitions=1) -> list:
+    """Runs run_benchmark_case() for every combination of vertex count, frame count and output mode, each in its own background Blender process.
+
+    The JSON file is written again after every case. A case that crashes or runs out of memory gets a result with "failed": True,
+    its exit code and the end of its output, and the remaining cases still run.
+
+    Parameters
+    ----------
+    filepath : str
+        JSON file to write the results into, see write_results()
+    vertex_counts : iterable of int
+        Vertex counts to test
+    frame_counts : iterable of int
+        Frame counts to test, each case plays back frames 1 to frame_count
+    output_modes : iterable of str
+        See benchmark_output_modes. GEOMETRY_NODES requires Blender 3.4+
+    repetitions : int
+        How often to play back the frame range per case
+
+    Returns
+    -------
+    list of dict
+        The results of all cases
+    """
+    results = []
+    for vertex_count in vertex_counts:
+        for frame_count in frame_counts:
+            for output_mode in output_modes:
+                print("Playback benchmark: " + output_mode + ", " + str(vertex_count) + " vertices, " + str(frame_count) + " frames")
+                case_dir = tempfile.mkdtemp(prefix="c0_playback_benchmark_")
+                try:
+                    result_path = os.path.join(case_dir, "result.json")
+                    command = [bpy.app.binary_path,
+                               "-b", "--factory-startup",
+                               "--python-exit-code", "1",
+                               "--python", _benchmark_script,
+                               "--",
+                               "--case", output_mode, str(vertex_count), str(frame_count), str(repetitions), result_path]
+                    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+                    if process.returncode == 0 and os.path.exists(result_path):
+                        with open(result_path, "r") as file:
+                            results.append(json.load(file))
+                    else:
+                        # e.g. out of memory, the bigger cases may still be interesting for the other output modes
+                        print("Playback benchmark: failed with exit code " + str(process.returncode))
+                        results.append({"output_mode": output_mode,
+                                        "vertex_count": vertex_count,
+                                        "frame_count": frame_count,
+                                        "repetitions": repetitions,
+                                        "failed": True,
+                                        "exit_code": process.returncode,
+                                        "output_end": process.stdout.decode(errors="replace")[-2000:]})
+                finally:
+                    # point caches of big cases can take up gigabytes
+                    shutil.rmtree(case_dir, ignore_errors=True)
+                write_results(results=results, filepath=filepath)
+    return results
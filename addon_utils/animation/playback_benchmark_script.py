@@ -0,0 +1,70 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+# Not a module to import. Runs the playback benchmark of playback_benchmark.py without a user interface:
+#   blender -b --factory-startup --python playback_benchmark_script.py -- results.json [vertex counts] [frame counts] [output modes] [repetitions]
+# Lists are comma separated, e.g. "1000,10000". Anything left out uses the defaults of run_benchmark().
+#
+# run_benchmark() itself starts this script again for every single case:
+#   ... -- --case output_mode vertex_count frame_count repetitions result.json
+
+import bpy
+import json
+import os
+import sys
+
+# the add-on doesn't have to be enabled (or even installed) in the background process
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from c0s_lewd_utilities.addon_utils.animation import playback_benchmark
+
+
+def main():
+    args = sys.argv[sys.argv.index("--") + 1:]
+    if args[0] == "--case":
+        output_mode = args[1]
+        vertex_count = int(args[2])
+        frame_count = int(args[3])
+        repetitions = int(args[4])
+        result_path = args[5]
+        result = playback_benchmark.run_benchmark_case(context=bpy.context,
+                                                       output_mode=output_mode,
+                                                       vertex_count=vertex_count,
+                                                       frame_count=frame_count,
+                                                       directory=os.path.dirname(result_path),
+                                                       repetitions=repetitions)
+        with open(result_path, "w") as file:
+            json.dump(result, file)
+        return
+
+    kwargs = dict()
+    if len(args) > 1 and args[1] != "":
+        kwargs["vertex_counts"] = [int(value) for value in args[1].split(",")]
+    if len(args) > 2 and args[2] != "":
+        kwargs["frame_counts"] = [int(value) for value in args[2].split(",")]
+    if len(args) > 3 and args[3] != "":
+        kwargs["output_modes"] = args[3].split(",")
+    if len(args) > 4 and args[4] != "":
+        kwargs["repetitions"] = int(args[4])
+    playback_benchmark.run_benchmark(filepath=os.path.abspath(args[0]), **kwargs)
+
+
+main()
@@ -0,0 +1,159 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Sinks that write the frames into standard point cache files that other programs (and Blender's Mesh Cache modifier) can read.
+# Frames are appended to the file as soon as they arrive, so memory usage doesn't depend on the amount of frames.
+
+import bpy
+import os
+import shutil
+import struct
+
+from c0s_lewd_utilities.addon_utils.animation.frame_sinks import FrameSink
+
+
+class PointCacheFileSink(FrameSink):
+    """Base class for the point cache sinks of this module. Takes care of opening the file and writing the frames."""
+
+    is_thread_safe = True
+
+    filepath: str
+    swap_yz: bool
+    frames_written: int
+    _frame_count: int
+    _vertex_count: int
+    _file: any
+    _byte_order: str
+
+    def __init__(self, filepath, swap_yz=False):
+        """Base class for the point cache sinks of this module. Takes care of opening the file and writing the frames.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the file, Blender-relative paths ("//...") are allowed. Existing files are overwritten.
+        swap_yz : bool
+            Swap the Y and Z axis, for programs where Y points up instead of Z.
+        """
+        self.filepath = bpy.path.abspath(filepath)
+        self.swap_yz = swap_yz
+        self.frames_written = 0
+        self._frame_count = 0
+        self._vertex_count = 0
+        self._file = None
+
+    def _write_header(self, frames) -> None:
+        raise NotImplementedError()
+
+    def _fix_header_after_cancel(self) -> None:
+        """Called by finish() if less frames were written than announced in start()."""
+        raise NotImplementedError()
+
+    def start(self, frames, vertex_count):
+        self._frame_count = len(frames)
+        self._vertex_count = vertex_count
+        self.frames_written = 0
+        self._file = open(self.filepath, "wb")
+        self._write_header(frames=frames)
+
+    def add_frame(self, frame, positions):
+        if self.swap_yz == True:
+            positions = positions[:, [0, 2, 1]]
+        # one bulk write per frame instead of struct.pack() for every single value
+        positions.astype(self._byte_order + "f4", copy=False).tofile(self._file)
+        self.frames_written += 1
+
+    def finish(self):
+        self._file.close()
+        self._file = None
+        if self.frames_written != self._frame_count:
+            self._fix_header_after_cancel()
+
+    def close(self):
+        if self._file == None:
+            return
+        self._file.close()
+        self._file = None
+        # the header still announces all frames, other programs would read garbage
+        try:
+            os.remove(self.filepath)
+        except OSError:
+            pass
+
+
+class Pc2FileSink(PointCacheFileSink):
+    """Writes the frames into a .pc2 file (little-endian float32, the header stores the amount of points and samples).
+
+    Header layout: "POINTCACHE2\\0", file version, point count, start frame, sample rate, sample count
+    """
+
+    _byte_order = "<"
+    __header_format = "<12siiffi"
+
+    def _write_header(self, frames):
+        self._file.write(struct.pack(self.__header_format, b"POINTCACHE2\0", 1, self._vertex_count, float(frames[0]), 1.0, self._frame_count))
+
+    def _fix_header_after_cancel(self):
+        # the sample count is the last value of the header
+        with open(self.filepath, "r+b") as file:
+            file.seek(struct.calcsize(self.__header_format) - 4)
+            file.write(struct.pack("<i", self.frames_written))
+
+
+class MddFileSink(PointCacheFileSink):
+    """Writes the frames into a .mdd file (big-endian float32).
+
+    Header layout: frame count, point count, the time of each frame in seconds
+    """
+
+    fps: float
+    _byte_order = ">"
+    __frame_times: list
+
+    def __init__(self, filepath, fps=24.0, swap_yz=False):
+        """Writes the frames into a .mdd file (big-endian float32).
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the file, Blender-relative paths ("//...") are allowed. Existing files are overwritten.
+        fps : float
+            Frames per second, needed for the time of each frame. Most likely scene.render.fps / scene.render.fps_base
+        swap_yz : bool
+            Swap the Y and Z axis, for programs where Y points up instead of Z (like Lightwave, where MDD files come from).
+        """
+        super().__init__(filepath=filepath, swap_yz=swap_yz)
+        self.fps = fps
+        self.__frame_times = []
+
+    def _write_header(self, frames):
+        self.__frame_times = [(frame - frames[0]) / self.fps for frame in frames]
+        self._file.write(struct.pack(">2i", self._frame_count, self._vertex_count))
+        self._file.write(struct.pack(">%df" % self._frame_count, *self.__frame_times))
+
+    def _fix_header_after_cancel(self):
+        # the frame times come before the positions, so the whole file needs to be rewritten with a shorter header
+        path_temp = self.filepath + ".tmp"
+        with open(self.filepath, "rb") as file_old, open(path_temp, "wb") as file_new:
+            file_old.seek(8 + 4 * self._frame_count)
+            file_new.write(struct.pack(">2i", self.frames_written, self._vertex_count))
+            file_new.write(struct.pack(">%df" % self.frames_written, *self.__frame_times[:self.frames_written]))
+            shutil.copyfileobj(file_old, file_new)
+        os.replace(path_temp, self.filepath)
@@ -0,0 +1,119 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+# Often only a small part of an object (e.g. the face) moves, while the rest stays the same during the whole animation.
+# A region of interest is the list of vertices that actually need to be baked, the rest can come from the basis.
+# After the evaluation, only the region is kept per frame (see iterate_region_frames()), so everything that copies,
+# compares or stores frames (checkpoints, deduplication, statistics) only handles the region.
+# RegionOfInterestSink in frame_sinks.py fills the rest back in for sinks that need whole frames, like shapekeys.
+
+import numpy as np
+
+
+def get_vertex_group_indices(obj, vertex_group_name, min_weight=0.0) -> np.ndarray:
+    """Indices of all vertices of the mesh of an object that are in the vertex group with a weight above min_weight.
+
+    Parameters
+    ----------
+    obj : bpy.types.Object
+        Object with a mesh, for example the one that gets the shapekeys
+    vertex_group_name : str
+        Name of the vertex group
+    min_weight : float
+        Vertices with this weight or less don't count
+
+    Returns
+    -------
+    np.ndarray
+        Sorted int array, empty if the vertex group doesn't exist
+    """
+    vertex_group = obj.vertex_groups.get(vertex_group_name)
+    mask = np.zeros(len(obj.data.vertices), dtype=np.bool_)
+    if vertex_group == None:
+        return np.flatnonzero(mask)
+    group_index = vertex_group.index
+    # weights can only be read vertex by vertex, but that's only done once
+    for vertex in obj.data.vertices:
+        for group_element in vertex.groups:
+            if group_element.group == group_index and group_element.weight > min_weight:
+                mask[vertex.index] = True
+                break
+    return np.flatnonzero(mask)
+
+
+def get_sample_frames(frames, sample_count) -> list:
+    """Up to sample_count frames evenly spread over the given frames, always including the first and last one."""
+    if len(frames) <= sample_count:
+        return list(frames)
+    rows = np.unique(np.linspace(0, len(frames) - 1, num=sample_count).round().astype(np.int64))
+    return [frames[row] for row in rows]
+
+
+def get_moving_vertex_indices(frame_iterator, basis_positions, threshold) -> np.ndarray:
+    """Indices of all vertices that are further away than threshold from their basis position in at least one frame.
+
+    Parameters
+    ----------
+    frame_iterator : iterable of (int, np.ndarray)
+        Frames to check, for example iterate_evaluated_frames() (see frame_stream.py) over get_sample_frames().
+        Vertices that only move between the checked frames are missed, so use enough of them.
+    basis_positions : np.ndarray
+        float32 array with the shape (vertex_count, 3), in the same space as the frames
+    threshold : float
+        Movement up to this distance doesn't count
+
+    Returns
+    -------
+    np.ndarray
+        Sorted int array
+    """
+    mask = np.zeros(len(basis_positions), dtype=np.bool_)
+    threshold_squared = threshold ** 2
+    for frame, positions in frame_iterator:
+        mask |= np.square(positions - basis_positions).sum(axis=1) > threshold_squared
+    return np.flatnonzero(mask)
+
+
+def iterate_region_frames(frame_iterator, vertex_indices):
+    """Generator that only keeps the vertices of the region of every frame.
+
+    Parameters
+    ----------
+    frame_iterator : iterable of (int, np.ndarray)
+        Whole frames, for example from iterate_evaluated_frames() (see frame_stream.py)
+    vertex_indices : np.ndarray
+        Sorted int array with the vertices of the region
+
+    Yields
+    ------
+    tuple (int, np.ndarray)
+        The frame and a float32 array with the shape (len(vertex_indices), 3).\\
+        The array is the same buffer for every frame, so copy it if you want to keep it.
+    """
+    buffer = np.empty((len(vertex_indices), 3), dtype=np.float32)
+    try:
+        for frame, positions in frame_iterator:
+            # fancy indexing into a preallocated buffer, the copy only scales with the size of the region
+            np.take(positions, vertex_indices, axis=0, out=buffer)
+            yield (frame, buffer)
+    finally:
+        if hasattr(frame_iterator, "close"):
+            frame_iterator.close()
@@ -0,0 +1,261 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Sinks that turn an animation into fewer shapekeys than one per frame.
+
+import numpy as np
+
+from c0s_lewd_utilities.addon_utils.animation.frame_sinks import ShapekeySink
+
+
+class PcaShapekeySink(ShapekeySink):
+    """Instead of one shapekey per frame, creates a few "basis" shapekeys (principal components of all frames) whose values are keyframed
+    so that mixing them results in the shape of each frame.
+
+    Most animations only move in a small amount of "directions", so K basis shapekeys can replace hundreds of frame shapekeys
+    while staying within a given error.
+
+    Attention: All frames need to be kept in memory until finish(), since the basis can only be calculated once every frame is known.
+    """
+
+    # the shapekeys are only created in finish()
+    is_thread_safe = True
+
+    max_error: float
+    max_components: int
+    component_count: int
+    max_error_result: float
+    __frames: list
+    __data: np.ndarray
+    __row: int
+    __key_frames_per_data_path: dict
+
+    def __init__(self, obj, max_error=0.001, max_components=None, name_prefix="pca_", interpolation="LINEAR"):
+        """Instead of one shapekey per frame, creates a few "basis" shapekeys (principal components of all frames) whose values are keyframed
+        so that mixing them results in the shape of each frame.
+
+        Parameters
+        ----------
+        obj : bpy.types.Object
+            Object that gets the shapekeys. Needs to have a Basis shapekey already and the same amount of vertices as the frames.
+        max_error : float
+            The smallest amount of basis shapekeys is used so that no vertex in any frame is further away than this distance from its real position.
+        max_components : None or int
+            Upper limit for the amount of basis shapekeys, even if max_error isn't reached yet.
+        name_prefix : str
+            The shapekeys get named name_prefix + "mean" and name_prefix + number.
+        interpolation : str
+            Interpolation of the created keyframes, see keyframe_helper.interpolation_values
+        """
+        super().__init__(obj=obj, name_prefix=name_prefix, interpolation=interpolation)
+        self.max_error = max_error
+        self.max_components = max_components
+        self.component_count = 0
+        self.max_error_result = 0.0
+        self.__frames = []
+        self.__data = None
+        self.__row = 0
+        self.__key_frames_per_data_path = dict()
+
+    def start(self, frames, vertex_count):
+        self.__data = np.empty((len(frames), vertex_count * 3), dtype=np.float32)
+        self.__row = 0
+
+    def add_frame(self, frame, positions):
+        self.__data[self.__row] = positions.ravel()
+        self.__frames.append(frame)
+        self.__row += 1
+
+    @classmethod
+    def get_max_vertex_error(clss, residual) -> float:
+        """Biggest distance any vertex in any frame has from its real position.
+
+        Parameters
+        ----------
+        residual : np.ndarray
+            Difference between the real and the reconstructed frames, shape (frame_count, vertex_count * 3)
+
+        Returns
+        -------
+        float
+        """
+        if residual.size == 0:
+            return 0.0
+        squared_distances = np.square(residual.reshape(residual.shape[0], -1, 3)).sum(axis=2)
+        return float(np.sqrt(squared_distances.max()))
+
+    def _calculate_basis(self, data) -> tuple:
+        """Returns (mean, weights, components), where data ≈ mean + weights @ components"""
+        mean = data.mean(axis=0)
+        residual = data - mean
+        u, s, vt = np.linalg.svd(residual, full_matrices=False)
+        limit = len(s)
+        if self.max_components != None:
+            limit = min(limit, self.max_components)
+
+        def get_error(component_count) -> float:
+            # the error with the first component_count components, reconstructed in one go instead of component by component
+            return self.get_max_vertex_error(residual=residual - (u[:, :component_count] * s[:component_count]) @ vt[:component_count])
+
+        # binary search for the smallest amount of components that gets every vertex close enough.
+        # The error practically always shrinks with more components, and the result is checked either way.
+        errors = {limit: get_error(limit)}
+        if errors[limit] <= self.max_error:
+            low = 0
+            high = limit
+            while low < high:
+                middle = (low + high) // 2
+                errors[middle] = get_error(middle)
+                if errors[middle] <= self.max_error:
+                    high = middle
+                else:
+                    low = middle + 1
+            component_count = high
+        else:
+            component_count = limit
+        self.max_error_result = errors[component_count]
+        self.component_count = component_count
+        # the weights (columns of u) are always between -1 and 1, so the size goes into the components
+        components = vt[:component_count] * s[:component_count, np.newaxis]
+        return (mean, u[:, :component_count], components)
+
+    def finish(self):
+        if self.__row == 0:
+            return
+        data = self.__data[:self.__row]
+        frames = self.__frames
+        mean, weights, components = self._calculate_basis(data=data)
+        self.__data = None
+
+        frame_first = frames[0]
+        frame_last = frames[-1]
+        basis_co = np.empty(data.shape[1], dtype=np.float32)
+        self.obj.data.shape_keys.reference_key.data.foreach_get("co", basis_co)
+
+        # the mean shape is active for the whole animation, the components get added on top of it
+        shapekey_mean = self._add_shapekey(frame="mean", positions=mean)
+        self.__key_frames_per_data_path[shapekey_mean.path_from_id() + ".value"] = self.get_frame_span_key_values(frame_first=frame_first, frame_last=frame_last)
+        for index in range(self.component_count):
+            # shapekeys are relative to the basis, so the component needs to be added to the basis coordinates
+            shapekey_component = self._add_shapekey(frame=index, positions=basis_co + components[index])
+            shapekey_component.slider_min = -1
+            shapekey_component.slider_max = 1
+            values = [frame_first - 1, 0]
+            for frame, weight in zip(frames, weights[:, index].tolist()):
+                values.extend((frame, weight))
+            values.extend((frame_last + 1, 0))
+            self.__key_frames_per_data_path[shapekey_component.path_from_id() + ".value"] = values
+        super().finish()
+
+    def _get_key_frames_per_data_path(self) -> dict:
+        return self.__key_frames_per_data_path
+
+
+class AdaptiveShapekeySink(ShapekeySink):
+    """Only keeps a frame as a shapekey if the frames around it can't be recreated by linearly blending between the kept shapekeys.
+
+    Kept shapekeys are keyframed to crossfade into their neighbours (see ShapekeySink.get_crossfade_key_values()),
+    so smooth motion only needs a fraction of the shapekeys.\\
+    Only the frames since the last kept shapekey are kept in memory.
+    """
+
+    max_error: float
+    kept_frames: list
+    __keyframe_positions: np.ndarray
+    __pending_frames: list
+    __pending_positions: np.ndarray
+
+    def __init__(self, obj, max_error=0.001, name_prefix="frame_"):
+        """Only keeps a frame as a shapekey if the frames around it can't be recreated by linearly blending between the kept shapekeys.
+
+        Parameters
+        ----------
+        obj : bpy.types.Object
+            Object that gets the shapekeys. Needs to have a Basis shapekey already and the same amount of vertices as the frames.
+        max_error : float
+            A frame can be skipped if none of its vertices is further away than this distance from the blended position.
+        name_prefix : str
+            Shapekeys get named name_prefix + frame.
+        """
+        # crossfading only works with linear interpolation
+        super().__init__(obj=obj, name_prefix=name_prefix, interpolation="LINEAR")
+        self.max_error = max_error
+        self.kept_frames = []
+        self.__keyframe_positions = None
+        self.__pending_frames = []
+        self.__pending_positions = None
+
+    def start(self, frames, vertex_count):
+        self.__keyframe_positions = np.empty((vertex_count, 3), dtype=np.float32)
+        self.__pending_positions = np.empty((16, vertex_count, 3), dtype=np.float32)
+
+    def __append_pending(self, frame, positions):
+        count = len(self.__pending_frames)
+        if count == len(self.__pending_positions):
+            grown = np.empty((count * 2,) + self.__pending_positions.shape[1:], dtype=np.float32)
+            grown[:count] = self.__pending_positions
+            self.__pending_positions = grown
+        self.__pending_positions[count] = positions
+        self.__pending_frames.append(frame)
+
+    def __keep_frame(self, frame, positions):
+        self._add_shapekey(frame=frame, positions=positions)
+        self.kept_frames.append(frame)
+        self.__keyframe_positions[:] = positions
+
+    def _can_skip_pending_frames(self, frame, positions) -> bool:
+        """Can all pending frames be recreated by blending between the last kept shapekey and the new frame?"""
+        count = len(self.__pending_frames)
+        frame_kept = self.kept_frames[-1]
+        factors = (np.array(self.__pending_frames, dtype=np.float32) - frame_kept) / (frame - frame_kept)
+        blended = self.__keyframe_positions + factors[:, np.newaxis, np.newaxis] * (positions - self.__keyframe_positions)
+        squared_distances = np.square(self.__pending_positions[:count] - blended).sum(axis=2)
+        return bool(squared_distances.max() <= self.max_error ** 2)
+
+    def add_frame(self, frame, positions):
+        if len(self.kept_frames) == 0:
+            self.__keep_frame(frame=frame, positions=positions)
+            return
+        if len(self.__pending_frames) != 0 and self._can_skip_pending_frames(frame=frame, positions=positions) == False:
+            # the frame before this one is the furthest we can blend to, so it needs its own shapekey
+            last_index = len(self.__pending_frames) - 1
+            self.__keep_frame(frame=self.__pending_frames[last_index], positions=self.__pending_positions[last_index])
+            self.__pending_frames = []
+        self.__append_pending(frame=frame, positions=positions)
+
+    def finish(self):
+        if len(self.__pending_frames) != 0:
+            # the last frame is always kept
+            last_index = len(self.__pending_frames) - 1
+            self.__keep_frame(frame=self.__pending_frames[last_index], positions=self.__pending_positions[last_index])
+            self.__pending_frames = []
+        self.__pending_positions = None
+        super().finish()
+
+    def _get_key_frames_per_data_path(self) -> dict:
+        key_frames_per_data_path = dict()
+        kept_frames = self.kept_frames
+        for index, shapekey in enumerate(self.created_shapekeys):
+            frame = kept_frames[index]
+            frame_before = kept_frames[index - 1] if index > 0 else frame - 1
+            frame_after = kept_frames[index + 1] if index < len(kept_frames) - 1 else frame + 1
+            key_frames_per_data_path[shapekey.path_from_id() + ".value"] = self.get_crossfade_key_values(
+                frame=frame, frame_before=frame_before, frame_after=frame_after)
+        return key_frames_per_data_path
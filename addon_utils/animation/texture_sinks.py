@@ -0,0 +1,140 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Sinks that store the frames in images, for game engines and other real-time stuff.
+
+import bpy
+import numpy as np
+
+from c0s_lewd_utilities.addon_utils.animation.frame_sinks import FrameSink
+
+
+class VertexAnimationTextureSink(FrameSink):
+    """Stores the frames as a vertex animation texture (VAT): a float image with one row per frame and one pixel per vertex,
+    where the RGB values of a pixel are the XYZ offset of the vertex from its rest position.
+
+    The object additionally gets a UV map that points each vertex to its own column in the image, so a shader can look up
+    the offset with that UV map and the current frame as the V coordinate.
+
+    Row 0 (the bottom row, Blender images start at the bottom left) is the first frame.\\
+    Keep in mind that many GPUs don't support textures wider than 16384 pixels, which limits the amount of vertices.
+    """
+
+    is_thread_safe = True
+
+    obj: bpy.types.Object
+    image_name: str
+    uv_map_name: str
+    normalize: bool
+    image: bpy.types.Image
+    offset_min: float
+    offset_max: float
+    frames_written: int
+    __rest_positions: np.ndarray
+    __pixels: np.ndarray
+    __row_of_frame: dict
+    __frames: list
+
+    def __init__(self, obj, image_name=None, uv_map_name="VAT", normalize=True):
+        """Stores the frames as a vertex animation texture (VAT).
+
+        Parameters
+        ----------
+        obj : bpy.types.Object
+            Object whose (current) vertex positions are the rest positions. Gets the UV map. Needs the same amount of vertices as the frames.
+        image_name : None or str
+            Name of the created image, if None it's obj.name + "_VAT"
+        uv_map_name : str
+            Name of the created UV map. An already existing UV map with that name is overwritten.
+        normalize : bool
+            If True, offsets are remapped from offset_min...offset_max to 0...1 (same range for all axes), so the image could also be saved in non-float formats.
+            The range is stored as custom properties of the image.
+        """
+        self.obj = obj
+        if image_name == None:
+            image_name = obj.name + "_VAT"
+        self.image_name = image_name
+        self.uv_map_name = uv_map_name
+        self.normalize = normalize
+        self.image = None
+        self.offset_min = 0.0
+        self.offset_max = 0.0
+        self.frames_written = 0
+        self.__rest_positions = None
+        self.__pixels = None
+        self.__row_of_frame = dict()
+        self.__frames = []
+
+    def start(self, frames, vertex_count):
+        mesh = self.obj.data
+        self.__rest_positions = np.empty((vertex_count, 3), dtype=np.float32)
+        mesh.vertices.foreach_get("co", self.__rest_positions.ravel())
+        # RGBA, the alpha stays 1
+        self.__pixels = np.ones((len(frames), vertex_count, 4), dtype=np.float32)
+        self.__row_of_frame = {frame: row for row, frame in enumerate(frames)}
+        self.__frames = list(frames)
+
+    def add_frame(self, frame, positions):
+        np.subtract(positions, self.__rest_positions, out=self.__pixels[self.__row_of_frame[frame], :, :3])
+        self.frames_written += 1
+
+    def _create_uv_map(self, width, height) -> None:
+        mesh = self.obj.data
+        uv_map = mesh.uv_layers.get(self.uv_map_name)
+        if uv_map == None:
+            uv_map = mesh.uv_layers.new(name=self.uv_map_name, do_init=False)
+        loop_vertex_indices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertex_indices)
+        uvs = np.empty((len(mesh.loops), 2), dtype=np.float32)
+        # the middle of the pixel, so texture filtering doesn't mix in neighbouring vertices
+        uvs[:, 0] = (loop_vertex_indices + 0.5) / width
+        uvs[:, 1] = 0.5 / height
+        uv_map.data.foreach_set("uv", uvs.ravel())
+
+    def finish(self):
+        if self.frames_written == 0:
+            self.__pixels = None
+            return
+        # if the conversion was cancelled, only the first rows have been filled
+        pixels = self.__pixels[:self.frames_written]
+        frame_count, vertex_count = pixels.shape[:2]
+        offsets = pixels[:, :, :3]
+        self.offset_min = float(offsets.min()) if offsets.size != 0 else 0.0
+        self.offset_max = float(offsets.max()) if offsets.size != 0 else 0.0
+        if self.normalize == True:
+            offset_range = self.offset_max - self.offset_min
+            if offset_range == 0:
+                offset_range = 1.0
+            offsets -= self.offset_min
+            offsets /= offset_range
+
+        image = bpy.data.images.new(name=self.image_name, width=vertex_count, height=frame_count, alpha=True, float_buffer=True)
+        image.pixels.foreach_set(pixels.ravel())
+        self.__pixels = None
+        image["vat_offset_min"] = self.offset_min
+        image["vat_offset_max"] = self.offset_max
+        image["vat_normalized"] = self.normalize
+        image["vat_frame_start"] = self.__frames[0]
+        # without packing, the generated image would be lost when the file is closed. EXR keeps the float precision.
+        image.file_format = 'OPEN_EXR'
+        image.pack()
+        self.image = image
+
+        self._create_uv_map(width=vertex_count, height=frame_count)
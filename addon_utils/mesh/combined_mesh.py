@@ -0,0 +1,124 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import bpy
+import bmesh
+
+from c0s_lewd_utilities.toolbox_1_0_0 import create_real_mesh
+
+
+def create_combined_obj(context, objs, name, frame="CURRENT", apply_transforms=True, keep_vertex_groups=True, keep_materials=True) -> bpy.types.Object:
+    """Creates a new object whose mesh is the "applied" version (see create_real_mesh.create_real_mesh_copy()) of several objects joined together.
+
+    The vertices are in the same order as the objects, so the vertices of objs[1] start right after the last vertex of objs[0], and so on.
+    That's the same order MultiObjectPositionReader uses.
+
+    Parameters
+    ----------
+    context : bpy.types.Context
+        Your current context
+    objs : list of bpy.types.Object
+        Objects to combine
+    name : str
+        Name of the new object
+    frame : int or "CURRENT"
+        The objects get combined in their shape at that frame
+    apply_transforms : bool
+        See create_real_mesh_copy(). Should usually be True, otherwise all objects end up around the same origin.
+    keep_vertex_groups : bool
+        Vertex groups with the same name in several objects become one vertex group
+    keep_materials : bool
+        Each material gets one slot, no matter how many objects use it
+
+    Returns
+    -------
+    bpy.types.Object
+        The new object, linked to the scene
+
+    Warnings
+    --------
+    Same as create_real_mesh_copy(), so take care of the context.area.type.
+    """
+    scene = context.scene
+    frame_orig = scene.frame_current
+    if frame != "CURRENT" and frame != frame_orig:
+        # once for all objects, instead of create_real_mesh_copy() jumping there and back for each one
+        scene.frame_set(frame)
+
+    materials = []
+    vertex_group_names = []
+    bm = bmesh.new()
+    try:
+        for obj in objs:
+            mesh = create_real_mesh.create_real_mesh_copy(context=context,
+                                                          obj=obj,
+                                                          frame="CURRENT",
+                                                          apply_transforms=apply_transforms,
+                                                          keep_vertex_groups=keep_vertex_groups,
+                                                          keep_materials=keep_materials)
+            face_start = len(bm.faces)
+            vert_start = len(bm.verts)
+            # from_mesh() appends to what's already in the bmesh
+            bm.from_mesh(mesh)
+            bm.faces.ensure_lookup_table()
+            bm.verts.ensure_lookup_table()
+
+            if keep_materials == True:
+                material_indices = []
+                for material in mesh.materials:
+                    if material not in materials:
+                        materials.append(material)
+                    material_indices.append(materials.index(material))
+                if len(material_indices) != 0:
+                    for face_index in range(face_start, len(bm.faces)):
+                        face = bm.faces[face_index]
+                        face.material_index = material_indices[min(face.material_index, len(material_indices) - 1)]
+
+            if keep_vertex_groups == True and len(obj.vertex_groups) != 0:
+                # deform weights store the index of the vertex group, which is only valid for the object they came from
+                group_indices = []
+                for vertex_group in obj.vertex_groups:
+                    if vertex_group.name not in vertex_group_names:
+                        vertex_group_names.append(vertex_group.name)
+                    group_indices.append(vertex_group_names.index(vertex_group.name))
+                deform_layer = bm.verts.layers.deform.verify()
+                for vert_index in range(vert_start, len(bm.verts)):
+                    deform_vert = bm.verts[vert_index][deform_layer]
+                    weights = [(group_indices[group_index], weight) for group_index, weight in deform_vert.items() if group_index < len(group_indices)]
+                    deform_vert.clear()
+                    for group_index, weight in weights:
+                        deform_vert[group_index] = weight
+
+            bpy.data.meshes.remove(mesh)
+
+        mesh_combined = bpy.data.meshes.new(name)
+        bm.to_mesh(mesh_combined)
+    finally:
+        bm.free()
+        if scene.frame_current != frame_orig:
+            scene.frame_set(frame_orig)
+
+    for material in materials:
+        mesh_combined.materials.append(material)
+    obj_combined = create_real_mesh.create_new_obj_for_mesh(context=context, name=name, mesh=mesh_combined)
+    # created in the same order as vertex_group_names, so the indices in the deform weights match
+    for vertex_group_name in vertex_group_names:
+        obj_combined.vertex_groups.new(name=vertex_group_name)
+    return obj_combined
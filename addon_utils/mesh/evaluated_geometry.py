@@ -0,0 +1,160 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import bpy
+import numpy as np
+
+
+class EvaluatedPositionReader():
+    """Reads the vertex positions of an object, as if every modifier, shapekey etc. had been applied, into a NumPy buffer.
+
+    Unlike create_real_mesh.create_real_mesh_copy(), no new mesh datablock or temporary object gets created.
+    Instead the evaluated object creates a temporary mesh with to_mesh() that gets freed again with to_mesh_clear() right after reading.
+
+    The buffer gets allocated once and is then reused for every read, so if you want to keep the positions of a read
+    you need to copy them.
+    """
+
+    obj: bpy.types.Object
+    apply_transforms: bool
+    vertex_count: int
+    buffer: np.ndarray
+    __coordinates: np.ndarray
+
+    def __init__(self, obj, apply_transforms=True):
+        """Reads the vertex positions of an object, as if every modifier, shapekey etc. had been applied, into a NumPy buffer.
+
+        Parameters
+        ----------
+        obj : bpy.types.Object
+            The (original, not evaluated) object with your mesh.
+        apply_transforms : bool
+            Whether the positions should also include the transformations of the object (location, rotation, scale, constraints...),
+            same as the apply_transforms parameter of create_real_mesh_copy().
+        """
+        self.obj = obj
+        self.apply_transforms = apply_transforms
+        self.vertex_count = None
+        self.buffer = None
+        self.__coordinates = None
+
+    def __allocate(self, vertex_count):
+        self.vertex_count = vertex_count
+        self.buffer = np.empty((vertex_count, 3), dtype=np.float32)
+        # foreach_get writes into this one, the transformed result then goes into self.buffer
+        self.__coordinates = np.empty((vertex_count, 3), dtype=np.float32)
+
+    def read(self, depsgraph) -> np.ndarray:
+        """Reads the current positions of the evaluated object.
+
+        Parameters
+        ----------
+        depsgraph : bpy.types.Depsgraph
+            Most likely context.evaluated_depsgraph_get(). The scene should already be at the frame you want to read.
+
+        Returns
+        -------
+        np.ndarray
+            float32 array with the shape (vertex_count, 3).\\
+            It's the same array for every read, so copy it if you want to keep the values.
+
+        Raises
+        ------
+        Exception
+            If the amount of vertices changed since the first read.
+        """
+        obj_eval = self.obj.evaluated_get(depsgraph)
+        # Same as in create_real_mesh_copy(), don't change obj_eval in any way.
+        mesh_eval = obj_eval.to_mesh()
+        try:
+            vertex_count = len(mesh_eval.vertices)
+            if self.buffer is None:
+                self.__allocate(vertex_count)
+            elif vertex_count != self.vertex_count:
+                raise Exception("Vertex count of " + self.obj.name + " changed from " + str(self.vertex_count) + " to " + str(vertex_count) + ".")
+            if self.apply_transforms == True:
+                mesh_eval.vertices.foreach_get("co", self.__coordinates.ravel())
+                matrix = np.array(obj_eval.matrix_world, dtype=np.float32)
+                # same as mesh.transform(matrix_world), just for all vertices at once
+                np.matmul(self.__coordinates, matrix[:3, :3].T, out=self.buffer)
+                self.buffer += matrix[:3, 3]
+            else:
+                mesh_eval.vertices.foreach_get("co", self.buffer.ravel())
+        finally:
+            obj_eval.to_mesh_clear()
+        return self.buffer
+
+
+class MultiObjectPositionReader():
+    """Reads the evaluated vertex positions of several objects into one concatenated NumPy buffer, see EvaluatedPositionReader.
+
+    All objects are read from the same depsgraph, so the scene only needs to be evaluated once per frame for all of them.
+    The vertices of each object are at their range in vertex_ranges, in the same order as the objects.
+    """
+
+    objects: list
+    readers: list
+    vertex_ranges: list
+    vertex_count: int
+    buffer: np.ndarray
+
+    def __init__(self, objects, apply_transforms=True):
+        """Reads the evaluated vertex positions of several objects into one concatenated NumPy buffer.
+
+        Parameters
+        ----------
+        objects : list of bpy.types.Object
+            The (original, not evaluated) objects with your meshes.
+        apply_transforms : bool
+            See EvaluatedPositionReader
+        """
+        self.objects = list(objects)
+        self.readers = [EvaluatedPositionReader(obj=obj, apply_transforms=apply_transforms) for obj in self.objects]
+        self.vertex_ranges = None
+        self.vertex_count = None
+        self.buffer = None
+
+    def read(self, depsgraph) -> np.ndarray:
+        """Reads the current positions of all evaluated objects.
+
+        Parameters
+        ----------
+        depsgraph : bpy.types.Depsgraph
+            Most likely context.evaluated_depsgraph_get(). The scene should already be at the frame you want to read.
+
+        Returns
+        -------
+        np.ndarray
+            float32 array with the shape (vertex_count of all objects, 3).\\
+            It's the same array for every read, so copy it if you want to keep the values.
+        """
+        positions_per_object = [reader.read(depsgraph=depsgraph) for reader in self.readers]
+        if self.buffer is None:
+            self.vertex_ranges = []
+            vertex_start = 0
+            for positions in positions_per_object:
+                self.vertex_ranges.append((vertex_start, vertex_start + len(positions)))
+                vertex_start += len(positions)
+            self.vertex_count = vertex_start
+            self.buffer = np.empty((self.vertex_count, 3), dtype=np.float32)
+        # the single readers already raise an Exception if their vertex count changes, so the ranges stay valid
+        for (vertex_start, vertex_end), positions in zip(self.vertex_ranges, positions_per_object):
+            self.buffer[vertex_start:vertex_end] = positions
+        return self.buffer
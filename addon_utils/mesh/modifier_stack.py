@@ -0,0 +1,134 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+# Splits the modifier stack of an object at a chosen modifier, so only the part before it gets baked,
+# and re-adds the rest as live modifiers on the baked object.
+# Mostly meant for trailing Subdivision Surface / Multires modifiers: the baked shapekeys then only contain the cage vertices.
+
+import bpy
+
+
+subdivision_modifier_types = {'SUBSURF', 'MULTIRES'}
+
+# copying these would either do nothing or break things
+_skipped_modifier_properties = {"rna_type", "name", "type", "is_override_data", "persistent_uid"}
+
+
+def get_trailing_subdivision_modifier(obj):
+    """The first modifier of the Subdivision Surface / Multires modifiers at the end of the stack (ignoring modifiers disabled in the viewport), or None if there aren't any."""
+    modifier_first = None
+    for modifier in reversed(obj.modifiers):
+        if modifier.show_viewport == False:
+            continue
+        if modifier.type not in subdivision_modifier_types:
+            break
+        modifier_first = modifier
+    return modifier_first
+
+
+def copy_modifier(modifier, obj_to) -> bpy.types.Modifier:
+    """Adds a copy of a modifier to the end of the stack of another object.
+
+    A Multires modifier gets copied as a Subdivision Surface modifier with the same levels, since its sculpted details
+    are stored in the mesh of its object and can't be moved to another one.
+    Settings that can't be set on the new modifier (e.g. read-only ones) are skipped.
+
+    Returns
+    -------
+    bpy.types.Modifier
+        The new modifier
+    """
+    if modifier.type == 'MULTIRES':
+        modifier_new = obj_to.modifiers.new(name=modifier.name, type='SUBSURF')
+        modifier_new.levels = modifier.levels
+        modifier_new.render_levels = modifier.render_levels
+        for attribute in ("quality", "uv_smooth", "boundary_smooth", "use_creases"):
+            if hasattr(modifier, attribute) and hasattr(modifier_new, attribute):
+                setattr(modifier_new, attribute, getattr(modifier, attribute))
+        return modifier_new
+
+    modifier_new = obj_to.modifiers.new(name=modifier.name, type=modifier.type)
+    for prop in modifier.bl_rna.properties:
+        if prop.is_readonly == True or prop.identifier in _skipped_modifier_properties:
+            continue
+        try:
+            setattr(modifier_new, prop.identifier, getattr(modifier, prop.identifier))
+        except (AttributeError, TypeError, ValueError):
+            pass
+    return modifier_new
+
+
+class ModifierStackSplitter():
+    """Temporarily disables a modifier and all modifiers after it in the viewport, so evaluating the object only gives the result up to that point.
+
+    Steps:
+    - disable(): hides the modifiers in the viewport
+    - bake the object
+    - restore(): shows them again, always call it (e.g. in a finally block)
+    - add_to(): re-adds them as live modifiers on the baked object
+    """
+
+    obj: bpy.types.Object
+    modifiers: list
+    __show_viewport_orig: list
+
+    def __init__(self, obj, modifier_name):
+        """Temporarily disables a modifier and all modifiers after it.
+
+        Parameters
+        ----------
+        obj : bpy.types.Object
+            Object to bake
+        modifier_name : str
+            First modifier that shouldn't be baked. If the object doesn't have it, modifiers will be empty.
+        """
+        self.obj = obj
+        self.modifiers = []
+        names = [modifier.name for modifier in obj.modifiers]
+        if modifier_name in names:
+            # modifiers that are disabled anyway don't need to be re-added
+            self.modifiers = [modifier for modifier in obj.modifiers[names.index(modifier_name):] if modifier.show_viewport == True]
+        self.__show_viewport_orig = []
+
+    def disable(self) -> None:
+        self.__show_viewport_orig = [modifier.show_viewport for modifier in self.modifiers]
+        for modifier in self.modifiers:
+            modifier.show_viewport = False
+
+    def restore(self) -> None:
+        """Can be called more than once."""
+        for modifier, show_viewport in zip(self.modifiers, self.__show_viewport_orig):
+            modifier.show_viewport = show_viewport
+        self.__show_viewport_orig = []
+
+    def add_to(self, obj_new) -> list:
+        """Adds copies of the split off modifiers (see copy_modifier()) to the end of the stack of the baked object and returns them.
+        They're shown in the viewport, no matter if restore() was called before or not.
+        Modifiers the baked object already has (e.g. from an earlier bake onto the same target object) aren't added again."""
+        modifiers_new = []
+        for modifier in self.modifiers:
+            if obj_new.modifiers.get(modifier.name) != None:
+                continue
+            modifier_new = copy_modifier(modifier=modifier, obj_to=obj_new)
+            # the original can still be disabled by disable() at this point, but only modifiers shown in the viewport got split off
+            modifier_new.show_viewport = True
+            modifiers_new.append(modifier_new)
+        return modifiers_new
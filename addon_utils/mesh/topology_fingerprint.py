@@ -0,0 +1,123 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# Part of the "c0s_lewd_utilities" add-on
+# Copyright (C) 2022  Cardboy0 (https://twitter.com/cardboy0)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+# A fingerprint of the topology (vertex count, edges, faces) of a mesh, to check if two meshes can share the same shapekeys
+# without comparing them element by element.
+#
+# Fingerprints of evaluated objects are cached per object, view layer and frame. A depsgraph handler removes them again
+# as soon as the geometry of an object changes, call register() once for that.
+
+import bpy
+import hashlib
+import numpy as np
+
+
+# {(object name, scene name, view layer name, frame): fingerprint}
+_cache = dict()
+# the cache only exists to avoid evaluating the same thing twice in a row, it doesn't need to grow forever
+_cache_size_max = 256
+
+
+def hash_topology(mesh) -> str:
+    """Fingerprint of the topology of a mesh. Meshes with the same vertex count, edges and faces (in the same order) get the same fingerprint,
+    no matter where their vertices are.
+
+    Parameters
+    ----------
+    mesh : bpy.types.Mesh
+        Any mesh, also an evaluated one
+
+    Returns
+    -------
+    str
+        Hex string
+    """
+    hasher = hashlib.sha1()
+    hasher.update(repr((len(mesh.vertices), len(mesh.edges), len(mesh.polygons), len(mesh.loops))).encode("utf-8"))
+    for collection, attribute, width in ((mesh.edges, "vertices", 2),
+                                         (mesh.polygons, "loop_total", 1),
+                                         (mesh.loops, "vertex_index", 1)):
+        values = np.empty(len(collection) * width, dtype=np.int32)
+        collection.foreach_get(attribute, values)
+        hasher.update(values.tobytes())
+    return hasher.hexdigest()
+
+
+def get_topology_fingerprint(depsgraph, obj) -> str:
+    """Fingerprint (see hash_topology()) of the object with all modifiers applied. Reads the evaluated mesh directly, no temporary mesh is created.
+
+    Parameters
+    ----------
+    depsgraph : bpy.types.Depsgraph
+        Evaluated depsgraph, e.g. context.evaluated_depsgraph_get()
+    obj : bpy.types.Object
+        The original object
+
+    Returns
+    -------
+    str
+        Hex string
+    """
+    key = (obj.name_full, depsgraph.scene.name, depsgraph.view_layer.name, depsgraph.scene.frame_current)
+    fingerprint = _cache.get(key)
+    if fingerprint == None:
+        # the data of an evaluated mesh object is the evaluated mesh
+        fingerprint = hash_topology(obj.evaluated_get(depsgraph).data)
+        if len(_cache) >= _cache_size_max:
+            _cache.clear()
+        _cache[key] = fingerprint
+    return fingerprint
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+@bpy.app.handlers.persistent
+def _on_depsgraph_update(scene, depsgraph) -> None:
+    for update in depsgraph.updates:
+        if update.is_updated_geometry == False:
+            continue
+        if isinstance(update.id, bpy.types.Object) == False:
+            # e.g. a mesh, which could be used by any object
+            _cache.clear()
+            return
+        name = update.id.name_full
+        for key in [key for key in _cache if key[0] == name]:
+            del _cache[key]
+
+
+@bpy.app.handlers.persistent
+def _on_load(*args) -> None:
+    _cache.clear()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    bpy.app.handlers.load_post.append(_on_load)
+
+
+def unregister():
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    if _on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load)
+    _cache.clear()
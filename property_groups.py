@@ -51,6 +51,51 @@ prop_dict_object = {
             "frame_start": bpy.props.IntProperty(default=1, description="The starting frame of your animation"),
             "frame_end": bpy.props.IntProperty(default=100, description="The last frame of your animation"),
             "apply_transforms": bpy.props.BoolProperty(default=1, description="Result will look like rotation, scale and location of the original object was applied.\nThis includes delta transforms and constraints"),
+            "walk_sequentially": bpy.props.BoolProperty(default=1, description="Only move forward one frame at a time and reset to the original frame once at the end.\nRoughly halves the amount of scene evaluations and keeps simulation caches intact"),
+            "extract_without_datablocks": bpy.props.BoolProperty(default=1, description="Read the shape of each frame directly from the evaluated object into a reusable buffer instead of creating a temporary mesh copy for every frame"),
+            "deduplicate_static_frames": bpy.props.BoolProperty(default=0, description="Frames that look the same as the previous one don't get their own shapekey, the previous shapekey simply stays active for longer instead"),
+            "dedup_tolerance": bpy.props.FloatProperty(default=0.0001, min=0, precision=6, subtype='DISTANCE', description="Frames count as the same if no vertex moved further than this distance"),
+            "output_mode": bpy.props.EnumProperty(items=[("SHAPEKEYS", "Shapekeys", "Add the frames as keyframed shapekeys to a new or already existing object"),
+                                                         ("POINT_CACHE", "Point Cache File", "Write the frames into a .pc2 or .mdd file that other programs (or the Mesh Cache modifier) can read. No shapekeys are created"),
+                                                         ("VAT", "Vertex Animation Texture", "Store the vertex offsets of each frame as one row of a float image and add a UV map that points each vertex to its pixel. For game engines"),
+                                                         ("GEOMETRY_NODES", "Geometry Nodes", "Store all frames in a frame table mesh and add a Geometry Nodes modifier that picks the current frame from it. Plays back faster than shapekeys (requires Blender 3.4+)")],
+                                                  default="SHAPEKEYS",
+                                                  description="What to convert the animation to"),
+            "point_cache_format": bpy.props.EnumProperty(items=[("PC2", "PC2", "Point Cache 2 file, little-endian"),
+                                                                ("MDD", "MDD", "Lightwave MDD file, big-endian")],
+                                                         default="PC2",
+                                                         description="File format of the point cache"),
+            "point_cache_filepath": bpy.props.StringProperty(default="", subtype='FILE_PATH', description="Where to write the point cache file. If left empty, it's written next to the .blend file with the name of the object"),
+            "point_cache_swap_yz": bpy.props.BoolProperty(default=0, description="Swap the Y and Z axis, for programs where Y points up"),
+            "vat_normalize": bpy.props.BoolProperty(default=1, description="Remap the offsets to values between 0 and 1. The original range is reported and stored as custom properties of the image"),
+            "shapekey_compression": bpy.props.EnumProperty(items=[("NONE", "None", "One shapekey for each frame"),
+                                                                  ("PCA", "PCA", "Only a few basis shapekeys whose keyframed values are mixed to recreate each frame. Keeps all frames in memory until the end"),
+                                                                  ("ADAPTIVE", "Adaptive", "Only keep frames as shapekeys that can't be recreated by blending between their neighbouring kept shapekeys")],
+                                                           default="NONE",
+                                                           description="How to reduce the amount of created shapekeys"),
+            "compression_max_error": bpy.props.FloatProperty(default=0.001, min=0, precision=6, subtype='DISTANCE', description="Use as few shapekeys as possible while no vertex is further away than this from its real position"),
+            "pca_max_components": bpy.props.IntProperty(default=0, min=0, description="Upper limit for the amount of basis shapekeys (0 = no limit)"),
+            "worker_count": bpy.props.IntProperty(default=1, min=1, soft_max=32, description="Amount of background Blender processes that evaluate the frames at the same time, each one gets a part of the frame range.\n1 means everything is evaluated in this Blender instance.\nDoesn't work with simulations (cloth, softbody, ...), since they depend on the previous frames. Each process needs as much memory as opening this file"),
+            "convert_selected_objects": bpy.props.BoolProperty(default=0, description="Also convert the other selected mesh objects, each one into its own new object.\nThe scene is only evaluated once per frame for all of them, instead of once per frame and object.\nThe target object is ignored"),
+            "combine_selected_objects": bpy.props.BoolProperty(default=0, description="Join all converted objects into a single new object with one shared set of shapekeys (or one file / texture / frame table), instead of one new object each.\nA single object with one action plays back and exports a lot faster than many separate ones"),
+            "incremental_rebake": bpy.props.BoolProperty(default=0, description="Store a fingerprint of the keyframes, modifiers and mesh for every frame on the new object.\nConverting onto that object again (as target object) only evaluates the frames whose fingerprint changed and only replaces their shapekeys.\nDrivers and simulations aren't part of the fingerprint. Can't be combined with compression or merging static frames"),
+            "use_checkpoint": bpy.props.BoolProperty(default=0, description="Keep the converted frames in a cache folder next to the .blend file while converting.\nIf Blender crashes or the conversion is cancelled, converting again with the same object, frame range and transform setting only evaluates the missing frames.\nDoesn't notice changes to the animation itself, and simulations need to be baked"),
+            "bake_up_to_modifier": bpy.props.StringProperty(default="", description="Only bake the result of the modifiers before this one. This modifier and all after it are disabled while converting and re-added as live modifiers on the new object.\nUsually the first of the Subdivision Surface / Multires modifiers at the end of the stack, so the shapekeys only store the vertices of the cage instead of the subdivided mesh.\nMultires is re-added as Subdivision Surface. Empty means the whole stack gets baked"),
+            "region_of_interest": bpy.props.EnumProperty(items=[("NONE", "Whole Object", "Bake every vertex"),
+                                                                ("VERTEX_GROUP", "Vertex Group", "Only bake the vertices of a vertex group of the new object, all other vertices keep their basis position"),
+                                                                ("MOTION", "Moving Vertices", "Only bake the vertices that move further than a threshold away from their basis position. Some frames spread over the frame range are evaluated in advance to find them")],
+                                                         default="NONE",
+                                                         description="Which vertices get baked into each frame. Restricting it to the part that actually moves (e.g. the face) makes each frame cheaper to copy, compare and cache.\nOnly for shapekeys"),
+            "roi_vertex_group": bpy.props.StringProperty(default="", description="Vertex group with the vertices to bake. The new object has the same vertex groups as the original one"),
+            "roi_motion_threshold": bpy.props.FloatProperty(default=0.0001, min=0, precision=6, subtype='DISTANCE', description="Vertices that never move further than this away from their basis position aren't baked"),
+            "roi_sample_count": bpy.props.IntProperty(default=16, min=2, soft_max=200, description="How many frames are evaluated in advance to find the moving vertices. Vertices that only move between these frames are missed"),
+            "skip_static_frames": bpy.props.BoolProperty(default=0, description="Look at the keyframes, NLA strips and drivers of the object and everything it depends on before converting, without evaluating the scene.\nFrames where none of them change aren't evaluated, they reuse the shape (and shapekey) of the frame before.\nSimulations, time based modifiers (Wave, Geometry Nodes, ...) and drivers that use the frame or other datablocks make every frame count as changing"),
+            "memory_budget_gb": bpy.props.FloatProperty(default=0, min=0, soft_max=256, precision=1, description="If the estimated memory of a conversion is above this many gigabytes, the frames are written into a memory-mapped .npy file in the bake cache folder next to the .blend file instead (load it with numpy.load(path, mmap_mode=\"r\")).\nOutputs that are streamed into files anyway aren't affected, neither is converting with datablocks.\n0 means no limit"),
+            "pipeline_queue_size": bpy.props.IntProperty(default=0, min=0, soft_max=64, description="Outputs that don't need Blender data while receiving frames (point cache, VAT, Geometry Nodes, PCA, .npy files) get them on a background thread, through a queue with this many slots.\nThe next frame can then be evaluated while the previous one is still being written. Queue depth and waiting times are reported afterwards.\n0 means everything happens on the main thread"),
+            "read_physics_cache": bpy.props.BoolProperty(default=1, description="If the shape of the object comes from a cloth or softbody simulation that's baked to the disk (uncompressed) read the frames directly from the cache files instead of evaluating the scene.\nSubdivision Surface, Smooth, Laplacian Smooth and Solidify modifiers after the simulation get evaluated on top if they aren't animated. Falls back to evaluating the frames otherwise, a Mesh Sequence Cache modifier only gets read as part of a simulation after it"),
+            "isolate_dependencies": bpy.props.BoolProperty(default=0, description="Evaluate the frames in a temporary scene that only contains the converted objects and what they depend on (armature, constraint targets, deform cages, driver targets, ...).\nEverything else in the scene doesn't slow down each frame anymore. The speedup gets measured and reported.\nObjects that are affected by things they don't reference (simulations with collisions and force fields, rigid bodies) are evaluated in the full scene instead"),
+            "bake_in_chunks": bpy.props.BoolProperty(default=0, description="Convert the frames a few at a time while showing the progress, instead of freezing Blender until everything is done.\nPress ESC to cancel, the frames converted so far are kept.\nNot available with multiple worker processes"),
+            "chunk_budget_ms": bpy.props.IntProperty(default=100, min=10, soft_max=2000, description="How many milliseconds each chunk may take before Blender gets to update the interface again"),
             "only_current_frame": bpy.props.BoolProperty(default=0, description="Instead of converting a whole animation that spans over several frames, creates an 'applied' version of your object with the current shape as the base shape"),
             (s := "target_obj"): bpy.props.PointerProperty(type=bpy.types.Object,
                                                            poll=PollMethods.object_data_is_one_of({bpy.types.Mesh}),